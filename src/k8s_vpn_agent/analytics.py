@@ -0,0 +1,560 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 헬스 히스토리 분석 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- 헬스 히스토리(JSON Lines 및 기존 헬스 리포트)를 NumPy 컬럼 배열로 로드
+- 체크별 가용성(SLO), 월별 가용성 계산
+- 장애 구간(outage interval) 추출
+- MTBF/MTTR 및 노드 분포 백분위수 계산
+
+모든 계산은 (노드, 시간) 정렬 후 벡터화된 구간 연산으로 수행됩니다.
+"""
+
+import json
+import os
+import re
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .logger import get_logger
+
+
+# 상태 코드: 1 정상, 0 비정상, -1 값 없음
+STATE_UP = 1
+STATE_DOWN = 0
+STATE_MISSING = -1
+
+OVERALL_CHECK = "overall"
+DEFAULT_INTERVAL = 30.0
+DEFAULT_PERCENTILES = (50, 90, 99)
+CACHE_SUFFIX = ".npz"
+# 캐시가 같은 원본 파일을 가리키는지 확인할 때 비교하는 선두 바이트 수
+CACHE_HEAD_BYTES = 256
+
+
+class HistoryColumns:
+    """컬럼 형태의 헬스 히스토리
+
+    Attributes:
+        ts: 샘플 시각 (epoch 초, float64)
+        node: 노드 코드 (int32, nodes 인덱스)
+        states: 체크별 상태 (int8, shape = (샘플 수, 체크 수))
+        nodes: 노드 이름 목록
+        checks: 체크 이름 목록
+    """
+
+    __slots__ = ("ts", "node", "states", "nodes", "checks")
+
+    def __init__(self, ts: np.ndarray, node: np.ndarray, states: np.ndarray,
+                 nodes: List[str], checks: List[str]):
+        self.ts = ts
+        self.node = node
+        self.states = states
+        self.nodes = nodes
+        self.checks = checks
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def empty(cls) -> "HistoryColumns":
+        return cls(
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.int32),
+            np.empty((0, 0), dtype=np.int8),
+            [],
+            [],
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["HistoryColumns"]) -> "HistoryColumns":
+        """여러 히스토리를 노드/체크 이름 기준으로 병합"""
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+
+        nodes: List[str] = []
+        checks: List[str] = []
+        node_index: Dict[str, int] = {}
+        check_index: Dict[str, int] = {}
+        for part in parts:
+            for name in part.nodes:
+                if name not in node_index:
+                    node_index[name] = len(nodes)
+                    nodes.append(name)
+            for name in part.checks:
+                if name not in check_index:
+                    check_index[name] = len(checks)
+                    checks.append(name)
+
+        total = sum(len(p) for p in parts)
+        ts = np.empty(total, dtype=np.float64)
+        node = np.empty(total, dtype=np.int32)
+        states = np.full((total, len(checks)), STATE_MISSING, dtype=np.int8)
+
+        offset = 0
+        for part in parts:
+            size = len(part)
+            node_map = np.array([node_index[n] for n in part.nodes], dtype=np.int32)
+            check_cols = [check_index[c] for c in part.checks]
+            ts[offset:offset + size] = part.ts
+            node[offset:offset + size] = node_map[part.node]
+            states[offset:offset + size, check_cols] = part.states
+            offset += size
+
+        return cls(ts, node, states, nodes, checks)
+
+
+def _columns_from_records(records: Iterable[Dict], default_node: str) -> HistoryColumns:
+    """히스토리 레코드(dict) 목록을 컬럼 배열로 변환
+
+    필수 필드(ts)가 없거나 형식이 잘못된 레코드는 건너뛰고 경고를 남깁니다.
+    """
+    ts: List[float] = []
+    node_codes: List[int] = []
+    nodes: List[str] = []
+    node_index: Dict[str, int] = {}
+    checks: List[str] = [OVERALL_CHECK]
+    check_index: Dict[str, int] = {OVERALL_CHECK: 0}
+    # 체크(컬럼)별 (행 번호 목록, 값 목록)
+    cells: List[Tuple[List[int], List[int]]] = [([], [])]
+    skipped = 0
+
+    for record in records:
+        try:
+            timestamp = float(record["ts"])
+            overall = int(record.get("overall", STATE_MISSING))
+            values = [(check, int(healthy)) for check, healthy in (record.get("checks") or {}).items()]
+            name = str(record.get("node") or default_node)
+        except (KeyError, TypeError, ValueError, AttributeError):
+            skipped += 1
+            continue
+
+        code = node_index.get(name)
+        if code is None:
+            code = node_index[name] = len(nodes)
+            nodes.append(name)
+
+        row = len(ts)
+        ts.append(timestamp)
+        node_codes.append(code)
+        cells[0][0].append(row)
+        cells[0][1].append(overall)
+        for check, value in values:
+            column = check_index.get(check)
+            if column is None:
+                column = check_index[check] = len(checks)
+                checks.append(check)
+                cells.append(([], []))
+            cells[column][0].append(row)
+            cells[column][1].append(value)
+
+    if skipped:
+        get_logger().warning(f"잘못된 히스토리 레코드 {skipped}개를 건너뜀")
+
+    states = np.full((len(ts), len(checks)), STATE_MISSING, dtype=np.int8)
+    for column, (rows, values) in enumerate(cells):
+        if rows:
+            states[np.asarray(rows, dtype=np.int64), column] = np.asarray(values, dtype=np.int8)
+
+    return HistoryColumns(
+        np.asarray(ts, dtype=np.float64),
+        np.asarray(node_codes, dtype=np.int32),
+        states,
+        nodes,
+        checks,
+    )
+
+
+def _iter_jsonl(data: bytes, chunk_lines: int = 20000) -> Iterator[Dict]:
+    """JSON Lines 바이트를 레코드로 파싱
+
+    줄 단위 json.loads 호출 비용을 줄이기 위해 여러 줄을 하나의 JSON 배열로
+    묶어 파싱하고, 잘못된 줄이 섞인 묶음만 줄 단위로 다시 파싱합니다.
+    """
+    lines = [line for line in data.split(b"\n") if line.strip()]
+    invalid = 0
+    for start in range(0, len(lines), chunk_lines):
+        chunk = lines[start:start + chunk_lines]
+        try:
+            yield from json.loads(b"[" + b",".join(chunk) + b"]")
+            continue
+        except ValueError:
+            pass
+        for line in chunk:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                invalid += 1
+    if invalid:
+        get_logger().warning(f"JSON 파싱 불가 히스토리 줄 {invalid}개를 건너뜀")
+
+
+# monitor.append_history 가 기록하는 압축 형식의 한 줄 (그 외 형식의 줄은 5번째 그룹)
+_COMPACT_LINE_RE = re.compile(
+    rb'^(?:\{"ts":(-?[0-9.eE+-]+),"node":"([^"\\]*)","overall":(-?\d+),'
+    rb'"checks":\{((?:"[^"\\]*":-?\d+,?)*)\}\}|(.+))$',
+    re.M,
+)
+
+
+def _columns_from_compact(matches: Sequence[Tuple[bytes, ...]],
+                          default_node: str) -> HistoryColumns:
+    """압축 형식 정규식 매치 결과를 컬럼 배열로 변환
+
+    체크 조합(checks 객체)은 보통 몇 가지뿐이므로 조합별로 한 번만 파싱하고
+    행에는 조합 코드만 기록한 뒤 NumPy 인덱싱으로 상태 행렬을 만듭니다.
+    """
+    if not matches:
+        return HistoryColumns.empty()
+    ts_raw, node_raw, overall_raw, checks_raw = zip(*matches)
+    size = len(ts_raw)
+
+    node_index: Dict[bytes, int] = {}
+    node_codes = np.fromiter((node_index.setdefault(n, len(node_index)) for n in node_raw),
+                             dtype=np.int32, count=size)
+    combo_index: Dict[bytes, int] = {}
+    combo_codes = np.fromiter((combo_index.setdefault(c, len(combo_index)) for c in checks_raw),
+                              dtype=np.int32, count=size)
+
+    checks: List[str] = [OVERALL_CHECK]
+    check_index: Dict[str, int] = {OVERALL_CHECK: 0}
+    combos = [json.loads(b"{" + combo + b"}") for combo in combo_index]
+    for combo in combos:
+        for check in combo:
+            if check not in check_index:
+                check_index[check] = len(checks)
+                checks.append(check)
+
+    table = np.full((len(combos), len(checks)), STATE_MISSING, dtype=np.int8)
+    for row, combo in enumerate(combos):
+        for check, value in combo.items():
+            table[row, check_index[check]] = value
+
+    states = table[combo_codes]
+    states[:, 0] = np.fromiter(map(int, overall_raw), dtype=np.int8, count=size)
+    return HistoryColumns(
+        np.fromiter(map(float, ts_raw), dtype=np.float64, count=size),
+        node_codes,
+        states,
+        [name.decode("utf-8") or default_node for name in node_index],
+        checks,
+    )
+
+
+def _columns_from_jsonl(data: bytes, default_node: str) -> HistoryColumns:
+    """JSON Lines 바이트를 컬럼 배열로 변환
+
+    모니터가 기록한 압축 형식 줄은 정규식으로 한꺼번에 추출하고,
+    그 외 형식(수동 편집, 다른 도구 출력)의 줄만 json 으로 파싱합니다.
+    """
+    matches = _COMPACT_LINE_RE.findall(data)
+    fast = [match[:4] for match in matches if not match[4]]
+    if len(fast) == len(matches):
+        return _columns_from_compact(fast, default_node)
+
+    slow = [match[4] for match in matches if match[4] and match[4].strip()]
+    return HistoryColumns.concat([
+        _columns_from_compact(fast, default_node),
+        _columns_from_records(_iter_jsonl(b"\n".join(slow)), default_node),
+    ])
+
+
+def _read_legacy_reports(paths: Sequence[Path], default_node: str) -> Iterable[Dict]:
+    """기존 health_report_*.json 파일을 히스토리 레코드로 변환"""
+    logger = get_logger()
+    for path in paths:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            checks = data.get("checks", {})
+            hostname = (checks.get("node_ready") or {}).get("hostname")
+            record = {
+                "ts": datetime.fromisoformat(data["timestamp"]).timestamp(),
+                "node": hostname or default_node,
+                "overall": 0 if data.get("overall_status") == "unhealthy" else 1,
+                "checks": {name: int(bool(result.get("healthy"))) for name, result in checks.items()},
+            }
+        except Exception as e:
+            logger.warning(f"리포트 읽기 오류: {path} - {e}")
+            continue
+        yield record
+
+
+def _cache_path(path: Path) -> Path:
+    return path.with_name(path.name + CACHE_SUFFIX)
+
+
+def _load_cache(path: Path) -> Tuple[Optional[HistoryColumns], int]:
+    """컬럼 캐시와 캐시가 반영한 원본 파일 바이트 오프셋 로드
+
+    히스토리 파일은 추가(append)만 되므로, 같은 파일(inode, 선두 바이트)이고
+    크기가 오프셋 이상이면 캐시는 유효하며 오프셋 이후만 새로 파싱하면 됩니다.
+    파일이 교체/축소(로테이션)되었으면 (None, 0) 을 반환합니다.
+    """
+    try:
+        stat = path.stat()
+        with np.load(_cache_path(path), allow_pickle=False) as data:
+            offset = int(data["source_offset"])
+            head = data["source_head"].tobytes()
+            if int(data["source_ino"]) != stat.st_ino or stat.st_size < offset:
+                return None, 0
+            with open(path, "rb") as f:
+                if f.read(len(head)) != head:
+                    return None, 0
+            columns = HistoryColumns(
+                data["ts"], data["node"], data["states"],
+                [str(n) for n in data["nodes"]], [str(c) for c in data["checks"]],
+            )
+            return columns, offset
+    except (OSError, KeyError, ValueError):
+        return None, 0
+
+
+def _save_cache(path: Path, columns: HistoryColumns, offset: int):
+    cache = _cache_path(path)
+    tmp_cache = cache.with_name(cache.name + ".tmp")
+    try:
+        stat = path.stat()
+        with open(path, "rb") as f:
+            head = f.read(min(CACHE_HEAD_BYTES, offset))
+        with open(tmp_cache, "wb") as f:
+            np.savez(
+                f,
+                ts=columns.ts,
+                node=columns.node,
+                states=columns.states,
+                nodes=np.asarray(columns.nodes, dtype=str),
+                checks=np.asarray(columns.checks, dtype=str),
+                source_offset=np.int64(offset),
+                source_ino=np.int64(stat.st_ino),
+                source_head=np.frombuffer(head, dtype=np.uint8),
+            )
+        os.replace(tmp_cache, cache)
+    except OSError as e:
+        get_logger().debug(f"히스토리 캐시 저장 실패: {cache} - {e}")
+
+
+def _load_history_file(path: Path, use_cache: bool) -> HistoryColumns:
+    """JSON Lines 히스토리 파일 로드 (캐시 이후 추가된 부분만 파싱)"""
+    default_node = path.parent.name
+    cached, offset = _load_cache(path) if use_cache else (None, 0)
+
+    try:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            tail = f.read()
+    except OSError as e:
+        get_logger().warning(f"히스토리 읽기 오류: {path} - {e}")
+        return cached or HistoryColumns.empty()
+
+    # 마지막 개행 이후는 기록 중일 수 있으므로 캐시 오프셋에 포함하지 않음
+    complete = tail.rfind(b"\n") + 1
+    appended = _columns_from_jsonl(tail[:complete], default_node)
+    columns = HistoryColumns.concat([part for part in (cached, appended) if part is not None])
+    if use_cache and complete:
+        _save_cache(path, columns, offset + complete)
+
+    partial = tail[complete:]
+    if partial.strip():
+        columns = HistoryColumns.concat([
+            columns, _columns_from_records(_iter_jsonl(partial), default_node)
+        ])
+    return columns
+
+
+def load_history(paths: Iterable[str], use_cache: bool = True) -> HistoryColumns:
+    """헬스 히스토리 로드
+
+    디렉토리가 주어지면 하위의 *.jsonl 히스토리를 모두 읽고, 히스토리가 없는
+    디렉토리는 기존 health_report_*.json 파일을 읽습니다. 파싱한 JSON Lines 는
+    같은 위치에 .npz 컬럼 캐시로 저장되며, 다음 분석부터는 캐시 이후 추가된
+    줄만 파싱합니다.
+
+    Args:
+        paths: 히스토리 파일 또는 로그 디렉토리 경로 목록
+        use_cache: .npz 컬럼 캐시 사용 여부
+
+    Returns:
+        HistoryColumns: 병합된 컬럼 히스토리
+    """
+    parts: List[HistoryColumns] = []
+
+    for raw_path in paths:
+        path = Path(raw_path)
+        if path.is_dir():
+            files = sorted(path.rglob("*.jsonl"))
+            if not files:
+                legacy = sorted(path.glob("health_report_*.json"))
+                parts.append(_columns_from_records(_read_legacy_reports(legacy, path.name), path.name))
+                continue
+        else:
+            files = [path]
+
+        for file in files:
+            parts.append(_load_history_file(file, use_cache))
+
+    return HistoryColumns.concat(parts)
+
+
+def _percentiles(values: np.ndarray, percentiles: Sequence[float]) -> Dict[str, Optional[float]]:
+    values = values[np.isfinite(values)]
+    if values.size == 0:
+        return {f"p{p:g}": None for p in percentiles}
+    result = np.percentile(values, percentiles)
+    return {f"p{p:g}": round(float(v), 3) for p, v in zip(percentiles, result)}
+
+
+def _ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(denominator > 0, numerator / np.where(denominator > 0, denominator, 1), np.nan)
+
+
+def _iso(ts: float) -> str:
+    # 월별 버킷(datetime64)과 동일하게 UTC 기준으로 표기
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds")
+
+
+def analyze_history(columns: HistoryColumns,
+                    max_gap: Optional[float] = None,
+                    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+                    checks: Optional[Sequence[str]] = None,
+                    max_outages: Optional[int] = None) -> Dict:
+    """가용성, 장애 구간, MTBF/MTTR 분석
+
+    각 샘플은 같은 노드의 다음 샘플까지(최대 max_gap) 해당 상태가 유지된 것으로
+    간주합니다. max_gap 을 넘는 공백은 에이전트 중단으로 보고 가용성 계산에서
+    제외하며 장애 구간도 그 지점에서 끊습니다.
+
+    Args:
+        columns: load_history 결과
+        max_gap: 샘플 간 최대 연속 간격 (초). None 이면 중앙값 간격의 3배
+        percentiles: 노드 분포 백분위수
+        checks: 분석할 체크 이름 (None 이면 전체)
+        max_outages: 체크별로 반환할 최근 장애 구간 수 (None 이면 전체)
+
+    Returns:
+        Dict: 분석 결과
+    """
+    n = len(columns)
+    if n == 0:
+        return {"status": "no_data", "message": "분석할 히스토리가 없습니다."}
+
+    order = np.lexsort((columns.ts, columns.node))
+    ts = columns.ts[order]
+    node = columns.node[order]
+    states = columns.states[order]
+    n_nodes = len(columns.nodes)
+
+    # 같은 노드 내 다음 샘플까지의 간격
+    same_next = np.zeros(n, dtype=bool)
+    same_next[:-1] = node[1:] == node[:-1]
+    dt = np.zeros(n, dtype=np.float64)
+    dt[:-1] = ts[1:] - ts[:-1]
+
+    gaps = dt[same_next]
+    interval = float(np.median(gaps)) if gaps.size else DEFAULT_INTERVAL
+    if interval <= 0:
+        interval = DEFAULT_INTERVAL
+    if max_gap is None:
+        max_gap = interval * 3
+
+    contiguous_next = same_next & (dt <= max_gap)
+    contiguous_prev = np.zeros(n, dtype=bool)
+    contiguous_prev[1:] = contiguous_next[:-1]
+    # 마지막 샘플 및 공백 직전 샘플은 한 주기 동안 유지된 것으로 간주
+    duration = np.where(contiguous_next, dt, min(interval, max_gap))
+
+    months = ts.astype("datetime64[s]").astype("datetime64[M]")
+    month_keys, month_codes = np.unique(months, return_inverse=True)
+    month_labels = [str(m) for m in month_keys]
+    n_months = len(month_keys)
+
+    selected = columns.checks if checks is None else [c for c in columns.checks if c in checks]
+    result_checks: Dict[str, Dict] = {}
+
+    for check in selected:
+        state = states[:, columns.checks.index(check)]
+        up = state == STATE_UP
+        down = state == STATE_DOWN
+        if not (up.any() or down.any()):
+            continue
+
+        up_time = duration * up
+        down_time = duration * down
+
+        # 장애 구간: 연속된 down 샘플의 시작/끝 인덱스
+        prev_down = np.zeros(n, dtype=bool)
+        prev_down[1:] = down[:-1]
+        next_down = np.zeros(n, dtype=bool)
+        next_down[:-1] = down[1:]
+        starts = np.flatnonzero(down & ~(prev_down & contiguous_prev))
+        ends = np.flatnonzero(down & ~(next_down & contiguous_next))
+        outage_start = ts[starts]
+        outage_end = ts[ends] + duration[ends]
+        outage_duration = outage_end - outage_start
+
+        # 노드별 집계
+        node_up = np.bincount(node, weights=up_time, minlength=n_nodes)
+        node_down = np.bincount(node, weights=down_time, minlength=n_nodes)
+        node_outages = np.bincount(node[starts], minlength=n_nodes).astype(np.float64)
+        node_availability = _ratio(node_up, node_up + node_down) * 100
+        node_mttr = _ratio(node_down, node_outages)
+        node_mtbf = _ratio(node_up, node_outages)
+
+        # 월별 집계
+        month_up = np.bincount(month_codes, weights=up_time, minlength=n_months)
+        month_down = np.bincount(month_codes, weights=down_time, minlength=n_months)
+        month_availability = _ratio(month_up, month_up + month_down) * 100
+
+        total_up = float(node_up.sum())
+        total_down = float(node_down.sum())
+        total_outages = int(starts.size)
+
+        recent = np.argsort(outage_start)[::-1]
+        if max_outages is not None:
+            recent = recent[:max_outages]
+
+        result_checks[check] = {
+            "availability": round(total_up / (total_up + total_down) * 100, 4) if total_up + total_down else None,
+            "uptime": round(total_up, 3),
+            "downtime": round(total_down, 3),
+            "outages": total_outages,
+            "mtbf": round(total_up / total_outages, 3) if total_outages else None,
+            "mttr": round(total_down / total_outages, 3) if total_outages else None,
+            "monthly": {
+                label: round(float(value), 4)
+                for label, value in zip(month_labels, month_availability)
+                if np.isfinite(value)
+            },
+            "node_availability_percentiles": _percentiles(node_availability, percentiles),
+            "node_mttr_percentiles": _percentiles(node_mttr, percentiles),
+            "node_mtbf_percentiles": _percentiles(node_mtbf, percentiles),
+            "outage_duration_percentiles": _percentiles(outage_duration, percentiles),
+            "outage_intervals": [
+                {
+                    "node": columns.nodes[node[starts[i]]],
+                    "start": _iso(outage_start[i]),
+                    "end": _iso(outage_end[i]),
+                    "duration": round(float(outage_duration[i]), 3),
+                }
+                for i in recent
+            ],
+        }
+
+    return {
+        "samples": n,
+        "nodes": n_nodes,
+        "start": _iso(float(ts.min())),
+        "end": _iso(float(ts.max())),
+        "interval": interval,
+        "max_gap": max_gap,
+        "checks": result_checks,
+    }
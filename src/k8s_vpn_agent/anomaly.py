@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 지연시간 이상 감지 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- 프로브 지연시간 시계열별 EWMA 평균/분산 기반 온라인 이상 감지 (시계열당 O(1) 메모리)
+- 점진적인 RTT 상승(degraded)을 연결 실패 이전에 조기 경보
+- 감지기 상태의 파일 저장/복원 (재시작 후에도 기준선 유지)
+"""
+
+import json
+import math
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+from .logger import get_logger
+
+
+class AnomalyResult:
+    """단일 관측값 판정 결과"""
+
+    __slots__ = ("value", "baseline", "deviation", "zscore", "degraded", "warmed_up")
+
+    def __init__(self, value: float, baseline: float, deviation: float, zscore: float,
+                 degraded: bool, warmed_up: bool):
+        self.value = value
+        self.baseline = baseline
+        self.deviation = deviation
+        self.zscore = zscore
+        self.degraded = degraded
+        self.warmed_up = warmed_up
+
+    def to_dict(self) -> Dict:
+        return {
+            "value": round(self.value, 3),
+            "baseline": round(self.baseline, 3),
+            "deviation": round(self.deviation, 3),
+            "zscore": round(self.zscore, 2),
+            "degraded": self.degraded,
+        }
+
+
+class EWMASeries:
+    """단일 시계열의 EWMA 상태
+
+    - baseline: 느린 EWMA 기준선 (정상 구간에서만 갱신)
+    - level: 빠른 EWMA 로 추적하는 현재 수준 (단발성 스파이크 완화)
+    - variance: 현재 수준 대비 잔차의 EWMA 분산 (지터)
+
+    현재 수준이 기준선보다 z_threshold 표준편차 이상, 그리고 min_deviation 이상
+    높으면 degraded 로 판정합니다. 정상 범위를 벗어난 관측값은 기준선을 제한된
+    폭으로만 움직이고 degraded 동안에는 기준선을 갱신하지 않으므로, RTT 가
+    서서히 올라가도 기준선이 따라 올라가지 않습니다.
+    degraded_run 은 연속 degraded 관측 횟수로, 경로 변경 등으로 지연시간이
+    영구히 바뀐 경우 새 수준을 기준선으로 받아들이는 데 사용합니다.
+    """
+
+    __slots__ = ("baseline", "variance", "level", "count", "degraded", "degraded_run")
+
+    def __init__(self, baseline: float = 0.0, variance: float = 0.0, level: float = 0.0,
+                 count: int = 0, degraded: bool = False, degraded_run: int = 0):
+        self.baseline = baseline
+        self.variance = variance
+        self.level = level
+        self.count = count
+        self.degraded = degraded
+        self.degraded_run = degraded_run
+
+    def to_dict(self) -> Dict:
+        return {
+            "baseline": self.baseline,
+            "variance": self.variance,
+            "level": self.level,
+            "count": self.count,
+            "degraded": self.degraded,
+            "degraded_run": self.degraded_run,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "EWMASeries":
+        return cls(
+            baseline=float(data.get("baseline", 0.0)),
+            variance=float(data.get("variance", 0.0)),
+            level=float(data.get("level", 0.0)),
+            count=int(data.get("count", 0)),
+            degraded=bool(data.get("degraded", False)),
+            degraded_run=int(data.get("degraded_run", 0)),
+        )
+
+
+class AnomalyDetector:
+    """시계열별 EWMA/z-score 이상 감지기"""
+
+    def __init__(self, alpha: float = 0.02, fast_alpha: float = 0.3, var_alpha: float = 0.1,
+                 z_threshold: float = 3.0, warmup: int = 10,
+                 min_deviation: float = 20.0, min_stddev: float = 1.0,
+                 rebaseline_after: int = 120, state_file: Optional[str] = None):
+        """
+        Args:
+            alpha: 기준선 EWMA 가중치 (작을수록 느리게 적응)
+            fast_alpha: 현재 수준 EWMA 가중치
+            var_alpha: 지터 분산 EWMA 가중치
+            z_threshold: degraded 판정 z-score 임계값
+            warmup: 판정 전 최소 관측 횟수
+            min_deviation: degraded 판정에 필요한 기준선 대비 최소 증가량 (ms)
+            min_stddev: 분산이 매우 작은 시계열의 z-score 폭주를 막는 최소 표준편차 (ms)
+            rebaseline_after: 연속 degraded 관측이 이 횟수에 도달하면 현재 수준을
+                새 기준선으로 채택 (0 이면 재설정하지 않음)
+            state_file: 상태 저장 파일 경로 (None 이면 저장하지 않음)
+        """
+        self.alpha = alpha
+        self.fast_alpha = fast_alpha
+        self.var_alpha = var_alpha
+        self.z_threshold = z_threshold
+        self.warmup = warmup
+        self.min_deviation = min_deviation
+        self.min_stddev = min_stddev
+        self.rebaseline_after = rebaseline_after
+        self.state_file = Path(state_file) if state_file else None
+        self.series: Dict[str, EWMASeries] = {}
+        self.logger = get_logger()
+
+        if self.state_file:
+            self.load()
+
+    @classmethod
+    def from_config(cls, config: Dict, log_dir: str) -> "AnomalyDetector":
+        """monitor 설정 섹션으로부터 생성"""
+        monitor = config.get("monitor", {})
+        state_file = monitor.get("anomaly_state_file", "anomaly_state.json")
+        return cls(
+            alpha=monitor.get("latency_ewma_alpha", 0.02),
+            z_threshold=monitor.get("latency_z_threshold", 3.0),
+            warmup=monitor.get("latency_warmup_samples", 10),
+            min_deviation=monitor.get("latency_min_deviation_ms", 20.0),
+            rebaseline_after=monitor.get("latency_rebaseline_samples", 120),
+            state_file=os.path.join(log_dir, state_file) if state_file else None,
+        )
+
+    def observe(self, name: str, value: float) -> AnomalyResult:
+        """관측값을 반영하고 판정 결과 반환
+
+        Args:
+            name: 시계열 이름 (예: "api_connect:10.0.0.1")
+            value: 관측값 (ms)
+
+        Returns:
+            AnomalyResult: 판정 결과
+        """
+        series = self.series.get(name)
+        if series is None:
+            series = self.series[name] = EWMASeries(baseline=value, level=value)
+
+        warmed_up = series.count >= self.warmup
+        if series.count == 0:
+            series.baseline = series.level = value
+            series.variance = 0.0
+        else:
+            # 분산은 현재 수준 대비 잔차(지터)로 추정하고, 워밍업 이후에는 잔차를
+            # 정상 범위로 제한하여 급격한 변화가 분산을 부풀려 감지를 가리지 않게 한다
+            residual = value - series.level
+            clipped = residual
+            if warmed_up:
+                limit = self.z_threshold * max(math.sqrt(series.variance), self.min_stddev)
+                clipped = max(-limit, min(limit, residual))
+            series.variance = (1 - self.var_alpha) * series.variance + self.var_alpha * clipped * clipped
+            series.level += self.fast_alpha * residual
+
+        stddev = max(math.sqrt(series.variance), self.min_stddev)
+        deviation = series.level - series.baseline
+        zscore = deviation / stddev
+        degraded = warmed_up and zscore >= self.z_threshold and deviation >= self.min_deviation
+
+        # 기준선은 정상 구간에서만 갱신하고, 정상 범위를 벗어난 관측값은
+        # 제한된 폭으로만 반영하여 점진적 상승을 기준선이 따라가지 못하게 한다.
+        if not degraded:
+            diff = value - series.baseline
+            if warmed_up:
+                limit = self.z_threshold * stddev
+                diff = max(-limit, min(limit, diff))
+            series.baseline += self.alpha * diff
+
+        # 지속된 degraded 는 일시적 저하가 아니라 새 정상 수준으로 보고 기준선 재설정
+        series.degraded_run = series.degraded_run + 1 if degraded else 0
+        if degraded and self.rebaseline_after and series.degraded_run >= self.rebaseline_after:
+            self.logger.info(
+                f"지연시간 기준선 재설정: {name} {series.baseline:.1f}ms → {series.level:.1f}ms "
+                f"({series.degraded_run}회 연속 degraded)"
+            )
+            series.baseline = series.level
+            series.degraded_run = 0
+            degraded = False
+
+        if degraded != series.degraded:
+            if degraded:
+                self.logger.warning(
+                    f"지연시간 이상 감지: {name} {series.level:.1f}ms "
+                    f"(기준선 {series.baseline:.1f}ms, z={zscore:.1f})"
+                )
+            else:
+                self.logger.info(f"지연시간 정상 복귀: {name} {series.level:.1f}ms")
+
+        series.degraded = degraded
+        series.count += 1
+
+        return AnomalyResult(value, series.baseline, deviation, zscore, degraded, warmed_up)
+
+    def reset(self, name: Optional[str] = None):
+        """시계열 상태 초기화 (name 이 None 이면 전체)"""
+        if name is None:
+            self.series.clear()
+        else:
+            self.series.pop(name, None)
+
+    def load(self):
+        """상태 파일에서 감지기 상태 복원"""
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.series = {
+                name: EWMASeries.from_dict(state)
+                for name, state in data.get("series", {}).items()
+            }
+            self.logger.debug(f"이상 감지 상태 복원: {len(self.series)}개 시계열")
+        except Exception as e:
+            self.logger.warning(f"이상 감지 상태 복원 실패: {e}")
+            self.series = {}
+
+    def save(self):
+        """감지기 상태를 파일에 저장 (원자적 교체)"""
+        if not self.state_file:
+            return
+        try:
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.state_file.with_name(self.state_file.name + ".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"series": {name: s.to_dict() for name, s in self.series.items()}},
+                    f,
+                )
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            self.logger.warning(f"이상 감지 상태 저장 실패: {e}")
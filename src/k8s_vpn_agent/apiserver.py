@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - API 서버 헬스 프로브
+
+이 모듈은 다음 기능을 제공합니다:
+- /livez, /readyz 요청과 단계별 시간 측정 (DNS 조회, TCP 연결, TLS 핸드셰이크, 첫 바이트)
+- 엔드포인트별 keep-alive 연결 유지 및 재사용 (재사용 시 연결/TLS 단계는 0)
+- 단계별 시간으로 지연 원인 구분 (네트워크 / TLS / API 서버 자체)
+
+HTTP 라이브러리는 단계별 시간을 제공하지 않으므로, 소켓 연결과 TLS 핸드셰이크를
+직접 수행한 뒤 http.client 연결에 넘겨 요청합니다.
+"""
+
+import http.client
+import socket
+import ssl
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from .happy_eyeballs import interleave
+from .logger import get_logger
+from .resolver import Resolver, get_resolver
+from .results import APIProbeResult
+
+
+HEALTH_PATHS = ("/livez", "/readyz")
+
+# 재사용한 연결이 서버 쪽에서 이미 닫혔을 때 발생하는 예외 (새 연결로 한 번 재시도)
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+class APIServerProbe:
+    """단일 API 서버 엔드포인트 프로브 (연결 하나를 유지하며 재사용)"""
+
+    def __init__(self, host: str, port: int = 6443, timeout: float = 5.0,
+                 ca_file: Optional[str] = None, resolver: Optional[Resolver] = None):
+        """
+        Args:
+            host: API 서버 호스트 이름 또는 IP
+            port: API 서버 포트
+            timeout: 단계별 타임아웃 (초)
+            ca_file: 클러스터 CA 인증서 경로 (지정 시 인증서 검증)
+            resolver: 사용할 리졸버 (기본값: 공유 리졸버)
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.resolver = resolver or get_resolver()
+        self.logger = get_logger()
+        self.context = ssl.create_default_context(cafile=ca_file) if ca_file else self._insecure_context()
+        self._conn: Optional[http.client.HTTPSConnection] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _insecure_context() -> ssl.SSLContext:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        return context
+
+    def _connect(self) -> Tuple[http.client.HTTPSConnection, Dict[str, float]]:
+        """새 연결 생성 (단계별 시간 반환)"""
+        phases = {}
+        start = time.perf_counter()
+        addresses = interleave(self.resolver.resolve(self.host))
+        phases["resolve_ms"] = _ms(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        sock, last_error = None, None
+        for address in addresses:
+            try:
+                sock = socket.create_connection((address, self.port), timeout=self.timeout)
+                break
+            except OSError as e:
+                last_error = e
+        if sock is None:
+            raise last_error or OSError("연결할 주소가 없습니다")
+        phases["connect_ms"] = _ms(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        try:
+            tls = self.context.wrap_socket(sock, server_hostname=self.host)
+        except Exception:
+            sock.close()
+            raise
+        phases["tls_ms"] = _ms(time.perf_counter() - start)
+
+        conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout,
+                                           context=self.context)
+        conn.sock = tls
+        return conn, phases
+
+    def _request(self, path: str) -> APIProbeResult:
+        reused = self._conn is not None
+        if reused:
+            conn, phases = self._conn, {"resolve_ms": 0.0, "connect_ms": 0.0, "tls_ms": 0.0}
+        else:
+            conn, phases = self._connect()
+            self._conn = conn
+
+        url = f"https://{self.host}:{self.port}{path}"
+        start = time.perf_counter()
+        conn.request("GET", path, headers={"Accept": "text/plain"})
+        response = conn.getresponse()
+        ttfb = time.perf_counter() - start
+        body = response.read(4096).decode("utf-8", "replace").strip()
+        if response.will_close:
+            self.close()
+        total = sum(phases.values()) + _ms(time.perf_counter() - start)
+
+        status = response.status
+        kwargs = dict(url=url, status_code=status, reused=reused, elapsed_ms=round(total, 3),
+                      ttfb_ms=_ms(ttfb), **phases)
+        if status == 200:
+            return APIProbeResult(True, "✓ {} 정상 ({:.1f}ms)", path, total, **kwargs)
+        if status in (401, 403):
+            # 익명 접근이 막힌 클러스터: API 서버는 응답하므로 도달 가능으로 판단
+            return APIProbeResult(True, "✓ {} 응답 (인증 필요: {})", path, status, **kwargs)
+        detail = body.splitlines()[-1] if body else ""
+        return APIProbeResult(False, "✗ {} 실패: HTTP {} {}", path, status, detail, **kwargs)
+
+    def probe(self, path: str = "/readyz") -> APIProbeResult:
+        """단일 경로 프로브"""
+        url = f"https://{self.host}:{self.port}{path}"
+        with self._lock:
+            try:
+                try:
+                    return self._request(path)
+                except _STALE_ERRORS:
+                    if self._conn is None:
+                        raise
+                    # 유휴 연결이 끊겼으면 새 연결로 재시도
+                    self.close()
+                    return self._request(path)
+            except socket.gaierror:
+                self.close()
+                return APIProbeResult(False, "✗ {} 호스트를 찾을 수 없습니다", self.host, url=url)
+            except ssl.SSLError as e:
+                self.close()
+                self.logger.warning(f"API server TLS error ({url}): {e}")
+                return APIProbeResult(False, "✗ {} TLS 오류: {}", path, e.reason or str(e), url=url)
+            except socket.timeout:
+                self.close()
+                return APIProbeResult(False, "✗ {} 타임아웃", path, url=url)
+            except (OSError, http.client.HTTPException) as e:
+                self.close()
+                self.logger.debug(f"API server probe failed ({url}): {e}")
+                return APIProbeResult(False, "✗ {} 연결 실패: {}", path, str(e) or type(e).__name__, url=url)
+
+    def probe_all(self, paths: Sequence[str] = HEALTH_PATHS) -> Dict[str, APIProbeResult]:
+        """여러 경로를 같은 연결로 순서대로 프로브"""
+        results = {}
+        for path in paths:
+            result = self.probe(path)
+            results[path.strip("/")] = result
+            self.logger.debug(
+                f"API {path}: status {result.status_code}, resolve {result.resolve_ms}ms, "
+                f"connect {result.connect_ms}ms, tls {result.tls_ms}ms, ttfb {result.ttfb_ms}ms"
+                f"{' (reused)' if result.reused else ''}"
+            )
+        return results
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+_probes: Dict[Tuple[str, int], APIServerProbe] = {}
+_probes_lock = threading.Lock()
+
+
+def get_api_probe(host: str, port: int = 6443) -> APIServerProbe:
+    """엔드포인트별로 공유하는 프로브 (모니터 주기 간 연결 재사용)"""
+    with _probes_lock:
+        probe = _probes.get((host, port))
+        if probe is None:
+            probe = _probes[(host, port)] = APIServerProbe(host, port)
+        return probe
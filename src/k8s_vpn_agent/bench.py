@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - VPN 경로 처리량/지연 벤치마크
+
+이 모듈은 다음 기능을 제공합니다:
+- 벤치마크 서버 (TCP 제어/스트림 + UDP 에코/부하 수신)
+- 클라이언트: TCP 업로드/다운로드 처리량, UDP 처리량과 손실률, UDP 에코 RTT 분포
+- 지정한 인터페이스(예: tailscale0)의 주소를 출발지로 사용
+
+에이전트가 병목이 되지 않도록 TCP 송신은 socket.sendfile(커널 내 복사),
+수신은 미리 할당한 버퍼에 recv_into 로 읽고, UDP 패킷은 하나의 버퍼를
+memoryview 로 재사용합니다.
+
+프로토콜: 클라이언트가 TCP 로 JSON 요청 한 줄을 보내면 서버가 JSON 응답 한 줄로
+준비를 알린 뒤 테스트를 진행합니다.
+"""
+
+import json
+import select
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from . import netif
+from .logger import get_logger
+
+
+DEFAULT_PORT = 7201
+CHUNK_SIZE = 256 * 1024
+UDP_PAYLOAD_SIZE = 1200  # tailscale0 MTU(1280) 이하
+
+_MAGIC = b"KVAB"
+_KIND_ECHO = 1
+_KIND_LOAD = 2
+# magic, 종류, 세션, 순번, 전송 시각
+_UDP_HEADER = struct.Struct("!4sBIId")
+
+
+def _zero_file(size: int = CHUNK_SIZE):
+    """sendfile 원본으로 쓸 임시 파일"""
+    f = tempfile.TemporaryFile()
+    f.write(b"\x00" * size)
+    f.flush()
+    return f
+
+
+def _send_for(sock: socket.socket, duration: float) -> int:
+    """duration 동안 sendfile 로 전송하고 보낸 바이트 수 반환"""
+    sent = 0
+    with _zero_file() as source:
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            sent += sock.sendfile(source, 0, CHUNK_SIZE)
+    return sent
+
+
+def _receive_all(sock: socket.socket) -> int:
+    """EOF 까지 수신하고 받은 바이트 수 반환"""
+    view = memoryview(bytearray(CHUNK_SIZE))
+    received = 0
+    while True:
+        n = sock.recv_into(view)
+        if not n:
+            return received
+        received += n
+
+
+def _mbps(nbytes: int, seconds: float) -> float:
+    return round(nbytes * 8 / seconds / 1e6, 3) if seconds > 0 else 0.0
+
+
+def _percentile(values: List[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(q / 100 * (len(ordered) - 1)))))
+    return round(ordered[index], 3)
+
+
+class _ControlHandler(socketserver.StreamRequestHandler):
+    """벤치마크 제어 연결 처리"""
+
+    def _reply(self, data: Dict):
+        self.wfile.write(json.dumps(data).encode() + b"\n")
+        self.wfile.flush()
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline(4096) or b"{}")
+        except ValueError:
+            self._reply({"error": "잘못된 요청"})
+            return
+        test = request.get("test")
+        try:
+            if test == "tcp_upload":
+                self._reply({"ok": True})
+                start = time.monotonic()
+                received = _receive_all(self.request)
+                self._reply({"bytes": received, "seconds": time.monotonic() - start})
+            elif test == "tcp_download":
+                self._reply({"ok": True})
+                _send_for(self.request, min(float(request.get("duration", 5)), 60.0))
+            elif test == "udp":
+                self._udp_session()
+            else:
+                self._reply({"error": f"알 수 없는 테스트: {test}"})
+        except OSError as e:
+            self.server.logger.debug(f"벤치마크 연결 종료: {e}")
+
+    def _udp_session(self):
+        udp = self.server.udp
+        session = udp.open_session()
+        try:
+            self._reply({"ok": True, "session": session, "udp_port": udp.port})
+            # 클라이언트가 전송을 마치면 "done" 한 줄을 보냄
+            self.rfile.readline(64)
+            packets, nbytes = udp.close_session(session)
+            self._reply({"packets": packets, "bytes": nbytes})
+        finally:
+            udp.close_session(session)
+
+
+class _UDPResponder:
+    """UDP 에코 응답 및 부하 패킷 집계"""
+
+    def __init__(self, host: str, port: int):
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.sock.bind((host, port))
+        self.port = self.sock.getsockname()[1]
+        self._sessions: Dict[int, List[int]] = {}
+        self._next_session = 1
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    def open_session(self) -> int:
+        with self._lock:
+            session = self._next_session
+            self._next_session += 1
+            self._sessions[session] = [0, 0]
+            return session
+
+    def close_session(self, session: int):
+        with self._lock:
+            return tuple(self._sessions.pop(session, (0, 0)))
+
+    def serve(self):
+        buf = bytearray(65536)
+        view = memoryview(buf)
+        while not self._stopping.is_set():
+            if not select.select([self.sock], [], [], 0.5)[0]:
+                continue
+            try:
+                n, addr = self.sock.recvfrom_into(view)
+            except OSError:
+                continue
+            if n < _UDP_HEADER.size or view[:4] != _MAGIC:
+                continue
+            kind = buf[4]
+            if kind == _KIND_ECHO:
+                try:
+                    self.sock.sendto(view[:n], addr)
+                except OSError:
+                    pass
+            elif kind == _KIND_LOAD:
+                session = struct.unpack_from("!I", buf, 5)[0]
+                with self._lock:
+                    counters = self._sessions.get(session)
+                    if counters is not None:
+                        counters[0] += 1
+                        counters[1] += n
+
+    def stop(self):
+        self._stopping.set()
+
+    def close(self):
+        self.sock.close()
+
+
+class _BenchTCPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class _BenchTCP6Server(_BenchTCPServer):
+    address_family = socket.AF_INET6
+
+
+class BenchServer:
+    """벤치마크 서버 (TCP 와 UDP 를 같은 포트 번호로 사용)"""
+
+    def __init__(self, host: str = "0.0.0.0", port: int = DEFAULT_PORT):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0 이면 임의 포트)
+        """
+        self.host = host
+        self.port = port
+        self.logger = get_logger()
+        self._server: Optional[_BenchTCPServer] = None
+        self._udp: Optional[_UDPResponder] = None
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def address(self) -> str:
+        host, port = self._server.server_address[:2] if self._server else (self.host, self.port)
+        return f"{host}:{port}"
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        server_cls = _BenchTCP6Server if ":" in self.host else _BenchTCPServer
+        self._server = server_cls((self.host, self.port), _ControlHandler)
+        self._udp = _UDPResponder(self.host, self._server.server_address[1])
+        self._server.udp = self._udp
+        self._server.logger = self.logger
+
+        self._threads = [
+            threading.Thread(target=self._server.serve_forever, name="bench-tcp", daemon=True),
+            threading.Thread(target=self._udp.serve, name="bench-udp", daemon=True),
+        ]
+        for thread in self._threads:
+            thread.start()
+        self.logger.info(f"벤치마크 서버 시작: {self.address}")
+
+    def stop(self):
+        """서버 중지"""
+        if not self._server:
+            return
+        self._udp.stop()
+        self._server.shutdown()
+        self._server.server_close()
+        for thread in self._threads:
+            thread.join()
+        self._udp.close()
+        self._server = None
+        self.logger.info("벤치마크 서버 중지")
+
+
+class BenchClient:
+    """벤치마크 클라이언트"""
+
+    def __init__(self, host: str, port: int = DEFAULT_PORT, interface: Optional[str] = None,
+                 timeout: float = 10.0):
+        """
+        Args:
+            host: 서버 주소
+            port: 서버 포트
+            interface: 출발지로 사용할 인터페이스 (예: tailscale0)
+            timeout: 소켓 타임아웃 (초)
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.logger = get_logger()
+        self.source: Optional[str] = None
+        if interface:
+            info = netif.get_interface(interface)
+            if info is None or not info.ipv4:
+                raise ValueError(f"{interface} 인터페이스의 IPv4 주소를 찾을 수 없습니다")
+            self.source = info.ipv4
+
+    def _connect(self, request: Dict):
+        sock = socket.create_connection(
+            (self.host, self.port), timeout=self.timeout,
+            source_address=(self.source, 0) if self.source else None,
+        )
+        reader = sock.makefile("rb")
+        sock.sendall(json.dumps(request).encode() + b"\n")
+        reply = json.loads(reader.readline(4096) or b"{}")
+        if not reply.get("ok"):
+            sock.close()
+            raise RuntimeError(reply.get("error", "서버 응답 없음"))
+        return sock, reader, reply
+
+    def tcp_upload(self, duration: float = 5.0) -> Dict:
+        """클라이언트 → 서버 TCP 처리량 (서버 수신 기준)"""
+        sock, reader, _ = self._connect({"test": "tcp_upload"})
+        with sock, reader:
+            sent = _send_for(sock, duration)
+            sock.shutdown(socket.SHUT_WR)
+            result = json.loads(reader.readline(4096) or b"{}")
+        received, seconds = result.get("bytes", 0), result.get("seconds", 0.0)
+        return {"bytes": received, "sent": sent, "seconds": round(seconds, 3),
+                "mbps": _mbps(received, seconds)}
+
+    def tcp_download(self, duration: float = 5.0) -> Dict:
+        """서버 → 클라이언트 TCP 처리량"""
+        sock, reader, _ = self._connect({"test": "tcp_download", "duration": duration})
+        with sock, reader:
+            start = time.monotonic()
+            received = _receive_all(sock)
+            seconds = time.monotonic() - start
+        return {"bytes": received, "seconds": round(seconds, 3), "mbps": _mbps(received, seconds)}
+
+    def udp(self, duration: float = 5.0, rate_mbps: float = 10.0, rtt_count: int = 20,
+            rtt_interval: float = 0.05, payload_size: int = UDP_PAYLOAD_SIZE) -> Dict:
+        """UDP 에코 RTT 분포와 UDP 부하 처리량/손실률"""
+        sock, reader, reply = self._connect({"test": "udp"})
+        session = reply["session"]
+        family = socket.AF_INET6 if ":" in sock.getpeername()[0] else socket.AF_INET
+        with sock, reader, socket.socket(family, socket.SOCK_DGRAM) as udp:
+            if self.source:
+                udp.bind((self.source, 0))
+            udp.connect((sock.getpeername()[0], reply["udp_port"]))
+            buf = bytearray(max(payload_size, _UDP_HEADER.size))
+            view = memoryview(buf)
+
+            rtt = self._udp_echo(udp, buf, view, session, rtt_count, rtt_interval)
+
+            # 부하 전송: 목표 전송률에 맞춰 1ms 단위로 몰아서 전송
+            per_second = rate_mbps * 1e6 / 8 / len(buf)
+            sent = 0
+            start = time.monotonic()
+            deadline = start + duration
+            while True:
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                due = int((now - start) * per_second) + 1
+                while sent < due:
+                    _UDP_HEADER.pack_into(buf, 0, _MAGIC, _KIND_LOAD, session, sent, now)
+                    try:
+                        udp.send(view)
+                    except OSError:
+                        pass
+                    sent += 1
+                time.sleep(0.001)
+            seconds = time.monotonic() - start
+            # 전송 중인 패킷이 도착할 시간
+            time.sleep(min(0.2, self.timeout))
+            sock.sendall(b"done\n")
+            result = json.loads(reader.readline(4096) or b"{}")
+
+        received = result.get("packets", 0)
+        return {
+            "rtt": rtt,
+            "sent": sent,
+            "received": received,
+            "loss": round(1 - received / sent, 4) if sent else None,
+            "bytes": result.get("bytes", 0),
+            "seconds": round(seconds, 3),
+            "mbps": _mbps(result.get("bytes", 0), seconds),
+        }
+
+    def _udp_echo(self, udp: socket.socket, buf: bytearray, view: memoryview, session: int,
+                  count: int, interval: float) -> Dict:
+        sent_at: Dict[int, float] = {}
+        rtts: List[float] = []
+        recv_buf = bytearray(len(buf))
+        start = time.monotonic()
+        deadline = start + (count - 1) * interval + 1.0
+        seq = 0
+        while True:
+            now = time.monotonic()
+            if seq < count and now >= start + seq * interval:
+                _UDP_HEADER.pack_into(buf, 0, _MAGIC, _KIND_ECHO, session, seq, now)
+                sent_at[seq] = now
+                try:
+                    udp.send(view)
+                except OSError:
+                    pass
+                seq += 1
+            if (seq >= count and len(rtts) >= count) or now >= deadline:
+                break
+            wait = deadline - now
+            if seq < count:
+                wait = min(wait, start + seq * interval - now)
+            if select.select([udp], [], [], max(wait, 0))[0]:
+                try:
+                    n = udp.recv_into(recv_buf)
+                except OSError:
+                    continue
+                if n >= _UDP_HEADER.size:
+                    _, kind, _, echo_seq, _ = _UDP_HEADER.unpack_from(recv_buf)
+                    if kind == _KIND_ECHO and echo_seq in sent_at:
+                        rtts.append((time.monotonic() - sent_at.pop(echo_seq)) * 1000)
+
+        return {
+            "sent": count,
+            "received": len(rtts),
+            "loss": round(1 - len(rtts) / count, 4) if count else None,
+            "min_ms": round(min(rtts), 3) if rtts else None,
+            "avg_ms": round(sum(rtts) / len(rtts), 3) if rtts else None,
+            "max_ms": round(max(rtts), 3) if rtts else None,
+            "p50_ms": _percentile(rtts, 50),
+            "p90_ms": _percentile(rtts, 90),
+            "p99_ms": _percentile(rtts, 99),
+        }
+
+    def run(self, duration: float = 5.0, udp_rate_mbps: float = 10.0,
+            rtt_count: int = 20, rtt_interval: float = 0.05) -> Dict:
+        """전체 벤치마크 실행"""
+        results: Dict = {"target": f"{self.host}:{self.port}", "source": self.source}
+        for name, test in (
+            ("tcp_upload", lambda: self.tcp_upload(duration)),
+            ("tcp_download", lambda: self.tcp_download(duration)),
+            ("udp", lambda: self.udp(duration, udp_rate_mbps, rtt_count, rtt_interval)),
+        ):
+            try:
+                results[name] = test()
+            except (OSError, RuntimeError, ValueError) as e:
+                self.logger.error(f"Benchmark {name} failed: {str(e)}")
+                results[name] = {"error": str(e)}
+        return results
@@ -5,8 +5,10 @@ Click 및 Rich 기반 사용자 친화적 CLI
 
 import os
 import sys
+import json
+import time
 import click
-from typing import Dict
+from typing import Dict, Optional
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
@@ -18,7 +20,17 @@ from .vpn import VPNManager
 from .k8s import K8sManager
 from .firewall import FirewallManager
 from .monitor import HealthChecker, NodeMonitor, generate_health_summary
+from .analytics import load_history, analyze_history
+from .endpoints import EndpointSelector, master_endpoints
+from .portmatrix import (
+    DEFAULT_CONCURRENCY, OPEN, CLOSED, TIMEOUT,
+    build_matrix, default_ports, list_nodes, parse_port_specs,
+)
+from .pmtu import apply_fix as apply_mtu_fix, check_alignment
+from .overlay import DEFAULT_PORTS as OVERLAY_PORTS, OverlayResponder, probe_overlays
+from .bench import BenchClient, BenchServer, DEFAULT_PORT as BENCH_PORT
 from .doc_generator import DocGenerator
+from .waiters import describe, wait_for
 
 console = Console()
 
@@ -89,6 +101,76 @@ class AgentOrchestrator:
         console.print("\n[yellow]롤백 완료[/yellow]")
         self.logger.info("Rollback completed")
     
+    def select_control_plane(self) -> bool:
+        """master.endpoints 를 동시에 프로브해 가장 빠른 정상 엔드포인트를 마스터로 사용
+
+        Returns:
+            bool: 엔드포인트를 선택했는지 (endpoints 가 2개 미만이면 False)
+        """
+        endpoints = master_endpoints({"endpoints": self.config.master.endpoints},
+                                     self.config.firewall.k8s_api_port)
+        if len(endpoints) < 2:
+            return False
+        
+        with console.status("[bold green]제어 평면 엔드포인트 측정 중...[/bold green]"):
+            selector = EndpointSelector(endpoints)
+            best = selector.select()
+        
+        table = Table(title="제어 평면 엔드포인트")
+        table.add_column("엔드포인트", style="cyan")
+        table.add_column("연결 (ms)", style="white")
+        table.add_column("readyz (ms)", style="white")
+        table.add_column("상태", style="white")
+        for result in selector.ranking:
+            table.add_row(
+                result.endpoint,
+                f"{result.connect_ms:.1f}" if result.connect_ms is not None else "-",
+                f"{result.readyz_ms:.1f}" if result.readyz_ms is not None else "-",
+                result.message,
+            )
+        console.print(table)
+        
+        if best is None or not best.success:
+            self.log_step("엔드포인트 선택", "failed", "정상 엔드포인트 없음")
+            return False
+        
+        self.config.master.ip = best.host
+        self.config.master.api_endpoint = f"https://{best.endpoint}"
+        self.config.firewall.k8s_api_port = best.port
+        self.log_step("엔드포인트 선택", "success", best.endpoint)
+        return True
+    
+    def resolve_master_vpn_ip(self, timeout: float = 10.0) -> Optional[str]:
+        """tailscale 피어 데이터에서 마스터의 VPN IP 조회
+        
+        VPN 연결 직후에는 피어 목록이 아직 채워지지 않았을 수 있으므로 나타날 때까지 대기합니다.
+        """
+        known_ips = [self.config.master.vpn_ip, self.config.master.ip]
+        waited = wait_for(lambda: self.vpn_manager.get_master_vpn_ip(known_ips), timeout,
+                          name="master VPN peer", initial_interval=0.2)
+        if waited:
+            self.config.master.vpn_ip = waited.value
+            self.log_step("마스터 VPN 주소", "success", f"{waited.value} ({describe(waited)})")
+            return waited.value
+        
+        console.print("[yellow]⚠ VPN 피어 목록에서 마스터를 찾을 수 없습니다 "
+                      "(vpn.master_hostname 또는 vpn.master_tag 설정 확인)[/yellow]")
+        self.log_step("마스터 VPN 주소", "failed", "피어를 찾을 수 없음")
+        return None
+    
+    def establish_direct_path(self, vpn_ip: str) -> bool:
+        """조인 전 마스터 피어까지 직접 경로 확립 (릴레이 경유여도 조인은 계속)"""
+        timeout = self.config.vpn.direct_path_timeout
+        if not timeout:
+            return True
+        result, direct, summary = self.vpn_manager.establish_direct_path(vpn_ip, timeout)
+        if direct:
+            self.log_step("VPN 직접 경로", "success", f"{result.via} ({summary})")
+        else:
+            via = result.via if result is not None and result.via else "확인 실패"
+            self.log_step("VPN 직접 경로", "failed", f"{via} ({summary})")
+        return direct
+    
     def run(self) -> bool:
         """메인 실행 로직"""
         try:
@@ -101,9 +183,22 @@ class AgentOrchestrator:
             
             self.logger.info("=== Agent execution started ===")
             
+            # HA 제어 평면이면 가장 빠른 정상 엔드포인트를 조인/체크 대상으로 사용
+            self.select_control_plane()
+            
             # 마스터 노드와의 직접 연결 확인
             master_ip = self.config.master.ip
-            network_result = self.network_checker.comprehensive_check(master_ip)
+            api_port = self.config.firewall.k8s_api_port
+            monitor_cfg = self.config.monitor
+            link_options = {
+                "ping_count": monitor_cfg.ping_count,
+                "ping_interval": monitor_cfg.ping_interval,
+                "min_link_score": monitor_cfg.link_quality_min_score,
+            }
+            # 응답은 있지만 링크 품질이 낮으면 직접 통신 불가로 보고 VPN 을 설정
+            network_result = self.network_checker.comprehensive_check(
+                master_ip, api_port=api_port, **link_options
+            )
             
             # 2. VPN 설정 (필요시)
             if self.config.vpn.enabled and not network_result["overall"]:
@@ -123,8 +218,18 @@ class AgentOrchestrator:
                 # VPN 연결 후 재확인
                 vpn_ip = self.vpn_manager.get_vpn_ip()
                 if vpn_ip:
-                    master_ip = vpn_ip.rsplit('.', 1)[0] + '.1'  # VPN 네트워크의 마스터 IP 추정
-                    network_result = self.network_checker.comprehensive_check(master_ip, "tailscale0")
+                    if self.select_control_plane():
+                        # VPN 으로 도달 가능해진 엔드포인트 중 재선택
+                        master_ip = self.config.master.ip
+                        api_port = self.config.firewall.k8s_api_port
+                    else:
+                        vpn_master = self.resolve_master_vpn_ip()
+                        if vpn_master:
+                            master_ip = vpn_master
+                            self.establish_direct_path(vpn_master)
+                    network_result = self.network_checker.comprehensive_check(
+                        master_ip, "tailscale0", api_port=api_port, **link_options
+                    )
                     
                     if not network_result["overall"]:
                         self.logger.error("Network check failed after VPN connection")
@@ -324,11 +429,7 @@ def health(config_path, save_report):
     
     # 설정 로드
     if config_path:
-        config_obj = Config.from_yaml(config_path)
-        config_dict = {
-            "master": {"ip": config_obj.master.ip},
-            "vpn": {"enabled": config_obj.vpn.enabled},
-        }
+        config_dict = Config(config_path).to_dict()
     else:
         console.print("[yellow]경고: 설정 파일이 제공되지 않았습니다. 기본값 사용[/yellow]")
         config_dict = {}
@@ -340,7 +441,7 @@ def health(config_path, save_report):
         results = checker.check_all()
     
     # 결과 출력
-    status_color = "green" if results["overall_status"] == "healthy" else "red"
+    status_color = {"healthy": "green", "degraded": "yellow"}.get(results["overall_status"], "red")
     console.print(f"\n[bold {status_color}]전체 상태: {results['overall_status'].upper()}[/bold {status_color}]\n")
     
     # 개별 체크 결과
@@ -368,7 +469,7 @@ def health(config_path, save_report):
         console.print(f"\n[green]✅ 리포트 저장: {report_file}[/green]")
     
     # 종료 코드
-    sys.exit(0 if results["overall_status"] == "healthy" else 1)
+    sys.exit(1 if results["overall_status"] == "unhealthy" else 0)
 
 
 @cli.command()
@@ -378,16 +479,20 @@ def health(config_path, save_report):
               help="모니터링 간격 (초, 기본값: 60)")
 @click.option("--duration", type=int, default=None,
               help="모니터링 지속 시간 (초, 기본값: 무한)")
-def monitor(config_path, interval, duration):
+@click.option("--events-port", type=int, default=None,
+              help="상태 전이 SSE 스트림 포트 (설정 파일의 monitor.events_port 대체)")
+@click.option("--events-socket", type=click.Path(), default=None,
+              help="상태 전이 SSE 스트림 유닉스 소켓 경로")
+def monitor(config_path, interval, duration, events_port, events_socket):
     """시스템을 지속적으로 모니터링"""
     console.print("[bold cyan]K8s VPN Agent - 모니터링 시작[/bold cyan]\n")
     
     # 설정 로드
-    config_obj = Config.from_yaml(config_path)
-    config_dict = {
-        "master": {"ip": config_obj.master.ip},
-        "vpn": {"enabled": config_obj.vpn.enabled},
-    }
+    config_dict = Config(config_path).to_dict()
+    if events_port is not None:
+        config_dict["monitor"]["events_port"] = events_port
+    if events_socket:
+        config_dict["monitor"]["events_socket"] = events_socket
     
     # 모니터 시작
     monitor_obj = NodeMonitor(config_dict, interval=interval)
@@ -435,6 +540,7 @@ def health_summary(log_dir):
     table.add_row("최근 상태", summary["latest_status"])
     table.add_row("총 체크 횟수", str(summary["total_checks"]))
     table.add_row("정상 체크", str(summary["healthy_checks"]))
+    table.add_row("성능 저하 체크", str(summary.get("degraded_checks", 0)))
     table.add_row("비정상 체크", str(summary["unhealthy_checks"]))
     table.add_row("정상률", f"{summary['health_rate']}%")
     
@@ -444,6 +550,413 @@ def health_summary(log_dir):
         console.print(f"\n[yellow]⚠️  {summary['warning']}[/yellow]")
 
 
+@cli.command()
+@click.option("--log-dir", "log_dirs", type=click.Path(exists=True), multiple=True,
+              help="히스토리 파일 또는 로그 디렉토리 (여러 번 지정 가능, 기본값: /var/log/k8s-vpn-agent)")
+@click.option("--check", "checks", multiple=True,
+              help="분석할 체크 이름 (여러 번 지정 가능, 기본값: 전체)")
+@click.option("--max-gap", type=float, default=None,
+              help="연속 샘플로 간주할 최대 간격 (초, 기본값: 중앙값 간격의 3배)")
+@click.option("--outages", type=int, default=5,
+              help="체크별로 표시할 최근 장애 구간 수 (기본값: 5)")
+@click.option("--no-cache", is_flag=True, help="컬럼 캐시(.npz)를 사용하지 않음")
+@click.option("--json", "json_output", type=click.Path(), default=None,
+              help="전체 분석 결과를 JSON 파일로 저장")
+def analyze(log_dirs, checks, max_gap, outages, no_cache, json_output):
+    """헬스 히스토리 장기 분석 (가용성, 장애 구간, MTBF/MTTR)"""
+    console.print("[bold cyan]K8s VPN Agent - 헬스 히스토리 분석[/bold cyan]\n")
+    
+    paths = list(log_dirs) or ["/var/log/k8s-vpn-agent"]
+    
+    with console.status("[bold green]히스토리 로드 중...[/bold green]"):
+        columns = load_history(paths, use_cache=not no_cache)
+        result = analyze_history(
+            columns,
+            max_gap=max_gap,
+            checks=list(checks) or None,
+            max_outages=None if json_output else outages,
+        )
+    
+    if result.get("status") == "no_data":
+        console.print(f"[yellow]{result['message']}[/yellow]")
+        return
+    
+    console.print(f"샘플: {result['samples']}  노드: {result['nodes']}  "
+                  f"기간: {result['start']} ~ {result['end']}  간격: {result['interval']:g}초\n")
+    
+    def fmt_seconds(value):
+        if value is None:
+            return "-"
+        if value >= 3600:
+            return f"{value / 3600:.1f}h"
+        if value >= 60:
+            return f"{value / 60:.1f}m"
+        return f"{value:.0f}s"
+    
+    table = Table(title="체크별 가용성")
+    table.add_column("체크", style="cyan")
+    table.add_column("가용성", style="white")
+    table.add_column("장애", style="white")
+    table.add_column("MTBF", style="white")
+    table.add_column("MTTR", style="white")
+    table.add_column("노드 가용성 p50/p90/p99", style="white")
+    
+    for name, stats in result["checks"].items():
+        node_pct = stats["node_availability_percentiles"]
+        table.add_row(
+            name,
+            f"{stats['availability']:.3f}%" if stats["availability"] is not None else "-",
+            str(stats["outages"]),
+            fmt_seconds(stats["mtbf"]),
+            fmt_seconds(stats["mttr"]),
+            " / ".join("-" if v is None else f"{v:.2f}" for v in node_pct.values()),
+        )
+    
+    console.print(table)
+    
+    months = sorted({m for stats in result["checks"].values() for m in stats["monthly"]})
+    if months:
+        monthly = Table(title="월별 가용성 (%)")
+        monthly.add_column("체크", style="cyan")
+        for month in months:
+            monthly.add_column(month, style="white")
+        for name, stats in result["checks"].items():
+            monthly.add_row(name, *[
+                f"{stats['monthly'][m]:.3f}" if m in stats["monthly"] else "-" for m in months
+            ])
+        console.print(monthly)
+    
+    for name, stats in result["checks"].items():
+        intervals = stats["outage_intervals"][:outages]
+        if not intervals:
+            continue
+        console.print(f"\n[bold]{name}[/bold] 최근 장애 구간:")
+        for outage in intervals:
+            console.print(f"  {outage['node']}: {outage['start']} ~ {outage['end']} "
+                          f"({fmt_seconds(outage['duration'])})")
+    
+    if json_output:
+        with open(json_output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        console.print(f"\n[green]✅ 분석 결과 저장: {json_output}[/green]")
+
+
+@cli.group()
+def netcheck():
+    """클러스터 네트워크 진단"""
+    pass
+
+
+@netcheck.command("matrix")
+@click.option("-c", "--config", "config_path", type=click.Path(exists=True),
+              help="설정 파일 경로 (firewall 포트 설정 사용)")
+@click.option("--node", "node_specs", multiple=True,
+              help="검사할 노드 (이름=주소 또는 주소, 반복 가능). 생략 시 kubectl get nodes")
+@click.option("--port", "port_specs", multiple=True,
+              help="검사할 포트 (예: 10250, 30000-30010, 179/tcp, 반복 가능). 생략 시 설정 기반 기본값")
+@click.option("--timeout", type=float, default=2.0,
+              help="연결별 타임아웃 (초, 기본값: 2)")
+@click.option("--concurrency", type=int, default=DEFAULT_CONCURRENCY,
+              help=f"최대 동시 연결 수 (기본값: {DEFAULT_CONCURRENCY})")
+@click.option("--json", "json_output", type=click.Path(), default=None,
+              help="결과를 JSON 파일로 저장")
+def netcheck_matrix(config_path, node_specs, port_specs, timeout, concurrency, json_output):
+    """모든 노드 × 포트 도달성 매트릭스 검사"""
+    console.print("[bold cyan]K8s VPN Agent - 포트 도달성 매트릭스[/bold cyan]\n")
+    
+    config_dict = Config(config_path).to_dict() if config_path else {}
+    
+    if node_specs:
+        nodes = {}
+        for spec in node_specs:
+            name, sep, address = spec.partition("=")
+            nodes[name] = address if sep else name
+    else:
+        nodes = list_nodes()
+    if not nodes:
+        console.print("[red]❌ 검사할 노드가 없습니다 (--node 지정 또는 kubectl 설정 확인)[/red]")
+        sys.exit(1)
+    
+    ports = parse_port_specs(port_specs) if port_specs else default_ports(config_dict.get("firewall", {}))
+    if not ports:
+        console.print("[red]❌ 검사할 TCP 포트가 없습니다[/red]")
+        sys.exit(1)
+    
+    with console.status(f"[bold green]{len(nodes)}개 노드 × {len(ports)}개 포트 검사 중...[/bold green]"):
+        matrix = build_matrix(nodes, ports, timeout=timeout, concurrency=concurrency)
+    
+    symbols = {OPEN: "[green]✓[/green]", CLOSED: "[red]✗[/red]", TIMEOUT: "[yellow]…[/yellow]"}
+    table = Table(title=f"포트 도달성 ({matrix.elapsed_ms / 1000:.2f}초)")
+    table.add_column("노드", style="cyan")
+    table.add_column("주소", style="white")
+    for port in matrix.ports:
+        table.add_column(str(port), justify="center")
+    for node, address in matrix.nodes.items():
+        table.add_row(node, address, *(symbols.get(matrix.state(node, port), "[red]![/red]")
+                                       for port in matrix.ports))
+    console.print(table)
+    console.print("✓ 열림  ✗ 닫힘(RST)  … 응답 없음  ! 오류")
+    
+    unreachable = matrix.unreachable()
+    if unreachable:
+        console.print(f"\n[yellow]⚠ 도달 불가 {len(unreachable)}건[/yellow]")
+    else:
+        console.print("\n[green]✅ 모든 노드의 모든 포트에 도달 가능[/green]")
+    
+    if json_output:
+        with open(json_output, "w", encoding="utf-8") as f:
+            json.dump(matrix.to_dict(), f, indent=2, ensure_ascii=False)
+        console.print(f"\n[green]✅ 결과 저장: {json_output}[/green]")
+    
+    sys.exit(1 if unreachable else 0)
+
+
+@netcheck.command("mtu")
+@click.option("-c", "--config", "config_path", type=click.Path(exists=True),
+              help="설정 파일 경로 (master.ip 를 기본 측정 대상으로 사용)")
+@click.option("--target", "targets", multiple=True,
+              help="경로 MTU 측정 대상 (마스터/피어의 VPN IP, 반복 가능)")
+@click.option("--interface", "-I", default="tailscale0",
+              help="VPN 인터페이스 (기본값: tailscale0)")
+@click.option("--timeout", type=float, default=1.0,
+              help="크기별 응답 대기 시간 (초, 기본값: 1)")
+@click.option("--fix", is_flag=True, help="권장 MTU 를 인터페이스와 CNI 설정에 적용")
+@click.option("--json", "json_output", type=click.Path(), default=None,
+              help="결과를 JSON 파일로 저장")
+def netcheck_mtu(config_path, targets, interface, timeout, fix, json_output):
+    """경로 MTU 측정 및 VPN/CNI MTU 정합성 점검"""
+    console.print("[bold cyan]K8s VPN Agent - 경로 MTU 점검[/bold cyan]\n")
+    
+    config_dict = Config(config_path).to_dict() if config_path else {}
+    targets = list(targets)
+    if not targets and config_dict.get("master", {}).get("ip"):
+        targets = [config_dict["master"]["ip"]]
+    if not targets:
+        console.print("[red]❌ 측정 대상이 없습니다 (--target 또는 설정 파일의 master.ip)[/red]")
+        sys.exit(1)
+    
+    with console.status("[bold green]경로 MTU 탐색 중...[/bold green]"):
+        report = check_alignment(targets, interface, timeout=timeout)
+    
+    table = Table(title="경로 MTU")
+    table.add_column("대상", style="cyan")
+    table.add_column("주소", style="white")
+    table.add_column("측정 MTU", style="white")
+    table.add_column("커널 MTU", style="white")
+    table.add_column("프로브", style="white")
+    for path in report.paths:
+        table.add_row(path.host, path.address or "-",
+                      str(path.mtu) if path.mtu else f"[red]{path.error}[/red]",
+                      str(path.kernel_mtu or "-"), str(path.probes))
+    console.print(table)
+    
+    console.print(f"\n{interface} MTU: {report.vpn_mtu or '-'}")
+    if report.overlay:
+        name, kind, overhead = report.overlay
+        console.print(f"오버레이: {kind} ({name}, 헤더 {overhead}바이트)")
+    for source, mtu in {**report.cni_mtus,
+                        **{f"interface:{n}": m for n, m in report.cni_interfaces.items()}}.items():
+        console.print(f"CNI MTU: {mtu} ({source})")
+    
+    if report.ok:
+        console.print("\n[green]✅ MTU 설정이 측정된 경로와 일치합니다[/green]")
+    else:
+        console.print()
+        for issue in report.issues:
+            console.print(f"[yellow]⚠ {issue}[/yellow]")
+        if report.recommended_vpn_mtu:
+            console.print(f"  권장 {interface} MTU: {report.recommended_vpn_mtu}")
+        if report.recommended_cni_mtu:
+            console.print(f"  권장 CNI MTU: {report.recommended_cni_mtu}")
+    
+    fixed = False
+    if fix and (report.recommended_vpn_mtu or report.recommended_cni_mtu):
+        changes = apply_mtu_fix(report)
+        for change in changes:
+            console.print(f"  [green]✓[/green] {change}")
+        if changes:
+            console.print("[yellow]기존 파드는 재시작해야 새 MTU 가 적용됩니다[/yellow]")
+        fixed = bool(changes)
+    
+    if json_output:
+        with open(json_output, "w", encoding="utf-8") as f:
+            json.dump(report.to_dict(), f, indent=2, ensure_ascii=False)
+        console.print(f"\n[green]✅ 결과 저장: {json_output}[/green]")
+    
+    sys.exit(0 if report.ok or fixed else 1)
+
+
+def _overlay_ports(port_specs) -> Dict[str, int]:
+    """"vxlan=4789" 형식의 포트 지정을 오버레이별 포트로 변환"""
+    ports = dict(OVERLAY_PORTS)
+    for spec in port_specs:
+        name, _, port = spec.partition("=")
+        if name not in OVERLAY_PORTS or not port.isdigit():
+            raise click.BadParameter(f"잘못된 포트 지정: {spec} (예: vxlan=4789)")
+        ports[name] = int(port)
+    return ports
+
+
+@netcheck.command("overlay")
+@click.argument("target")
+@click.option("--type", "overlays", multiple=True, type=click.Choice(list(OVERLAY_PORTS)),
+              help="검사할 오버레이 (반복 가능, 기본값: 전체)")
+@click.option("--port", "port_specs", multiple=True,
+              help="오버레이 포트 변경 (예: vxlan=4789, 반복 가능)")
+@click.option("--bursts", type=int, default=5, help="버스트 수 (기본값: 5)")
+@click.option("--burst-size", type=int, default=20, help="버스트당 패킷 수 (기본값: 20)")
+@click.option("--size", type=int, default=512, help="UDP 페이로드 크기 (바이트, 기본값: 512)")
+@click.option("--json", "json_output", type=click.Path(), default=None,
+              help="결과를 JSON 파일로 저장")
+def netcheck_overlay(target, overlays, port_specs, bursts, burst_size, size, json_output):
+    """피어의 오버레이 응답기로 VXLAN/Geneve/WireGuard UDP 전달 검사"""
+    console.print(f"[bold cyan]K8s VPN Agent - 오버레이 캡슐화 검사 ({target})[/bold cyan]\n")
+    
+    ports = _overlay_ports(port_specs)
+    overlays = list(overlays) or list(OVERLAY_PORTS)
+    with console.status("[bold green]오버레이 프로브 전송 중...[/bold green]"):
+        results = probe_overlays(target, overlays, ports=ports, bursts=bursts,
+                                 burst_size=burst_size, size=size)
+    
+    table = Table(title="오버레이 UDP 전달")
+    table.add_column("오버레이", style="cyan")
+    table.add_column("포트", style="white")
+    table.add_column("전달률", style="white")
+    table.add_column("순서 뒤바뀜", style="white")
+    table.add_column("중복", style="white")
+    table.add_column("RTT avg/p99 (ms)", style="white")
+    for overlay, result in results.items():
+        data = result.to_dict()
+        if not result.success:
+            table.add_row(overlay, str(result.port), f"[red]0% ({result.error})[/red]", "-", "-", "-")
+            continue
+        color = "green" if result.delivery >= 0.99 else "yellow"
+        table.add_row(
+            overlay, str(result.port),
+            f"[{color}]{result.delivery * 100:.1f}% ({result.received}/{result.sent})[/{color}]",
+            str(result.reordered), str(result.duplicates),
+            f"{data['avg_ms']:.2f} / {data['p99_ms']:.2f}",
+        )
+    console.print(table)
+    
+    if json_output:
+        with open(json_output, "w", encoding="utf-8") as f:
+            json.dump({name: r.to_dict() for name, r in results.items()}, f, indent=2, ensure_ascii=False)
+        console.print(f"\n[green]✅ 결과 저장: {json_output}[/green]")
+    
+    sys.exit(0 if all(r.success for r in results.values()) else 1)
+
+
+@netcheck.command("overlay-responder")
+@click.option("--bind", default="::", help="바인드 주소 (기본값: :: , IPv4/IPv6 모두)")
+@click.option("--port", "port_specs", multiple=True,
+              help="오버레이 포트 변경 (예: vxlan=4789, 반복 가능)")
+def netcheck_overlay_responder(bind, port_specs):
+    """오버레이 프로브 응답기 실행 (Ctrl+C 로 중지)"""
+    responder = OverlayResponder(bind, _overlay_ports(port_specs))
+    try:
+        responder.start()
+    except OSError as e:
+        console.print(f"[red]❌ 오류: {e}[/red]")
+        sys.exit(1)
+    ports = ", ".join(f"{name} {port}/udp" for name, port in responder.addresses.items())
+    console.print(f"[green]오버레이 응답기 대기 중: {bind} ({ports})[/green]")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        console.print(f"\n[yellow]오버레이 응답기 중지 (응답 {responder.echoed}개)[/yellow]")
+    finally:
+        responder.stop()
+
+
+@cli.group("bench-net")
+def bench_net():
+    """VPN 경로 처리량/지연 벤치마크 (서버/클라이언트)"""
+    pass
+
+
+@bench_net.command("server")
+@click.option("--bind", default="0.0.0.0", help="바인드 주소 (기본값: 0.0.0.0)")
+@click.option("--port", type=int, default=BENCH_PORT,
+              help=f"TCP/UDP 포트 (기본값: {BENCH_PORT})")
+def bench_server(bind, port):
+    """벤치마크 서버 실행 (Ctrl+C 로 중지)"""
+    server = BenchServer(bind, port)
+    server.start()
+    console.print(f"[green]벤치마크 서버 대기 중: {server.address} (TCP/UDP)[/green]")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        console.print("\n[yellow]벤치마크 서버 중지[/yellow]")
+    finally:
+        server.stop()
+
+
+@bench_net.command("client")
+@click.argument("target")
+@click.option("--port", type=int, default=BENCH_PORT,
+              help=f"서버 포트 (기본값: {BENCH_PORT})")
+@click.option("--interface", "-I", default=None,
+              help="출발지 인터페이스 (예: tailscale0)")
+@click.option("--duration", type=float, default=5.0,
+              help="테스트별 전송 시간 (초, 기본값: 5)")
+@click.option("--udp-rate", type=float, default=10.0,
+              help="UDP 목표 전송률 (Mbps, 기본값: 10)")
+@click.option("--rtt-count", type=int, default=20,
+              help="RTT 측정 패킷 수 (기본값: 20)")
+@click.option("--json", "json_output", type=click.Path(), default=None,
+              help="결과를 JSON 파일로 저장")
+def bench_client(target, port, interface, duration, udp_rate, rtt_count, json_output):
+    """벤치마크 서버로 TCP/UDP 처리량, RTT 분포, 손실률 측정"""
+    console.print(f"[bold cyan]K8s VPN Agent - 네트워크 벤치마크 ({target}:{port})[/bold cyan]\n")
+    
+    try:
+        client = BenchClient(target, port, interface=interface)
+    except ValueError as e:
+        console.print(f"[red]❌ 오류: {e}[/red]")
+        sys.exit(1)
+    
+    with console.status("[bold green]측정 중...[/bold green]"):
+        result = client.run(duration=duration, udp_rate_mbps=udp_rate, rtt_count=rtt_count)
+    
+    table = Table(title="처리량")
+    table.add_column("테스트", style="cyan")
+    table.add_column("Mbps", style="white")
+    table.add_column("바이트", style="white")
+    table.add_column("비고", style="white")
+    for name, label in (("tcp_upload", "TCP 업로드"), ("tcp_download", "TCP 다운로드"), ("udp", "UDP")):
+        stats = result[name]
+        if "error" in stats:
+            table.add_row(label, "-", "-", f"[red]{stats['error']}[/red]")
+            continue
+        note = ""
+        if name == "udp":
+            loss = stats["loss"]
+            note = f"손실 {loss * 100:.2f}% ({stats['received']}/{stats['sent']})" if loss is not None else ""
+        table.add_row(label, f"{stats['mbps']:.2f}", str(stats.get("bytes", "-")), note)
+    console.print(table)
+    
+    rtt = result["udp"].get("rtt")
+    if rtt:
+        def fmt(value):
+            return "-" if value is None else f"{value:.2f}"
+        console.print(
+            f"\nRTT (ms): min {fmt(rtt['min_ms'])}  avg {fmt(rtt['avg_ms'])}  "
+            f"p50 {fmt(rtt['p50_ms'])}  p90 {fmt(rtt['p90_ms'])}  p99 {fmt(rtt['p99_ms'])}  "
+            f"max {fmt(rtt['max_ms'])}  손실 {rtt['sent'] - rtt['received']}/{rtt['sent']}"
+        )
+    
+    if json_output:
+        with open(json_output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+        console.print(f"\n[green]✅ 결과 저장: {json_output}[/green]")
+    
+    if any("error" in result[name] for name in ("tcp_upload", "tcp_download", "udp")):
+        sys.exit(1)
+
+
 @cli.command()
 @click.option("-l", "--log-file", "log_file", type=click.Path(exists=True),
               required=True, help="분석할 로그 파일")
@@ -19,6 +19,8 @@ class MasterConfig:
     api_endpoint: str = ""
     token: str = ""
     ca_cert_hash: str = ""
+    endpoints: list = field(default_factory=list)
+    vpn_ip: str = ""
 
 
 @dataclass
@@ -29,6 +31,10 @@ class VPNConfig:
     headscale_url: str = ""
     auth_key: str = ""
     namespace: str = "default"
+    master_hostname: str = ""
+    master_tag: str = ""
+    localapi_socket: str = "/var/run/tailscale/tailscaled.sock"
+    direct_path_timeout: int = 15
 
 
 @dataclass
@@ -70,6 +76,44 @@ class AgentConfig:
     idempotent: bool = True
 
 
+@dataclass
+class MonitorConfig:
+    """모니터링 설정"""
+    latency_ewma_alpha: float = 0.02
+    latency_z_threshold: float = 3.0
+    latency_warmup_samples: int = 10
+    latency_min_deviation_ms: float = 20.0
+    latency_rebaseline_samples: int = 120
+    ping_count: int = 10
+    ping_interval: float = 0.2
+    link_quality_min_score: float = 50.0
+    endpoint_rerank_interval: int = 300
+    vpn_peer_refresh_interval: int = 300
+    vpn_path_check: bool = True
+    topology_interval: int = 300
+    topology_ping_count: int = 5
+    topology_tier_thresholds_ms: list = field(default_factory=lambda: [5.0, 30.0, 100.0])
+    path_switch_margin: float = 15.0
+    path_switch_samples: int = 3
+    path_fail_samples: int = 2
+    path_min_hold: int = 120
+    path_failover_file: str = "path_failovers.jsonl"
+    anomaly_state_file: str = "anomaly_state.json"
+    nodefs_path: str = "/"
+    imagefs_path: str = "/var/lib/containers/storage"
+    kubelet_config: str = "/var/lib/kubelet/config.yaml"
+    eviction_nodefs_available: str = ""
+    eviction_imagefs_available: str = ""
+    disk_trend_window: int = 20
+    disk_sample_interval: int = 300
+    disk_forecast_horizon_hours: float = 24.0
+    disk_state_file: str = "disk_trend.json"
+    events_port: int = 0
+    events_bind: str = "127.0.0.1"
+    events_socket: str = ""
+    events_buffer: int = 1000
+
+
 @dataclass
 class RuntimeConfig:
     """컨테이너 런타임 설정"""
@@ -95,6 +139,7 @@ class Config:
         self.network = NetworkConfig()
         self.firewall = FirewallConfig()
         self.agent = AgentConfig()
+        self.monitor = MonitorConfig()
         self.runtime = RuntimeConfig()
         
         if config_path:
@@ -157,6 +202,11 @@ class Config:
                 if hasattr(self.agent, key):
                     setattr(self.agent, key, value)
         
+        if 'monitor' in data:
+            for key, value in data['monitor'].items():
+                if hasattr(self.monitor, key):
+                    setattr(self.monitor, key, value)
+        
         if 'runtime' in data:
             for key, value in data['runtime'].items():
                 if hasattr(self.runtime, key):
@@ -176,6 +226,7 @@ class Config:
             'network': asdict(self.network),
             'firewall': asdict(self.firewall),
             'agent': asdict(self.agent),
+            'monitor': asdict(self.monitor),
             'runtime': asdict(self.runtime),
         }
         
@@ -194,6 +245,7 @@ class Config:
             'network': asdict(self.network),
             'firewall': asdict(self.firewall),
             'agent': asdict(self.agent),
+            'monitor': asdict(self.monitor),
             'runtime': asdict(self.runtime),
         }
     
@@ -209,6 +261,8 @@ master:
   api_endpoint: "https://10.0.1.100:6443"
   token: ""  # kubeadm token (마스터에서 생성: kubeadm token create)
   ca_cert_hash: ""  # CA 인증서 해시 (sha256:xxxxx 형식)
+  endpoints: []  # HA 제어 평면 엔드포인트 목록 (예: ["10.0.1.100:6443", "10.0.2.100:6443"]), 가장 빠른 정상 엔드포인트 사용
+  vpn_ip: ""  # 마스터의 VPN IP (지정 시 모니터가 직접 경로(ip)와 VPN 경로를 비교해 자동 전환)
 
 # VPN 설정
 vpn:
@@ -217,6 +271,10 @@ vpn:
   headscale_url: "https://headscale.example.com"
   auth_key: ""  # Headscale Pre-auth key
   namespace: "default"
+  master_hostname: ""  # 마스터 피어의 호스트 이름 또는 MagicDNS 이름 (VPN IP 조회용)
+  master_tag: ""  # 마스터 피어의 ACL 태그 (예: "tag:k8s-master")
+  localapi_socket: "/var/run/tailscale/tailscaled.sock"  # tailscaled LocalAPI 소켓 (없으면 tailscale CLI 사용)
+  direct_path_timeout: 15  # 조인 전 마스터 피어 직접 경로(비 DERP) 확립 대기 시간 (초, 0이면 건너뜀)
 
 # 워커 노드 설정
 worker:
@@ -251,6 +309,42 @@ agent:
   rollback_on_failure: true
   idempotent: true
 
+# 모니터링 설정
+monitor:
+  latency_ewma_alpha: 0.02  # 지연시간 기준선 EWMA 가중치
+  latency_z_threshold: 3.0  # degraded 판정 z-score
+  latency_warmup_samples: 10  # 판정 전 최소 관측 횟수
+  latency_min_deviation_ms: 20.0  # degraded 판정 최소 증가량 (ms)
+  latency_rebaseline_samples: 120  # 연속 degraded 가 이 횟수 이상이면 새 수준을 기준선으로 채택 (0이면 비활성화)
+  ping_count: 10  # 링크 품질 측정 패킷 수
+  ping_interval: 0.2  # 패킷 전송 간격 (초)
+  link_quality_min_score: 50.0  # 이 점수(0~100) 미만이면 응답이 있어도 네트워크 비정상
+  endpoint_rerank_interval: 300  # master.endpoints 순위 재측정 주기 (초)
+  vpn_peer_refresh_interval: 300  # 전체 VPN 피어 목록 갱신 주기 (초, 상태 확인은 자기 노드만 조회)
+  vpn_path_check: true  # 마스터 VPN 피어 경로(직접/DERP 릴레이)와 지연시간을 VPN 헬스체크에 보고
+  topology_interval: 300  # 피어 지연시간 측정/노드 레이블 게시 주기 (초, 0이면 비활성화)
+  topology_ping_count: 5  # 대상별 측정 패킷 수
+  topology_tier_thresholds_ms: [5.0, 30.0, 100.0]  # local/near/regional/far 등급 경계 (ms)
+  path_switch_margin: 15.0  # 경로 전환에 필요한 품질 점수 차이 (0~100)
+  path_switch_samples: 3  # 점수 우위가 연속으로 유지되어야 하는 주기 수
+  path_fail_samples: 2  # 현재 경로가 연속 실패하면 즉시 페일오버하는 횟수
+  path_min_hold: 120  # 품질 기반 경로 전환 사이 최소 간격 (초)
+  path_failover_file: "path_failovers.jsonl"  # log_dir 기준 경로 전환 기록
+  anomaly_state_file: "anomaly_state.json"  # log_dir 기준 상태 파일
+  nodefs_path: "/"  # 루트 파일시스템 (kubelet nodefs)
+  imagefs_path: "/var/lib/containers/storage"  # CRI-O 이미지 파일시스템
+  kubelet_config: "/var/lib/kubelet/config.yaml"  # evictionHard 값을 읽을 kubelet 설정
+  eviction_nodefs_available: ""  # 비워두면 kubelet 설정/기본값(10%) 사용
+  eviction_imagefs_available: ""  # 비워두면 kubelet 설정/기본값(15%) 사용
+  disk_trend_window: 20  # 추세 계산 샘플 수
+  disk_sample_interval: 300  # 추세 샘플 간격 (초)
+  disk_forecast_horizon_hours: 24  # 이 시간 내 임계값 도달 예상 시 degraded
+  disk_state_file: "disk_trend.json"  # log_dir 기준 상태 파일
+  events_port: 0  # 상태 전이 SSE 스트림 포트 (0이면 비활성화)
+  events_bind: "127.0.0.1"
+  events_socket: ""  # 지정 시 TCP 대신 유닉스 소켓 사용 (예: /run/k8s-vpn-agent/events.sock)
+  events_buffer: 1000  # 이어받기용으로 보관할 이벤트 수
+
 # 컨테이너 런타임
 runtime:
   type: "containerd"
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - DERP 릴레이 감지 및 직접 경로 확립 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- 피어 상태의 CurAddr / Relay 필드로 현재 경로 판별 (직접 UDP / DERP 릴레이)
+- disco ping 결과(LocalAPI JSON, tailscale ping 출력) 해석
+- 직접 경로가 생기거나 마감 시각이 지날 때까지 ping 으로 경로 탐색 유도
+- 피어별 마지막 릴레이/직접 경로 지연시간 보관 (헬스체크 보고용)
+
+tailscale 은 DERP 릴레이로 시작해 트래픽이 흐른 뒤에야 직접 연결로 전환하므로,
+릴레이 경유로 kubeadm join / TLS 부트스트랩을 하면 느리거나 시간 초과가 납니다.
+disco ping 을 반복하면 NAT 통과가 바로 시도되어 직접 경로가 빨리 생깁니다.
+"""
+
+import re
+from typing import Callable, Dict, Optional, Tuple
+
+from .results import PeerPathResult
+from .waiters import WaitResult, wait_for
+
+
+DIRECT = "direct"
+RELAY = "relay"
+UNKNOWN = "unknown"
+
+# tailscale ping 출력: "pong from master (100.64.0.1) via 203.0.113.7:41641 in 12ms"
+#                      "pong from master (100.64.0.1) via DERP(fra) in 48ms"
+_PONG_RE = re.compile(r"pong from \S+ \((?P<ip>[^)]+)\) via (?P<via>\S+) in (?P<ms>[\d.]+)ms")
+_DERP_RE = re.compile(r"DERP\((?P<region>[^)]*)\)")
+
+
+def peer_path(peer: Dict) -> Tuple[str, Optional[str]]:
+    """피어 상태(tailscale status 의 Peer 항목)로 현재 경로 판별 → (mode, via)"""
+    if peer.get("CurAddr"):
+        return DIRECT, peer["CurAddr"]
+    if peer.get("Relay"):
+        return RELAY, f"DERP({peer['Relay']})"
+    return UNKNOWN, None
+
+
+def parse_ping_result(ip: str, data: Dict) -> PeerPathResult:
+    """LocalAPI ping 응답(ipnstate.PingResult) 해석"""
+    if data.get("Err"):
+        return PeerPathResult(ip, UNKNOWN, error=data["Err"])
+    latency = data.get("LatencySeconds")
+    latency_ms = round(latency * 1000, 3) if latency is not None else None
+    if data.get("Endpoint"):
+        return PeerPathResult(ip, DIRECT, data["Endpoint"], latency_ms)
+    if data.get("DERPRegionCode") or data.get("DERPRegionID"):
+        region = data.get("DERPRegionCode") or str(data["DERPRegionID"])
+        return PeerPathResult(ip, RELAY, f"DERP({region})", latency_ms)
+    return PeerPathResult(ip, UNKNOWN, latency_ms=latency_ms)
+
+
+def parse_ping_output(ip: str, output: str) -> PeerPathResult:
+    """tailscale ping 출력 해석 (마지막 pong 기준)"""
+    pongs = list(_PONG_RE.finditer(output))
+    if not pongs:
+        lines = [line for line in output.strip().splitlines() if line.strip()]
+        return PeerPathResult(ip, UNKNOWN, error=lines[-1] if lines else "응답 없음")
+    pong = pongs[-1]
+    via, latency_ms = pong.group("via"), float(pong.group("ms"))
+    mode = RELAY if _DERP_RE.fullmatch(via) else DIRECT
+    return PeerPathResult(ip, mode, via, latency_ms)
+
+
+class PeerPathTracker:
+    """피어 경로 확인 및 직접 경로 확립 (경로별 마지막 지연시간 보관)"""
+
+    def __init__(self, ping: Callable[[str], PeerPathResult]):
+        """
+        Args:
+            ping: 피어 IP 로 disco ping 한 번 수행하는 함수
+        """
+        self.ping = ping
+        self.relay_ms: Dict[str, float] = {}
+        self.direct_ms: Dict[str, float] = {}
+
+    def probe(self, ip: str) -> PeerPathResult:
+        """ping 한 번으로 현재 경로 확인 (릴레이/직접 지연시간 함께 보고)"""
+        result = self.ping(ip)
+        if result.latency_ms is not None:
+            if result.mode == RELAY:
+                self.relay_ms[ip] = result.latency_ms
+            elif result.mode == DIRECT:
+                self.direct_ms[ip] = result.latency_ms
+        result.relay_ms = self.relay_ms.get(ip)
+        result.direct_ms = self.direct_ms.get(ip)
+        return result
+
+    def establish(self, ip: str, timeout: float) -> Tuple[Optional[PeerPathResult], WaitResult]:
+        """직접 경로가 생길 때까지 ping 반복 (마감 시각이 지나면 마지막 결과 반환)"""
+        last = []
+
+        def direct() -> Optional[PeerPathResult]:
+            result = self.probe(ip)
+            last.append(result)
+            return result if result.mode == DIRECT else None
+
+        waited = wait_for(direct, timeout, name=f"direct path to {ip}",
+                          initial_interval=0.2, max_interval=1.0)
+        return (last[-1] if last else None), waited
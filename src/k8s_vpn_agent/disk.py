@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 디스크 압박 예측 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- 루트 파일시스템(nodefs)과 CRI-O 이미지 파일시스템(imagefs) 사용량 샘플링 (statvfs)
+- 최근 샘플에 대한 이동 선형 추세 계산
+- kubelet eviction 임계값(evictionHard) 도달 예상 시간 예측
+"""
+
+import json
+import os
+import re
+import time
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+import yaml
+
+from .logger import get_logger
+
+
+KUBELET_CONFIG_PATH = "/var/lib/kubelet/config.yaml"
+
+# kubelet 기본 evictionHard 값
+DEFAULT_EVICTION_HARD = {
+    "nodefs.available": "10%",
+    "imagefs.available": "15%",
+}
+
+_QUANTITY_UNITS = {
+    "": 1,
+    "k": 1000, "M": 1000 ** 2, "G": 1000 ** 3, "T": 1000 ** 4,
+    "Ki": 1024, "Mi": 1024 ** 2, "Gi": 1024 ** 3, "Ti": 1024 ** 4,
+}
+_QUANTITY_RE = re.compile(r"^\s*([0-9.]+)\s*([kMGT]i?)?\s*$")
+
+
+def parse_threshold(value: str, total_bytes: int) -> Optional[int]:
+    """eviction 임계값("10%", "500Mi")을 여유 공간 바이트로 변환"""
+    value = str(value).strip()
+    try:
+        if value.endswith("%"):
+            return int(total_bytes * float(value[:-1]) / 100)
+        match = _QUANTITY_RE.match(value)
+        if match:
+            return int(float(match.group(1)) * _QUANTITY_UNITS[match.group(2) or ""])
+    except ValueError:
+        pass
+    return None
+
+
+def load_eviction_thresholds(kubelet_config: str = KUBELET_CONFIG_PATH,
+                             overrides: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """kubelet 설정의 evictionHard 값 로드 (없으면 kubelet 기본값)
+
+    Args:
+        kubelet_config: kubelet 설정 파일 경로
+        overrides: 설정 파일보다 우선 적용할 값
+
+    Returns:
+        Dict[str, str]: 신호 이름 → 임계값 문자열
+    """
+    thresholds = dict(DEFAULT_EVICTION_HARD)
+    try:
+        with open(kubelet_config, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        for signal, value in (data.get("evictionHard") or {}).items():
+            thresholds[signal] = str(value)
+    except (OSError, yaml.YAMLError):
+        pass
+    for signal, value in (overrides or {}).items():
+        if value:
+            thresholds[signal] = str(value)
+    return thresholds
+
+
+class FilesystemTrend:
+    """단일 파일시스템의 여유 공간 이동 선형 추세"""
+
+    __slots__ = ("samples",)
+
+    def __init__(self, window: int = 20):
+        self.samples: Deque[Tuple[float, int]] = deque(maxlen=window)
+
+    def add(self, timestamp: float, available: int):
+        self.samples.append((timestamp, available))
+
+    def slope(self) -> Optional[float]:
+        """여유 공간 변화율 (bytes/sec, 최소제곱 기울기)"""
+        n = len(self.samples)
+        if n < 3:
+            return None
+        t0 = self.samples[0][0]
+        mean_t = sum(t - t0 for t, _ in self.samples) / n
+        mean_a = sum(a for _, a in self.samples) / n
+        var_t = sum((t - t0 - mean_t) ** 2 for t, _ in self.samples)
+        if var_t <= 0:
+            return None
+        cov = sum((t - t0 - mean_t) * (a - mean_a) for t, a in self.samples)
+        return cov / var_t
+
+    def time_to_threshold(self, threshold_bytes: int, available: Optional[int] = None) -> Optional[float]:
+        """여유 공간이 threshold_bytes 에 도달할 때까지 남은 예상 시간 (초)
+
+        여유 공간이 줄어드는 추세가 아니면 None
+        """
+        slope = self.slope()
+        if slope is None or slope >= 0:
+            return None
+        if available is None:
+            available = self.samples[-1][1]
+        remaining = available - threshold_bytes
+        if remaining <= 0:
+            return 0.0
+        return remaining / -slope
+
+
+class DiskPressureForecaster:
+    """nodefs/imagefs 압박 예측기
+
+    샘플링 비용은 파일시스템당 statvfs 호출 1회이며, 같은 장치를 공유하는
+    경로는 한 번만 샘플링합니다. 추세 샘플은 state_file 에 저장되어 one-shot
+    헬스체크에서도 이전 샘플을 이어서 사용합니다.
+    """
+
+    def __init__(self, filesystems: Dict[str, str], thresholds: Dict[str, str],
+                 window: int = 20, min_interval: float = 300, state_file: Optional[str] = None):
+        """
+        Args:
+            filesystems: 신호 접두어 → 경로 (예: {"nodefs": "/", "imagefs": "/var/lib/containers/storage"})
+            thresholds: eviction 신호 → 임계값 (예: {"nodefs.available": "10%"})
+            window: 추세 계산에 사용할 최근 샘플 수
+            min_interval: 추세 샘플 간 최소 간격 (초)
+            state_file: 추세 샘플 저장 파일 경로
+        """
+        self.filesystems = filesystems
+        self.thresholds = thresholds
+        self.window = window
+        self.min_interval = min_interval
+        self.state_file = Path(state_file) if state_file else None
+        self.trends: Dict[str, FilesystemTrend] = {}
+        self.logger = get_logger()
+        self._load()
+
+    @classmethod
+    def from_config(cls, config: Dict, log_dir: str) -> "DiskPressureForecaster":
+        """monitor 설정 섹션으로부터 생성"""
+        monitor = config.get("monitor", {})
+        thresholds = load_eviction_thresholds(
+            monitor.get("kubelet_config", KUBELET_CONFIG_PATH),
+            overrides={
+                "nodefs.available": monitor.get("eviction_nodefs_available", ""),
+                "imagefs.available": monitor.get("eviction_imagefs_available", ""),
+            },
+        )
+        state_file = monitor.get("disk_state_file", "disk_trend.json")
+        return cls(
+            filesystems={
+                "nodefs": monitor.get("nodefs_path", "/"),
+                "imagefs": monitor.get("imagefs_path", "/var/lib/containers/storage"),
+            },
+            thresholds=thresholds,
+            window=monitor.get("disk_trend_window", 20),
+            min_interval=monitor.get("disk_sample_interval", 300),
+            state_file=os.path.join(log_dir, state_file) if state_file else None,
+        )
+
+    def sample(self, now: Optional[float] = None) -> List[Dict]:
+        """파일시스템 사용량을 샘플링하고 예측 결과 반환
+
+        Returns:
+            List[Dict]: 파일시스템별 사용량/임계값/도달 예상 시간
+        """
+        now = time.time() if now is None else now
+        results = []
+        seen_devices: Dict[int, str] = {}
+
+        for name, path in self.filesystems.items():
+            try:
+                st = os.statvfs(path)
+            except OSError as e:
+                self.logger.debug(f"statvfs 실패: {path} - {e}")
+                continue
+
+            total = st.f_blocks * st.f_frsize
+            available = st.f_bavail * st.f_frsize
+            threshold = parse_threshold(self.thresholds.get(f"{name}.available", "0%"), total) or 0
+
+            # 같은 장치는 추세를 공유
+            shared = seen_devices.get(st.f_fsid) if st.f_fsid else None
+            trend_key = shared or name
+            trend = self.trends.get(trend_key)
+            if trend is None:
+                trend = self.trends[trend_key] = FilesystemTrend(self.window)
+            if not shared:
+                if st.f_fsid:
+                    seen_devices[st.f_fsid] = trend_key
+                if not trend.samples or now - trend.samples[-1][0] >= self.min_interval:
+                    trend.add(now, available)
+
+            slope = trend.slope()
+            eta = trend.time_to_threshold(threshold, available)
+            results.append({
+                "name": name,
+                "path": path,
+                "total_bytes": total,
+                "available_bytes": available,
+                "used_percent": round((1 - available / total) * 100, 2) if total else 0.0,
+                "threshold_bytes": threshold,
+                "threshold": self.thresholds.get(f"{name}.available"),
+                "pressure": available <= threshold,
+                "fill_rate_bytes_per_hour": round(-slope * 3600) if slope is not None else None,
+                "eta_seconds": round(eta) if eta is not None else None,
+                "shared_with": shared,
+            })
+
+        self._save()
+        return results
+
+    def _load(self):
+        if not self.state_file or not self.state_file.exists():
+            return
+        try:
+            with open(self.state_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for name, samples in data.items():
+                trend = self.trends[name] = FilesystemTrend(self.window)
+                for timestamp, available in samples:
+                    trend.add(float(timestamp), int(available))
+        except Exception as e:
+            self.logger.warning(f"디스크 추세 상태 복원 실패: {e}")
+            self.trends = {}
+
+    def _save(self):
+        if not self.state_file:
+            return
+        try:
+            tmp_file = self.state_file.with_name(self.state_file.name + ".tmp")
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({name: list(trend.samples) for name, trend in self.trends.items()}, f)
+            os.replace(tmp_file, self.state_file)
+        except Exception as e:
+            self.logger.warning(f"디스크 추세 상태 저장 실패: {e}")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 제어 평면 엔드포인트 선택 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- master.endpoints 목록의 모든 API 서버를 동시에 프로브 (TCP 연결 + /readyz)
+- 상태와 측정 지연시간으로 순위 결정
+- 조인/모니터링에 사용할 엔드포인트 선택 (재선택 시 히스테리시스로 잦은 전환 방지)
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from .apiserver import get_api_probe
+from .happy_eyeballs import race_connect
+from .logger import get_logger
+from .probes import ProbeEngine
+from .results import EndpointProbeResult, ProbeResult
+
+
+def parse_endpoint(value: str, default_port: int = 6443) -> Tuple[str, int]:
+    """"https://host:port", "host:port", "host", "[v6]:port", "v6" 형식을 (호스트, 포트)로 변환"""
+    if value.count(":") > 1 and "[" not in value and "//" not in value:
+        # 대괄호 없는 IPv6 주소 (포트 없음)
+        return value, default_port
+    parsed = urlparse(value if "//" in value else f"//{value}")
+    return parsed.hostname or value, parsed.port or default_port
+
+
+def master_endpoints(master: Dict, default_port: int = 6443) -> List[str]:
+    """설정의 제어 평면 엔드포인트 목록 (endpoints 가 없으면 api_endpoint 또는 ip)"""
+    endpoints = list(master.get("endpoints") or [])
+    if not endpoints:
+        single = master.get("api_endpoint") or master.get("ip")
+        if single:
+            endpoints = [single]
+    return [f"{host}:{port}" if ":" not in host else f"[{host}]:{port}"
+            for host, port in (parse_endpoint(e, default_port) for e in endpoints)]
+
+
+def probe_endpoint(endpoint: str, timeout: float = 5.0) -> EndpointProbeResult:
+    """단일 엔드포인트 프로브: TCP 연결 지연시간 + /readyz (유지 연결 재사용)"""
+    host, port = parse_endpoint(endpoint)
+    connect = race_connect(host, port, timeout=timeout)
+    if not connect.success:
+        return EndpointProbeResult(False, "✗ {} 연결 실패", endpoint, endpoint=endpoint,
+                                   host=host, port=port)
+    readyz = get_api_probe(host, port).probe("/readyz")
+    if not readyz.success:
+        return EndpointProbeResult(False, "✗ {} {}", endpoint, readyz.message, endpoint=endpoint,
+                                   host=host, port=port, connect_ms=round(connect.latency_ms, 3),
+                                   readyz_ms=readyz.ttfb_ms)
+    return EndpointProbeResult(
+        True, "✓ {} 정상 (연결 {:.1f}ms, readyz {:.1f}ms)", endpoint, connect.latency_ms,
+        readyz.ttfb_ms or 0.0, endpoint=endpoint, host=host, port=port,
+        connect_ms=round(connect.latency_ms, 3), readyz_ms=readyz.ttfb_ms,
+    )
+
+
+class EndpointSelector:
+    """제어 평면 엔드포인트 순위 결정 및 선택"""
+
+    def __init__(self, endpoints: List[str], probe_timeout: float = 5.0,
+                 overall_timeout: float = 10.0, hysteresis: float = 0.2):
+        """
+        Args:
+            endpoints: "host:port" 엔드포인트 목록
+            probe_timeout: 엔드포인트별 타임아웃 (초)
+            overall_timeout: 전체 프로브 타임아웃 (초)
+            hysteresis: 현재 엔드포인트보다 이 비율 이상 빨라야 전환 (0.2 = 20%)
+        """
+        self.endpoints = endpoints
+        self.probe_timeout = probe_timeout
+        self.overall_timeout = overall_timeout
+        self.hysteresis = hysteresis
+        self.current: Optional[EndpointProbeResult] = None
+        self.ranking: List[EndpointProbeResult] = []
+        self.last_ranked: Optional[float] = None
+        self.logger = get_logger()
+
+    def probe_all(self) -> List[EndpointProbeResult]:
+        """모든 엔드포인트를 동시에 프로브하고 순위대로 정렬 (정상 우선, 지연시간 오름차순)"""
+        engine = ProbeEngine(self.probe_timeout, self.overall_timeout)
+        probes = {
+            endpoint: (lambda ep=endpoint: engine.call_result(probe_endpoint, ep, self.probe_timeout))
+            for endpoint in self.endpoints
+        }
+        results = engine.run(probes)
+        ranking = [self._as_endpoint_result(name, result) for name, result in results.items()]
+        ranking.sort(key=lambda r: (not r.success, r.latency_ms if r.latency_ms is not None else float("inf")))
+        self.ranking = ranking
+        self.last_ranked = time.monotonic()
+        return ranking
+
+    @staticmethod
+    def _as_endpoint_result(endpoint: str, result: ProbeResult) -> EndpointProbeResult:
+        if isinstance(result, EndpointProbeResult):
+            return result
+        # 타임아웃 등 엔진이 만든 결과
+        host, port = parse_endpoint(endpoint)
+        return EndpointProbeResult(False, result.message, endpoint=endpoint, host=host, port=port)
+
+    def select(self) -> Optional[EndpointProbeResult]:
+        """순위를 갱신하고 사용할 엔드포인트 선택
+
+        현재 엔드포인트가 정상이면 최선 후보가 hysteresis 비율 이상 빠를 때만 전환합니다.
+        정상 엔드포인트가 없으면 현재 선택을 유지합니다 (처음이면 첫 번째 엔드포인트).
+        """
+        ranking = self.probe_all()
+        best = ranking[0] if ranking and ranking[0].success else None
+        current = next((r for r in ranking if self.current and r.endpoint == self.current.endpoint), None)
+
+        if best is None:
+            self.logger.warning("정상인 제어 평면 엔드포인트가 없습니다")
+            if self.current is None and ranking:
+                self.current = next(r for r in ranking if r.endpoint == self.endpoints[0])
+            elif current is not None:
+                self.current = current
+            return self.current
+
+        if current is not None and current.success and current.endpoint != best.endpoint:
+            if best.latency_ms > current.latency_ms * (1 - self.hysteresis):
+                self.current = current
+                return current
+
+        if self.current is None or self.current.endpoint != best.endpoint:
+            self.logger.info(
+                f"제어 평면 엔드포인트 선택: {best.endpoint} ({best.latency_ms:.1f}ms)"
+                + (f", 이전 {self.current.endpoint}" if self.current else "")
+            )
+        self.current = best
+        return best
+
+    def due(self, interval: float) -> bool:
+        """마지막 순위 갱신 후 interval 초가 지났는지"""
+        return self.last_ranked is None or time.monotonic() - self.last_ranked >= interval
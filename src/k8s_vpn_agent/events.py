@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 헬스 상태 전이 이벤트 스트림 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- 헬스체크 상태 전이(transition) 이벤트 생성
+- 시퀀스 번호 기반 이벤트 링 버퍼 (재접속 시 이어받기 지원)
+- Server-Sent Events(SSE) HTTP 엔드포인트 (TCP 또는 유닉스 소켓)
+
+엔드포인트:
+- GET /events  : SSE 스트림. Last-Event-ID 헤더 또는 ?since=<id> 로 이어받기
+
+이벤트 id 는 "<epoch>-<seq>" 형식입니다. epoch 는 프로세스마다 새로 만들어지므로
+에이전트 재시작 후 이전 id 로 재접속하면 gap 이벤트와 함께 버퍼 전체를 받습니다.
+- GET /latest  : 마지막 헬스 리포트 (JSON)
+"""
+
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import uuid
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .logger import get_logger
+from .results import HealthReport, to_jsonable
+
+
+class Event:
+    """단일 이벤트"""
+
+    __slots__ = ("epoch", "seq", "type", "timestamp", "data")
+
+    def __init__(self, epoch: str, seq: int, type: str, timestamp: str, data: Dict):
+        self.epoch = epoch
+        self.seq = seq
+        self.type = type
+        self.timestamp = timestamp
+        self.data = data
+
+    @property
+    def id(self) -> str:
+        return f"{self.epoch}-{self.seq}"
+
+    def to_dict(self) -> Dict:
+        return {"id": self.id, "seq": self.seq, "type": self.type, "timestamp": self.timestamp, **self.data}
+
+    def encode_sse(self) -> bytes:
+        """SSE 와이어 형식으로 인코딩"""
+        payload = json.dumps(self.to_dict(), ensure_ascii=False, default=to_jsonable)
+        return f"id: {self.id}\nevent: {self.type}\ndata: {payload}\n\n".encode("utf-8")
+
+
+class EventBus:
+    """시퀀스 번호가 부여된 이벤트 링 버퍼
+
+    publish 는 모니터 스레드에서, wait_for 는 스트림 핸들러 스레드에서 호출됩니다.
+    """
+
+    def __init__(self, capacity: int = 1000, epoch: Optional[str] = None):
+        # 프로세스(버스)마다 다른 epoch: 재시작 후 시퀀스 번호가 겹쳐도 구분 가능
+        self.epoch = epoch or uuid.uuid4().hex[:12]
+        self._events: Deque[Event] = deque(maxlen=capacity)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self.latest: Optional[HealthReport] = None
+
+    @property
+    def last_seq(self) -> int:
+        return self._seq
+
+    def publish(self, type: str, data: Dict) -> Event:
+        """이벤트 발행"""
+        with self._cond:
+            self._seq += 1
+            event = Event(self.epoch, self._seq, type, datetime.now().isoformat(), data)
+            self._events.append(event)
+            self._cond.notify_all()
+        return event
+
+    def since(self, seq: int) -> Tuple[List[Event], bool]:
+        """seq 이후의 이벤트 반환
+
+        Returns:
+            Tuple[List[Event], bool]: (이벤트 목록, 버퍼에서 밀려나 누락된 이벤트 존재 여부)
+        """
+        with self._cond:
+            return self._since_locked(seq)
+
+    def _since_locked(self, seq: int) -> Tuple[List[Event], bool]:
+        if not self._events or seq >= self._seq:
+            return [], False
+        oldest = self._events[0].seq
+        missed = seq + 1 < oldest
+        start = max(seq + 1 - oldest, 0)
+        return [self._events[i] for i in range(start, len(self._events))], missed
+
+    def wait_for(self, seq: int, timeout: float,
+                 stop: Optional[threading.Event] = None) -> Tuple[List[Event], bool]:
+        """seq 이후 이벤트가 발행되거나 stop 이 설정될 때까지 최대 timeout 초 대기"""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._seq > seq or (stop is not None and stop.is_set()),
+                timeout=timeout,
+            )
+            return self._since_locked(seq)
+
+    def wake_all(self):
+        """대기 중인 모든 구독자를 깨움 (종료 시 사용)"""
+        with self._cond:
+            self._cond.notify_all()
+
+
+def _check_state(result) -> Tuple[bool, Optional[str]]:
+    return bool(result.get("healthy")), result.get("status")
+
+
+def publish_transitions(bus: EventBus, previous: Optional[HealthReport], current: HealthReport) -> List[Event]:
+    """이전/현재 리포트를 비교하여 상태 전이 이벤트 발행
+
+    첫 리포트(previous 가 None)는 모든 체크의 초기 상태를 transition 으로 발행합니다.
+    """
+    events = []
+    for name, result in current.checks.items():
+        before = previous.checks.get(name) if previous else None
+        state = _check_state(result)
+        if before is not None and _check_state(before) == state:
+            continue
+        events.append(bus.publish("transition", {
+            "check": name,
+            "from": _check_state(before)[1] if before is not None else None,
+            "from_healthy": _check_state(before)[0] if before is not None else None,
+            "to": state[1],
+            "healthy": state[0],
+            "message": result.get("message"),
+        }))
+
+    if previous is None or previous.overall_status != current.overall_status:
+        events.append(bus.publish("overall", {
+            "from": previous.overall_status if previous else None,
+            "to": current.overall_status,
+            "failed_checks": current.failed_checks or [],
+        }))
+
+    bus.latest = current
+    return events
+
+
+class _EventStreamHandler(BaseHTTPRequestHandler):
+    """SSE 요청 핸들러"""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "k8s-vpn-agent"
+
+    def log_message(self, format, *args):
+        get_logger().debug("event stream: " + format % args)
+
+    def address_string(self):
+        # 유닉스 소켓은 client_address 가 빈 문자열
+        return self.client_address[0] if self.client_address else "unix"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/events":
+            self._stream(url)
+        elif url.path == "/latest":
+            self._latest()
+        else:
+            self.send_error(404)
+
+    def _latest(self):
+        latest = self.server.bus.latest
+        if latest is None:
+            self.send_response(204)
+            self.end_headers()
+            return
+        body = json.dumps(latest, ensure_ascii=False, default=to_jsonable).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _resume_point(self, url) -> Tuple[int, bool, Optional[str]]:
+        """이어받을 시퀀스 번호, epoch 불일치 여부, 클라이언트가 보낸 id
+
+        id 가 없으면 현재 시점부터 이어받습니다. 다른 epoch(재시작 전 프로세스)의
+        id 면 0 부터(버퍼 전체) 보내고 불일치로 표시합니다. ?since 에 epoch 없이
+        숫자만 주면 현재 epoch 의 시퀀스 번호로 해석합니다.
+        """
+        bus: EventBus = self.server.bus
+        last_id = self.headers.get("Last-Event-ID")
+        epoch = None
+        if not last_id:
+            last_id = parse_qs(url.query).get("since", [None])[0]
+            epoch = bus.epoch
+        if not last_id:
+            return bus.last_seq, False, None
+        if "-" in last_id:
+            epoch, _, seq = last_id.rpartition("-")
+        else:
+            seq = last_id
+        try:
+            seq = max(int(seq), 0)
+        except ValueError:
+            return 0, True, last_id
+        if epoch != bus.epoch or seq > bus.last_seq:
+            return 0, True, last_id
+        return seq, False, last_id
+
+    def _stream(self, url):
+        bus: EventBus = self.server.bus
+        seq, epoch_changed, last_id = self._resume_point(url)
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream; charset=utf-8")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        try:
+            self.wfile.write(f"retry: {self.server.retry_ms}\n\n".encode("utf-8"))
+            self.wfile.flush()
+            events, missed = bus.since(seq)
+            # 에이전트 재시작으로 epoch 가 바뀌었으면 버퍼 전체를 gap 과 함께 재전송
+            missed = missed or epoch_changed
+            while not self.server.stopping.is_set():
+                if missed:
+                    # 놓친 이벤트가 있음을 알림 (클라이언트는 /latest 로 재동기화)
+                    gap = {"since": last_id, "epoch": bus.epoch}
+                    self.wfile.write(f"event: gap\ndata: {json.dumps(gap)}\n\n".encode("utf-8"))
+                for event in events:
+                    self.wfile.write(event.encode_sse())
+                    seq = event.seq
+                    last_id = event.id
+                if not events and not missed:
+                    # 유휴 연결 유지용 주석 라인
+                    self.wfile.write(b": keepalive\n\n")
+                self.wfile.flush()
+                events, missed = bus.wait_for(seq, self.server.keepalive, self.server.stopping)
+        except (BrokenPipeError, ConnectionResetError, socket.timeout):
+            pass
+
+
+class _TCPEventServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixEventServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+class EventStreamServer:
+    """헬스 전이 이벤트 SSE 서버 (TCP 또는 유닉스 소켓)"""
+
+    def __init__(self, bus: EventBus, host: str = "127.0.0.1", port: int = 0,
+                 unix_socket: Optional[str] = None, keepalive: float = 15.0,
+                 retry_ms: int = 1000):
+        """
+        Args:
+            bus: 이벤트 버스
+            host: TCP 바인드 주소
+            port: TCP 포트 (0 이면 임의 포트)
+            unix_socket: 유닉스 소켓 경로 (지정 시 TCP 대신 사용)
+            keepalive: 유휴 연결 keepalive 주기 (초)
+            retry_ms: 클라이언트 재접속 대기 시간 (SSE retry 필드)
+        """
+        self.bus = bus
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.keepalive = keepalive
+        self.retry_ms = retry_ms
+        self.logger = get_logger()
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+        self._socket_ino: Optional[int] = None
+
+    @property
+    def address(self) -> str:
+        if self.unix_socket:
+            return f"unix:{self.unix_socket}"
+        host, port = self._server.server_address[:2] if self._server else (self.host, self.port)
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        if self.unix_socket:
+            try:
+                mode = os.lstat(self.unix_socket).st_mode
+            except FileNotFoundError:
+                mode = None
+            if mode is not None:
+                if not stat.S_ISSOCK(mode):
+                    raise FileExistsError(f"유닉스 소켓 경로에 소켓이 아닌 파일이 있습니다: {self.unix_socket}")
+                # 이전 실행이 남긴 소켓 파일
+                os.unlink(self.unix_socket)
+            self._server = _UnixEventServer(self.unix_socket, _EventStreamHandler)
+            self._socket_ino = os.lstat(self.unix_socket).st_ino
+        else:
+            self._server = _TCPEventServer((self.host, self.port), _EventStreamHandler)
+
+        self._server.bus = self.bus
+        self._server.keepalive = self.keepalive
+        self._server.retry_ms = self.retry_ms
+        self._server.stopping = threading.Event()
+
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="event-stream", daemon=True
+        )
+        self._thread.start()
+        self.logger.info(f"이벤트 스트림 시작: {self.address}/events")
+
+    def stop(self):
+        """서버 중지"""
+        if not self._server:
+            return
+        self._server.stopping.set()
+        # 대기 중인 스트림 핸들러를 깨워 종료하게 함
+        self.bus.wake_all()
+        self._server.shutdown()
+        self._server.server_close()
+        if self.unix_socket:
+            # 직접 만든 소켓 파일만 삭제 (그 사이 다른 파일로 바뀌었으면 그대로 둠)
+            try:
+                st = os.lstat(self.unix_socket)
+                if stat.S_ISSOCK(st.st_mode) and st.st_ino == self._socket_ino:
+                    os.unlink(self.unix_socket)
+            except FileNotFoundError:
+                pass
+        self._server = None
+        self.logger.info("이벤트 스트림 중지")
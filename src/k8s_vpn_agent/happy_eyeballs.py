@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - Happy Eyeballs 연결 경쟁 모듈 (RFC 8305)
+
+이 모듈은 다음 기능을 제공합니다:
+- A/AAAA 조회 결과를 IPv6 부터 패밀리 교대로 정렬
+- 연결 시도를 250ms 간격으로 시작하고, 실패하면 즉시 다음 주소 시도
+- 가장 먼저 연결된 주소를 승자로 선택하고 나머지 시도는 취소
+- 승리한 패밀리와 패밀리별 연결 지연시간 보고 (complete=True 면 모든 주소를 끝까지 측정)
+
+selectors 기반 논블로킹 connect 로 스레드 없이 동작합니다.
+"""
+
+import errno
+import os
+import selectors
+import socket
+import time
+from typing import Dict, List, Optional
+
+from .resolver import Resolver, get_resolver
+
+
+CONNECTION_ATTEMPT_DELAY = 0.25
+
+_FAMILY_NAMES = {socket.AF_INET: "ipv4", socket.AF_INET6: "ipv6"}
+
+
+class ConnectAttempt:
+    """단일 주소 연결 시도"""
+
+    __slots__ = ("address", "family", "started_ms", "latency_ms", "error")
+
+    def __init__(self, address: str, family: int, started_ms: float):
+        self.address = address
+        self.family = family
+        self.started_ms = started_ms
+        self.latency_ms: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.latency_ms is not None and self.error is None
+
+    def to_dict(self) -> Dict:
+        return {
+            "address": self.address,
+            "family": _FAMILY_NAMES.get(self.family, str(self.family)),
+            "started_ms": round(self.started_ms, 3),
+            "latency_ms": round(self.latency_ms, 3) if self.latency_ms is not None else None,
+            "error": self.error,
+        }
+
+
+class RaceResult:
+    """연결 경쟁 결과"""
+
+    __slots__ = ("host", "port", "attempts", "winner", "error")
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.attempts: List[ConnectAttempt] = []
+        self.winner: Optional[ConnectAttempt] = None
+        self.error: Optional[str] = None
+
+    @property
+    def success(self) -> bool:
+        return self.winner is not None
+
+    @property
+    def family(self) -> Optional[str]:
+        """승리한 주소 패밀리 ("ipv4" / "ipv6")"""
+        return _FAMILY_NAMES.get(self.winner.family) if self.winner else None
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        return self.winner.latency_ms if self.winner else None
+
+    @property
+    def family_latency(self) -> Dict[str, Optional[float]]:
+        """패밀리별 최단 연결 지연시간 (시도했지만 연결되지 않은 패밀리는 None)"""
+        latency: Dict[str, Optional[float]] = {}
+        for attempt in self.attempts:
+            name = _FAMILY_NAMES.get(attempt.family, str(attempt.family))
+            best = latency.get(name)
+            if attempt.success and (best is None or attempt.latency_ms < best):
+                latency[name] = attempt.latency_ms
+            else:
+                latency.setdefault(name, None)
+        return latency
+
+    def to_dict(self) -> Dict:
+        return {
+            "host": self.host,
+            "port": self.port,
+            "success": self.success,
+            "family": self.family,
+            "address": self.winner.address if self.winner else None,
+            "latency_ms": round(self.latency_ms, 3) if self.latency_ms is not None else None,
+            "family_latency": {
+                name: round(value, 3) if value is not None else None
+                for name, value in self.family_latency.items()
+            },
+            "attempts": [attempt.to_dict() for attempt in self.attempts],
+            "error": self.error,
+        }
+
+
+def _family_of(address: str) -> int:
+    return socket.AF_INET6 if ":" in address else socket.AF_INET
+
+
+def interleave(addresses: List[str]) -> List[str]:
+    """IPv6 부터 패밀리를 번갈아 가며 정렬 (RFC 8305 4절)"""
+    v6 = [a for a in addresses if _family_of(a) == socket.AF_INET6]
+    v4 = [a for a in addresses if _family_of(a) == socket.AF_INET]
+    ordered = []
+    for i in range(max(len(v6), len(v4))):
+        ordered.extend(family[i] for family in (v6, v4) if i < len(family))
+    return ordered
+
+
+def race_connect(host: str, port: int, timeout: float = 5.0,
+                 delay: float = CONNECTION_ATTEMPT_DELAY, complete: bool = False,
+                 resolver: Optional[Resolver] = None) -> RaceResult:
+    """Happy Eyeballs 방식으로 TCP 연결 경쟁
+
+    Args:
+        host: 호스트 이름 또는 IP
+        port: 포트
+        timeout: 전체 타임아웃 (초)
+        delay: 다음 연결 시도 시작까지의 간격 (초)
+        complete: True 면 승자가 나와도 모든 주소의 연결을 끝까지 측정
+        resolver: 사용할 리졸버 (기본값: 공유 리졸버)
+
+    Returns:
+        RaceResult: 승자와 시도별 결과 (연결된 소켓은 모두 닫힘)
+    """
+    result = RaceResult(host, port)
+    try:
+        pending = interleave((resolver or get_resolver()).resolve(host))
+    except socket.gaierror:
+        result.error = "호스트를 찾을 수 없습니다"
+        return result
+
+    sel = selectors.DefaultSelector()
+    start = time.monotonic()
+    deadline = start + timeout
+    next_start = start
+
+    try:
+        while True:
+            now = time.monotonic()
+            racing = result.winner is None or complete
+            if pending and racing and now >= next_start:
+                address = pending.pop(0)
+                attempt = ConnectAttempt(address, _family_of(address), (now - start) * 1000)
+                result.attempts.append(attempt)
+                next_start = now + delay
+                try:
+                    sock = socket.socket(attempt.family, socket.SOCK_STREAM)
+                except OSError as e:
+                    attempt.error = str(e)
+                    next_start = now
+                    continue
+                sock.setblocking(False)
+                err = sock.connect_ex((address, port))
+                if err in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                    sel.register(sock, selectors.EVENT_WRITE, (attempt, now))
+                else:
+                    sock.close()
+                    attempt.error = os.strerror(err)
+                    # 실패하면 다음 주소를 바로 시도
+                    next_start = now
+                    continue
+
+            if not racing or now >= deadline:
+                break
+            if not sel.get_map() and not pending:
+                break
+
+            wait = deadline - now
+            if pending:
+                wait = min(wait, next_start - now)
+            for key, _ in sel.select(max(wait, 0)):
+                sock = key.fileobj
+                attempt, sent = key.data
+                finished = time.monotonic()
+                sel.unregister(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                sock.close()
+                if err:
+                    attempt.error = os.strerror(err)
+                    next_start = min(next_start, finished)
+                    continue
+                attempt.latency_ms = (finished - sent) * 1000
+                if result.winner is None:
+                    result.winner = attempt
+    finally:
+        for key in list(sel.get_map().values()):
+            attempt, _ = key.data
+            attempt.error = "취소됨" if result.winner and not complete else "타임아웃"
+            key.fileobj.close()
+        sel.close()
+
+    if result.winner is None and result.error is None:
+        result.error = "연결 실패"
+    return result
@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 네이티브 ICMP 에코 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- 비특권 datagram ICMP 소켓(net.ipv4.ping_group_range)을 이용한 에코 요청
+- datagram 소켓이 허용되지 않으면 raw 소켓으로 대체 (CAP_NET_RAW 필요)
+- 두 소켓 모두 사용할 수 없으면 ping 명령으로 대체
+- 여러 호스트 동시 핑 및 패킷별 RTT 수집 (1초 미만 전송 간격 지원)
+- DF 비트를 설정한 지정 크기 에코 요청 (경로 MTU 탐색용)
+"""
+
+import os
+import random
+import re
+import selectors
+import socket
+import struct
+import subprocess
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .logger import get_logger
+from .resolver import get_resolver
+from .results import LinkStats
+
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+_PAYLOAD = b"k8s-vpn-agent-ping".ljust(32, b".")
+_RTT_RE = re.compile(r"icmp_seq=(\d+).*?time=([0-9.]+)")
+
+# IP 헤더 + ICMP 헤더 크기 (패킷 크기 → 페이로드 크기 변환)
+_HEADER_SIZE = {socket.AF_INET: 20 + 8, socket.AF_INET6: 40 + 8}
+
+# linux/in.h, linux/in6.h: DF 를 설정하고 캐시된 경로 MTU 는 무시 (로컬 단편화 없음)
+IP_MTU_DISCOVER = 10
+IPV6_MTU_DISCOVER = 23
+IP_PMTUDISC_PROBE = 3
+
+# 주소 패밀리별로 사용 가능한 소켓 종류 캐시 ("dgram", "raw", None)
+_socket_kind: Dict[int, Optional[str]] = {}
+
+
+class PingResult:
+    """단일 호스트 핑 결과"""
+
+    __slots__ = ("host", "address", "rtts", "method", "error")
+
+    def __init__(self, host: str, address: Optional[str] = None, count: int = 0,
+                 method: Optional[str] = None, error: Optional[str] = None):
+        self.host = host
+        self.address = address
+        self.rtts: List[Optional[float]] = [None] * count
+        self.method = method
+        self.error = error
+
+    @property
+    def sent(self) -> int:
+        return len(self.rtts)
+
+    @property
+    def received(self) -> int:
+        return sum(1 for rtt in self.rtts if rtt is not None)
+
+    @property
+    def success(self) -> bool:
+        return self.received > 0
+
+    @property
+    def loss(self) -> float:
+        """패킷 손실률 (0.0 ~ 1.0)"""
+        return 1.0 - self.received / self.sent if self.sent else 1.0
+
+    def _replied(self) -> List[float]:
+        return [rtt for rtt in self.rtts if rtt is not None]
+
+    @property
+    def min_ms(self) -> Optional[float]:
+        replied = self._replied()
+        return min(replied) if replied else None
+
+    @property
+    def avg_ms(self) -> Optional[float]:
+        replied = self._replied()
+        return sum(replied) / len(replied) if replied else None
+
+    @property
+    def max_ms(self) -> Optional[float]:
+        replied = self._replied()
+        return max(replied) if replied else None
+
+    @property
+    def mdev_ms(self) -> Optional[float]:
+        """RTT 표준편차 (ping 의 mdev)"""
+        replied = self._replied()
+        if not replied:
+            return None
+        avg = sum(replied) / len(replied)
+        return (sum((rtt - avg) ** 2 for rtt in replied) / len(replied)) ** 0.5
+
+    @property
+    def jitter_ms(self) -> Optional[float]:
+        """연속 응답 간 RTT 변화량의 평균"""
+        replied = self._replied()
+        if len(replied) < 2:
+            return 0.0 if replied else None
+        return sum(abs(b - a) for a, b in zip(replied, replied[1:])) / (len(replied) - 1)
+
+    def stats(self) -> LinkStats:
+        """링크 통계와 품질 점수"""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value, 3) if value is not None else None
+
+        return LinkStats(
+            self.host, self.sent, self.received, round(self.loss * 100, 1),
+            min_ms=ms(self.min_ms), avg_ms=ms(self.avg_ms), max_ms=ms(self.max_ms),
+            mdev_ms=ms(self.mdev_ms), jitter_ms=ms(self.jitter_ms),
+            score=link_quality_score(self.loss, self.avg_ms, self.jitter_ms),
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "host": self.host,
+            "address": self.address,
+            "method": self.method,
+            "sent": self.sent,
+            "received": self.received,
+            "loss": round(self.loss, 3),
+            "rtts": [round(rtt, 3) if rtt is not None else None for rtt in self.rtts],
+            "error": self.error,
+        }
+
+
+def link_quality_score(loss: float, avg_ms: Optional[float], jitter_ms: Optional[float]) -> float:
+    """손실률/지연/지터로 링크 품질 점수 계산 (0~100)
+
+    ITU-T G.107 E-model 을 단순화한 R 값(최대 93.2)을 100 점 만점으로 환산합니다.
+    지터는 지연의 2배로 가중하고, 손실 1% 당 2.5 점을 감점하므로 40% 손실이면 0 점입니다.
+    """
+    if avg_ms is None or loss >= 1.0:
+        return 0.0
+    effective = avg_ms + 2 * (jitter_ms or 0.0) + 10
+    r_value = 93.2 - (effective / 40 if effective < 160 else (effective - 120) / 10)
+    r_value -= 2.5 * loss * 100
+    return round(max(0.0, min(100.0, r_value / 93.2 * 100)), 1)
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _build_echo(family: int, ident: int, seq: int, payload: bytes = _PAYLOAD) -> bytes:
+    icmp_type = ICMP_ECHO_REQUEST if family == socket.AF_INET else ICMPV6_ECHO_REQUEST
+    header = struct.pack("!BBHHH", icmp_type, 0, 0, ident, seq)
+    if family == socket.AF_INET:
+        # ICMPv6 체크섬은 커널이 계산
+        header = struct.pack("!BBHHH", icmp_type, 0, _checksum(header + payload), ident, seq)
+    return header + payload
+
+
+def _parse_reply(family: int, kind: str, data: bytes) -> Optional[Tuple[int, int]]:
+    """에코 응답이면 (identifier, sequence) 반환"""
+    if family == socket.AF_INET and kind == "raw":
+        # IPv4 raw 소켓은 IP 헤더를 포함
+        data = data[(data[0] & 0x0F) * 4:]
+    if len(data) < 8:
+        return None
+    icmp_type, _, _, ident, seq = struct.unpack("!BBHHH", data[:8])
+    reply_type = ICMP_ECHO_REPLY if family == socket.AF_INET else ICMPV6_ECHO_REPLY
+    if icmp_type != reply_type:
+        return None
+    return ident, seq
+
+
+def _open_socket(family: int) -> Tuple[Optional[socket.socket], Optional[str]]:
+    """datagram → raw 순서로 ICMP 소켓 생성"""
+    proto = socket.IPPROTO_ICMP if family == socket.AF_INET else socket.IPPROTO_ICMPV6
+    kinds = [_socket_kind[family]] if family in _socket_kind else ["dgram", "raw"]
+    for kind in kinds:
+        if kind is None:
+            break
+        sock_type = socket.SOCK_DGRAM if kind == "dgram" else socket.SOCK_RAW
+        try:
+            sock = socket.socket(family, sock_type, proto)
+        except OSError:
+            continue
+        sock.setblocking(False)
+        _socket_kind[family] = kind
+        return sock, kind
+    _socket_kind[family] = None
+    return None, None
+
+
+def _resolve(host: str) -> Tuple[Optional[int], Optional[str]]:
+    try:
+        address = get_resolver().resolve(host)[0]
+    except socket.gaierror:
+        return None, None
+    return (socket.AF_INET6 if ":" in address else socket.AF_INET), address
+
+
+def _ping_subprocess(fallback: List[PingResult], count: int, interval: float, timeout: float):
+    """ping 명령으로 대체 실행 (호스트별 프로세스를 동시에 실행)"""
+    interval = max(interval, 0.2)
+    procs = []
+    for result in fallback:
+        result.method = "subprocess"
+        cmd = ["ping", "-n", "-c", str(count), "-i", f"{interval:.3f}",
+               "-W", str(max(1, int(round(timeout)))), result.address or result.host]
+        try:
+            procs.append((result, subprocess.Popen(
+                cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )))
+        except FileNotFoundError:
+            result.error = "ping 명령을 찾을 수 없습니다"
+
+    # 소켓 경로와 같은 시간 예산: 마지막 패킷 전송 후 timeout 까지만 대기
+    deadline = time.monotonic() + (count - 1) * interval + timeout
+    for result, proc in procs:
+        try:
+            stdout, _ = proc.communicate(timeout=max(deadline - time.monotonic(), 0))
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            # 종료 전까지 받은 응답은 그대로 사용
+            stdout, _ = proc.communicate()
+        for match in _RTT_RE.finditer(stdout):
+            index = int(match.group(1)) - 1
+            if 0 <= index < count:
+                result.rtts[index] = float(match.group(2))
+
+
+def ping_hosts(hosts: Sequence[str], count: int = 3, interval: float = 0.2,
+               timeout: float = 1.0) -> Dict[str, PingResult]:
+    """여러 호스트에 동시에 ICMP 에코 요청
+
+    Args:
+        hosts: 대상 호스트 목록
+        count: 호스트당 전송 패킷 수
+        interval: 패킷 전송 간격 (초, 1초 미만 가능)
+        timeout: 마지막 패킷 전송 후 응답 대기 시간 (초)
+
+    Returns:
+        Dict[str, PingResult]: 호스트별 결과 (rtts 는 패킷 순서대로 ms, 무응답은 None)
+    """
+    logger = get_logger()
+    results: Dict[str, PingResult] = {}
+    targets: Dict[int, List[PingResult]] = {}
+
+    for host in dict.fromkeys(hosts):
+        family, address = _resolve(host)
+        if family is None:
+            results[host] = PingResult(host, count=count, error="호스트를 찾을 수 없습니다")
+            continue
+        results[host] = PingResult(host, address, count)
+        targets.setdefault(family, []).append(results[host])
+
+    sockets: Dict[int, Tuple[socket.socket, str]] = {}
+    fallback: List[PingResult] = []
+    for family, family_targets in targets.items():
+        sock, kind = _open_socket(family)
+        if sock is None:
+            fallback.extend(family_targets)
+            continue
+        sockets[family] = (sock, kind)
+        for result in family_targets:
+            result.method = kind
+
+    if sockets:
+        try:
+            _ping_sockets(sockets, targets, count, interval, timeout)
+        finally:
+            for sock, _ in sockets.values():
+                sock.close()
+
+    if fallback:
+        logger.debug(f"ICMP 소켓 사용 불가, ping 명령으로 대체: {[r.host for r in fallback]}")
+        _ping_subprocess(fallback, count, interval, timeout)
+
+    return results
+
+
+def _ping_sockets(sockets: Dict[int, Tuple[socket.socket, str]],
+                  targets: Dict[int, List[PingResult]],
+                  count: int, interval: float, timeout: float):
+    """ICMP 소켓으로 전송/수신 (selectors 기반 단일 스레드 이벤트 루프)"""
+    ident = (os.getpid() ^ random.getrandbits(16)) & 0xFFFF
+    base_seq = random.getrandbits(16)
+    # (family, seq) → (결과, 패킷 번호, 전송 시각)
+    inflight: Dict[Tuple[int, int], Tuple[PingResult, int, float]] = {}
+
+    sel = selectors.DefaultSelector()
+    for family, (sock, kind) in sockets.items():
+        sel.register(sock, selectors.EVENT_READ, (family, kind))
+        if kind == "dgram":
+            # datagram 소켓은 커널이 identifier 를 소켓 포트 번호로 바꿔서 전송
+            sock.bind(("0.0.0.0", 0) if family == socket.AF_INET else ("::", 0))
+
+    start = time.monotonic()
+    deadline = start + (count - 1) * interval + timeout
+    seq_offset = 0
+    sent_rounds = 0
+
+    try:
+        while True:
+            now = time.monotonic()
+            if sent_rounds < count and now >= start + sent_rounds * interval:
+                for family, family_targets in targets.items():
+                    if family not in sockets:
+                        continue
+                    sock, _ = sockets[family]
+                    for result in family_targets:
+                        seq = (base_seq + seq_offset) & 0xFFFF
+                        seq_offset += 1
+                        try:
+                            sock.sendto(_build_echo(family, ident, seq), (result.address, 0))
+                        except OSError as e:
+                            result.error = str(e)
+                            continue
+                        inflight[(family, seq)] = (result, sent_rounds, time.monotonic())
+                sent_rounds += 1
+
+            if sent_rounds >= count and not inflight:
+                break
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            wait = deadline - now
+            if sent_rounds < count:
+                wait = min(wait, start + sent_rounds * interval - now)
+            for key, _ in sel.select(max(wait, 0)):
+                family, kind = key.data
+                _drain(key.fileobj, family, kind, ident, inflight)
+    finally:
+        sel.close()
+
+
+def _drain(sock: socket.socket, family: int, kind: str, ident: int,
+           inflight: Dict[Tuple[int, int], Tuple[PingResult, int, float]]):
+    """소켓에 도착한 응답을 모두 읽어 RTT 기록"""
+    local_ident = sock.getsockname()[1] if kind == "dgram" else ident
+    while True:
+        try:
+            data, addr = sock.recvfrom(2048)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            return
+        received = time.monotonic()
+        parsed = _parse_reply(family, kind, data)
+        if parsed is None or parsed[0] != local_ident:
+            continue
+        entry = inflight.get((family, parsed[1]))
+        if entry is None:
+            continue
+        result, index, sent = entry
+        # raw 소켓은 다른 프로세스의 응답도 수신하므로 발신 주소까지 확인
+        if addr[0].split("%")[0] != result.address.split("%")[0]:
+            continue
+        del inflight[(family, parsed[1])]
+        result.rtts[index] = (received - sent) * 1000
+
+
+def probe_packet_size(address: str, size: int, timeout: float = 1.0,
+                      attempts: int = 2) -> Optional[bool]:
+    """DF 비트를 설정한 size 바이트(IP 헤더 포함) 에코 요청이 응답을 받는지 확인
+
+    Args:
+        address: 대상 IP 주소
+        size: IP 패킷 전체 크기 (바이트)
+        timeout: 시도별 응답 대기 시간 (초)
+        attempts: 시도 횟수 (손실과 크기 초과를 구분하기 위해 재시도)
+
+    Returns:
+        Optional[bool]: 응답 수신 시 True, 크기 초과(EMSGSIZE) 또는 무응답이면 False,
+        ICMP 소켓을 사용할 수 없으면 None
+    """
+    family = socket.AF_INET6 if ":" in address else socket.AF_INET
+    sock, kind = _open_socket(family)
+    if sock is None:
+        return None
+
+    with sock:
+        if family == socket.AF_INET:
+            sock.setsockopt(socket.IPPROTO_IP, IP_MTU_DISCOVER, IP_PMTUDISC_PROBE)
+        else:
+            sock.setsockopt(socket.IPPROTO_IPV6, IPV6_MTU_DISCOVER, IP_PMTUDISC_PROBE)
+        if kind == "dgram":
+            sock.bind(("0.0.0.0", 0) if family == socket.AF_INET else ("::", 0))
+            ident = sock.getsockname()[1]
+        else:
+            ident = (os.getpid() ^ random.getrandbits(16)) & 0xFFFF
+        payload = _PAYLOAD.ljust(max(size - _HEADER_SIZE[family], 0), b".")
+
+        sel = selectors.DefaultSelector()
+        sel.register(sock, selectors.EVENT_READ)
+        try:
+            for _ in range(attempts):
+                seq = random.getrandbits(16)
+                try:
+                    sock.sendto(_build_echo(family, ident, seq, payload), (address, 0))
+                except OSError:
+                    # EMSGSIZE: 출구 인터페이스 MTU 초과
+                    return False
+                deadline = time.monotonic() + timeout
+                while True:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not sel.select(remaining):
+                        break
+                    if _received_echo(sock, family, kind, ident, seq, address):
+                        return True
+        finally:
+            sel.close()
+    return False
+
+
+def _received_echo(sock: socket.socket, family: int, kind: str, ident: int, seq: int,
+                   address: str) -> bool:
+    """소켓에 도착한 패킷 중 (ident, seq) 에코 응답이 있는지"""
+    while True:
+        try:
+            data, addr = sock.recvfrom(65535)
+        except OSError:
+            return False
+        if addr[0].split("%")[0] != address.split("%")[0]:
+            continue
+        if _parse_reply(family, kind, data) == (ident, seq):
+            return True
+
+
+def ping(host: str, count: int = 3, interval: float = 0.2, timeout: float = 1.0) -> PingResult:
+    """단일 호스트 ICMP 에코 요청"""
+    return ping_hosts([host], count, interval, timeout)[host]
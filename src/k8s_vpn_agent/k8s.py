@@ -4,15 +4,19 @@ idempotent 및 롤백 지원
 """
 
 import subprocess
-import time
 import os
 import socket
 from typing import Tuple, Optional, Dict
 from rich.console import Console
 from .logger import get_logger
+from .waiters import describe, node_ready, unit_active, wait_for
 
 console = Console()
 
+# 준비 상태 대기 시간 (초)
+KUBELET_START_TIMEOUT = 60
+NODE_READY_TIMEOUT = 60
+
 
 class K8sManager:
     """Kubernetes 클러스터 관리 클래스"""
@@ -292,20 +296,13 @@ class K8sManager:
                 
                 # Kubelet 시작 대기
                 console.print("\n[cyan]Kubelet 시작 대기 중...[/cyan]")
-                time.sleep(5)
-                
-                # Kubelet 상태 확인
-                kubelet_status = subprocess.run(
-                    ["systemctl", "is-active", "kubelet"],
-                    capture_output=True,
-                    text=True
-                )
+                waited = wait_for(unit_active("kubelet"), KUBELET_START_TIMEOUT, name="kubelet")
                 
-                if kubelet_status.stdout.strip() == "active":
-                    console.print("[green]✓ Kubelet 정상 실행 중[/green]")
+                if waited:
+                    console.print(f"[green]✓ Kubelet 정상 실행 중 ({describe(waited)})[/green]")
                     self.logger.info("Kubelet is active")
                 else:
-                    console.print("[yellow]⚠ Kubelet 상태 확인 필요[/yellow]")
+                    console.print(f"[yellow]⚠ Kubelet 상태 확인 필요 ({describe(waited)})[/yellow]")
                     self.logger.warning("Kubelet status check needed")
                 
                 # 노드 레이블 추가 (조인 후)
@@ -365,16 +362,10 @@ class K8sManager:
         
         try:
             # 노드가 Ready 될 때까지 대기 (최대 60초)
-            for i in range(12):
-                check_result = subprocess.run(
-                    ["kubectl", "get", "node", hostname, "-o", "jsonpath={.status.conditions[?(@.type=='Ready')].status}"],
-                    capture_output=True,
-                    text=True
-                )
-                if check_result.stdout.strip() == "True":
-                    break
-                console.print(f"  노드 Ready 대기 중... ({(i+1)*5}초)")
-                time.sleep(5)
+            console.print("  노드 Ready 대기 중...")
+            waited = wait_for(node_ready(hostname), NODE_READY_TIMEOUT, name=f"node {hostname} Ready",
+                              max_interval=5.0)
+            console.print(f"  노드 Ready {'확인' if waited else '미확인'} ({describe(waited)})")
             
             # 레이블 추가
             for label in self.node_labels:
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - Tailscale LocalAPI 클라이언트
+
+이 모듈은 다음 기능을 제공합니다:
+- tailscaled 유닉스 소켓(/var/run/tailscale/tailscaled.sock)으로 LocalAPI 직접 호출
+- keep-alive 연결 유지 및 재사용 (끊긴 유휴 연결은 새 연결로 한 번 재시도)
+- 상태 응답을 TailscaleStatus 로 변환 (BackendState, 자기 VPN IP, 피어)
+- 설정(prefs) 변경으로 VPN 연결/해제 (WantRunning)
+- 피어 disco ping (직접 경로 탐색 유도, 경로/지연시간 확인)
+
+tailscale CLI 도 같은 소켓으로 LocalAPI 를 호출하므로, CLI 프로세스를 띄우지 않고
+직접 요청해 호출마다 Go 바이너리를 실행하는 비용을 없앱니다.
+"""
+
+import http.client
+import json
+import os
+import socket
+import stat
+import threading
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from .logger import get_logger
+
+
+DEFAULT_SOCKET = "/var/run/tailscale/tailscaled.sock"
+# tailscale 클라이언트가 사용하는 Host 헤더 (tailscaled 는 이 값만 허용)
+LOCALAPI_HOST = "local-tailscaled.sock"
+
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError)
+
+
+class LocalAPIError(Exception):
+    """LocalAPI 요청 실패 (status 는 HTTP 상태 코드, 연결 실패면 None)"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """유닉스 소켓으로 연결하는 HTTP 연결"""
+
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__(LOCALAPI_HOST, timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+class TailscaleStatus:
+    """LocalAPI /status 응답"""
+
+    __slots__ = ("backend_state", "self_ips", "peers", "raw")
+
+    def __init__(self, raw: Dict):
+        self.raw = raw
+        self.backend_state = raw.get("BackendState", "")
+        self.self_ips: List[str] = list(raw.get("TailscaleIPs")
+                                        or (raw.get("Self") or {}).get("TailscaleIPs") or [])
+        self.peers: Dict[str, Dict] = raw.get("Peer") or {}
+
+    @property
+    def running(self) -> bool:
+        return self.backend_state == "Running"
+
+    @property
+    def ipv4(self) -> Optional[str]:
+        return next((ip for ip in self.self_ips if ":" not in ip), None)
+
+
+class LocalAPIClient:
+    """tailscaled LocalAPI 클라이언트 (연결 하나를 유지하며 재사용)"""
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET, timeout: float = 10.0):
+        """
+        Args:
+            socket_path: tailscaled 유닉스 소켓 경로
+            timeout: 요청 타임아웃 (초)
+        """
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.logger = get_logger()
+        self._conn: Optional[_UnixHTTPConnection] = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """tailscaled 소켓이 있는지"""
+        try:
+            return stat.S_ISSOCK(os.stat(self.socket_path).st_mode)
+        except OSError:
+            return False
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _send(self, method: str, path: str, body: Optional[bytes]) -> http.client.HTTPResponse:
+        if self._conn is None:
+            self._conn = _UnixHTTPConnection(self.socket_path, self.timeout)
+        headers = {"Accept": "application/json"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        self._conn.request(method, path, body=body, headers=headers)
+        return self._conn.getresponse()
+
+    def request(self, method: str, path: str, payload: Optional[Dict] = None):
+        """LocalAPI 요청 후 JSON 응답 반환 (본문이 없으면 None)
+
+        Raises:
+            LocalAPIError: 연결 실패 또는 2xx 가 아닌 응답
+        """
+        path = f"/localapi/v0/{path.lstrip('/')}"
+        body = json.dumps(payload).encode() if payload is not None else None
+        with self._lock:
+            try:
+                reused = self._conn is not None
+                try:
+                    response = self._send(method, path, body)
+                except _STALE_ERRORS:
+                    if not reused:
+                        raise
+                    # 유휴 연결이 끊겼으면 새 연결로 재시도
+                    self.close()
+                    response = self._send(method, path, body)
+                data = response.read()
+                if response.will_close:
+                    self.close()
+            except (OSError, http.client.HTTPException) as e:
+                self.close()
+                raise LocalAPIError(f"LocalAPI {method} {path} 실패: {e}") from e
+
+        if not 200 <= response.status < 300:
+            detail = data.decode("utf-8", "replace").strip()
+            raise LocalAPIError(f"LocalAPI {method} {path}: HTTP {response.status} {detail}",
+                                response.status)
+        if not data.strip():
+            return None
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise LocalAPIError(f"LocalAPI {method} {path}: 잘못된 JSON 응답", response.status) from e
+
+    def status(self, peers: bool = True) -> TailscaleStatus:
+        """VPN 상태 (peers=False 면 자기 노드 정보만)"""
+        return TailscaleStatus(self.request("GET", "status" if peers else "status?peers=false") or {})
+
+    def ips(self) -> List[str]:
+        """자기 노드의 VPN IP 목록 (tailscale ip)"""
+        return self.status(peers=False).self_ips
+
+    def prefs(self) -> Dict:
+        return self.request("GET", "prefs") or {}
+
+    def set_running(self, running: bool) -> Dict:
+        """WantRunning 설정 변경 (tailscale up/down 과 같은 효과, 로그인된 노드만)"""
+        return self.request("PATCH", "prefs", {"WantRunning": running, "WantRunningSet": True}) or {}
+
+    def ping(self, ip: str, ping_type: str = "disco") -> Dict:
+        """피어 ping (tailscale ping): Endpoint(직접) 또는 DERPRegionCode(릴레이), LatencySeconds"""
+        query = urlencode({"ip": ip, "type": ping_type})
+        return self.request("POST", f"ping?{query}") or {}
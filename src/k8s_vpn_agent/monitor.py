@@ -14,76 +14,160 @@ K8s VPN Agent - 헬스체크 및 모니터링 모듈
 
 import time
 import json
+import socket
 import subprocess
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Optional
 from pathlib import Path
 
 from .logger import get_logger
 from .network import NetworkChecker
+from .anomaly import AnomalyDetector
+from .disk import DiskPressureForecaster
+from .endpoints import EndpointSelector, master_endpoints
+from .paths import PathManager
+from .derp import RELAY
+from .localapi import LocalAPIError
+from .vpn import VPNManager
+from .topology import TopologyReporter
+from .events import EventBus, EventStreamServer, publish_transitions
+from .results import (
+    CheckStatus,
+    VPNCheckResult,
+    PeerPathResult,
+    NetworkCheckResult,
+    ServiceCheckResult,
+    NodeCheckResult,
+    DiskCheckResult,
+    HealthReport,
+    to_jsonable,
+)
+
+
+# analytics 모듈이 읽는 압축 히스토리 파일
+HISTORY_FILE_NAME = "health_history.jsonl"
+
+# 헬스체크 메시지 템플릿 (결과에는 템플릿과 인자만 보관하고 조회 시점에 포맷팅)
+MSG_VPN_NOT_CONFIGURED = "VPN이 설정되지 않음"
+MSG_VPN_OK = "VPN 연결 정상"
+MSG_VPN_RELAYED = "VPN 연결 정상 (마스터까지 {} 릴레이 경유, {}ms)"
+MSG_VPN_STATE = "VPN 상태: {}"
+MSG_VPN_STATUS_FAILED = "VPN 상태 확인 실패: {}"
+MSG_VPN_NOT_INSTALLED = "Tailscale이 설치되지 않음"
+MSG_VPN_TIMEOUT = "VPN 상태 확인 시간 초과"
+MSG_NO_MASTER_IP = "마스터 IP가 설정되지 않음"
+MSG_NETWORK_OK = "네트워크 연결 정상"
+MSG_NETWORK_FAILED = "마스터 노드와 통신 불가"
+MSG_NETWORK_DEGRADED = "마스터 노드 지연시간 증가: {:.1f}ms (기준선 {:.1f}ms)"
+MSG_NETWORK_POOR_LINK = "마스터 링크 품질 낮음: {:.0f}점 (손실 {:.0f}%, 지터 {:.1f}ms)"
+MSG_API_NOT_READY = "API 서버 준비 안 됨: {}"
+MSG_KUBELET_OK = "Kubelet 정상 작동"
+MSG_KUBELET_DOWN = "Kubelet이 실행되지 않음"
+MSG_CRIO_OK = "CRI-O 정상 작동"
+MSG_CRIO_DOWN = "CRI-O가 실행되지 않음"
+MSG_KUBECTL_FAILED = "kubectl 실행 실패: {}"
+MSG_NODE_NOT_FOUND = "노드를 찾을 수 없음: {}"
+MSG_NODE_READY = "노드가 Ready 상태"
+MSG_NODE_NOT_READY = "노드가 Ready 상태가 아님"
+MSG_KUBECTL_NOT_INSTALLED = "kubectl이 설치되지 않음"
+MSG_JSON_ERROR = "JSON 파싱 오류: {}"
+MSG_DISK_OK = "디스크 여유 공간 정상"
+MSG_DISK_PRESSURE = "eviction 임계값 도달: {}"
+MSG_DISK_FORECAST = "eviction 임계값 도달 예상: {} (약 {:.1f}시간 후)"
+MSG_DISK_UNAVAILABLE = "파일시스템 정보를 읽을 수 없음"
 
 
 class HealthChecker:
     """시스템 헬스체크를 수행하는 클래스"""
     
-    def __init__(self, config: Dict, log_dir: str = "/var/log/k8s-vpn-agent"):
+    def __init__(self, config: Dict, log_dir: Optional[str] = None):
         """
         Args:
             config: 설정 딕셔너리
-            log_dir: 로그 디렉토리 경로
+            log_dir: 로그 디렉토리 경로 (None 이면 agent.log_dir 설정값)
         """
         self.config = config
-        self.log_dir = Path(log_dir)
+        self.log_dir = Path(log_dir or config.get("agent", {}).get("log_dir", "/var/log/k8s-vpn-agent"))
         self.log_dir.mkdir(parents=True, exist_ok=True)
-        self.logger = get_logger(__name__)
+        self.logger = get_logger()
         self.network_mgr = NetworkChecker()
+        self.history_file = self.log_dir / HISTORY_FILE_NAME
+        self.node_name = socket.gethostname()
+        self.anomaly_detector = AnomalyDetector.from_config(config, str(self.log_dir))
+        self.disk_forecaster = DiskPressureForecaster.from_config(config, str(self.log_dir))
+        endpoints = master_endpoints(
+            {"endpoints": config.get("master", {}).get("endpoints")},
+            config.get("firewall", {}).get("k8s_api_port", 6443),
+        )
+        self.endpoint_selector = EndpointSelector(endpoints) if len(endpoints) > 1 else None
+        # 단일 마스터의 직접/VPN 경로 (HA 엔드포인트 선택을 쓰면 사용하지 않음)
+        self.path_manager = (None if self.endpoint_selector is not None
+                             else PathManager.from_config(config, str(self.log_dir)))
+        # 피어 수는 색인된 피어 테이블로 집계 (전체 피어 조회는 주기적으로만)
+        self.vpn_manager = VPNManager(config.get("vpn", {}))
+        self._peers_refreshed: Optional[float] = None
         
-    def check_all(self) -> Dict:
+    def check_all(self) -> HealthReport:
         """모든 헬스체크 수행
         
         Returns:
-            Dict: 헬스체크 결과
+            HealthReport: 헬스체크 결과 (기존 딕셔너리 방식 접근 지원)
         """
         self.logger.info("전체 헬스체크 시작")
         
-        results = {
-            "timestamp": datetime.now().isoformat(),
-            "checks": {
-                "vpn": self.check_vpn_connection(),
-                "network": self.check_network_connectivity(),
-                "kubelet": self.check_kubelet_status(),
-                "containerd": self.check_containerd_status(),
-                "node_ready": self.check_node_ready_status(),
-            },
-            "overall_status": "healthy"
+        checks = {
+            "vpn": self.check_vpn_connection(),
+            "network": self.check_network_connectivity(),
+            "kubelet": self.check_kubelet_status(),
+            "containerd": self.check_containerd_status(),
+            "node_ready": self.check_node_ready_status(),
+            "disk": self.check_disk_pressure(),
         }
         
+        # 이상 감지 상태 저장 (재시작 후에도 기준선 유지)
+        self.anomaly_detector.save()
+        
         # 전체 상태 판단
-        failed_checks = [k for k, v in results["checks"].items() if not v.get("healthy", False)]
+        failed_checks = [k for k, v in checks.items() if not v.healthy]
         if failed_checks:
-            results["overall_status"] = "unhealthy"
-            results["failed_checks"] = failed_checks
+            overall_status = CheckStatus.UNHEALTHY
+        elif any(v.status == CheckStatus.DEGRADED for v in checks.values()):
+            overall_status = CheckStatus.DEGRADED
+        else:
+            overall_status = CheckStatus.HEALTHY
+        
+        results = HealthReport(
+            timestamp=datetime.now().isoformat(),
+            checks=checks,
+            overall_status=overall_status,
+            failed_checks=failed_checks,
+        )
             
-        self.logger.info(f"헬스체크 완료: {results['overall_status']}")
+        self.logger.info(f"헬스체크 완료: {results.overall_status}")
         return results
     
-    def check_vpn_connection(self) -> Dict:
+    def check_vpn_connection(self) -> VPNCheckResult:
         """VPN 연결 상태 확인
         
         Returns:
-            Dict: VPN 상태 정보
+            VPNCheckResult: VPN 상태 정보
         """
         if not self.config.get("vpn", {}).get("enabled", False):
-            return {
-                "healthy": True,
-                "status": "not_configured",
-                "message": "VPN이 설정되지 않음"
-            }
+            return VPNCheckResult(True, CheckStatus.NOT_CONFIGURED, MSG_VPN_NOT_CONFIGURED)
+        
+        # tailscaled LocalAPI 로 직접 조회 (실패하면 tailscale CLI 사용)
+        client = self.vpn_manager.localapi
+        if client.available():
+            try:
+                return self._vpn_result(client.status(peers=False).backend_state)
+            except LocalAPIError as e:
+                self.logger.debug(f"LocalAPI 상태 조회 실패, CLI 사용: {e}")
         
         try:
-            # Tailscale 상태 확인
+            # Tailscale 상태 확인 (자기 노드만: 응답 크기가 tailnet 크기와 무관)
             result = subprocess.run(
-                ["tailscale", "status", "--json"],
+                ["tailscale", "status", "--json", "--peers=false"],
                 capture_output=True,
                 text=True,
                 timeout=10
@@ -91,79 +175,132 @@ class HealthChecker:
             
             if result.returncode == 0:
                 status_data = json.loads(result.stdout)
-                backend_state = status_data.get("BackendState", "")
-                
-                is_healthy = backend_state == "Running"
-                
-                return {
-                    "healthy": is_healthy,
-                    "status": backend_state,
-                    "peers": len(status_data.get("Peer", {})),
-                    "message": "VPN 연결 정상" if is_healthy else f"VPN 상태: {backend_state}"
-                }
+                return self._vpn_result(status_data.get("BackendState", ""))
             else:
-                return {
-                    "healthy": False,
-                    "status": "error",
-                    "message": f"VPN 상태 확인 실패: {result.stderr}"
-                }
+                return VPNCheckResult(False, CheckStatus.ERROR, MSG_VPN_STATUS_FAILED, result.stderr)
                 
         except FileNotFoundError:
-            return {
-                "healthy": False,
-                "status": "not_installed",
-                "message": "Tailscale이 설치되지 않음"
-            }
+            return VPNCheckResult(False, CheckStatus.NOT_INSTALLED, MSG_VPN_NOT_INSTALLED)
         except subprocess.TimeoutExpired:
-            return {
-                "healthy": False,
-                "status": "timeout",
-                "message": "VPN 상태 확인 시간 초과"
-            }
+            return VPNCheckResult(False, CheckStatus.TIMEOUT, MSG_VPN_TIMEOUT)
         except Exception as e:
             self.logger.error(f"VPN 상태 확인 중 오류: {e}")
-            return {
-                "healthy": False,
-                "status": "error",
-                "message": str(e)
-            }
+            return VPNCheckResult(False, CheckStatus.ERROR, str(e))
+    
+    def _vpn_result(self, backend_state: str) -> VPNCheckResult:
+        if backend_state == "Running":
+            path = self._master_path()
+            if path is not None and path.mode == RELAY:
+                return VPNCheckResult(True, backend_state, MSG_VPN_RELAYED, path.via, path.latency_ms,
+                                      peers=self._peer_count(), path=path)
+            return VPNCheckResult(True, backend_state, MSG_VPN_OK, peers=self._peer_count(), path=path)
+        return VPNCheckResult(False, backend_state, MSG_VPN_STATE, backend_state,
+                              peers=len(self.vpn_manager.peer_table))
+    
+    def _master_path(self) -> Optional[PeerPathResult]:
+        """마스터 VPN 피어까지의 경로 (disco ping 한 번, 릴레이/직접 지연시간 함께 보고)"""
+        vpn_ip = self.config.get("master", {}).get("vpn_ip")
+        if not vpn_ip or not self.config.get("monitor", {}).get("vpn_path_check", True):
+            return None
+        return self.vpn_manager.path_tracker.probe(vpn_ip)
     
-    def check_network_connectivity(self) -> Dict:
+    def _peer_count(self) -> int:
+        """피어 수 (monitor.vpn_peer_refresh_interval 마다 피어 테이블 갱신)"""
+        interval = self.config.get("monitor", {}).get("vpn_peer_refresh_interval", 300)
+        now = time.monotonic()
+        if self._peers_refreshed is None or now - self._peers_refreshed >= interval:
+            self.vpn_manager.refresh_peers()
+            self._peers_refreshed = now
+        return len(self.vpn_manager.peer_table)
+    
+    def check_network_connectivity(self) -> NetworkCheckResult:
         """네트워크 연결성 확인
         
         Returns:
-            Dict: 네트워크 상태 정보
+            NetworkCheckResult: 네트워크 상태 정보
         """
         master_ip = self.config.get("master", {}).get("ip")
+        api_port = self.config.get("firewall", {}).get("k8s_api_port", 6443)
+        monitor_cfg = self.config.get("monitor", {})
+        
+        # HA 제어 평면: 주기적으로 엔드포인트 순위를 다시 매겨 가장 빠른 정상 엔드포인트 사용
+        if self.endpoint_selector is not None:
+            if self.endpoint_selector.due(monitor_cfg.get("endpoint_rerank_interval", 300)):
+                self.endpoint_selector.select()
+            if self.endpoint_selector.current is not None:
+                master_ip = self.endpoint_selector.current.host
+                api_port = self.endpoint_selector.current.port
+        
+        # 직접/VPN 경로를 함께 프로브하고 품질에 따라 선호 경로 전환 (히스테리시스)
+        link = None
+        if self.path_manager is not None:
+            self.path_manager.evaluate()
+            master_ip = self.path_manager.host
+            link = self.path_manager.samples[self.path_manager.current].link
+        
         if not master_ip:
-            return {
-                "healthy": False,
-                "status": "no_config",
-                "message": "마스터 IP가 설정되지 않음"
-            }
+            return NetworkCheckResult(False, CheckStatus.NO_CONFIG, MSG_NO_MASTER_IP)
         
-        # Ping 테스트
-        ping_result = self.network_mgr.ping(master_ip, count=3)
+        # 패킷 트레인으로 RTT/지터/손실률 측정 후 링크 품질 점수 산출
+        if link is None:
+            link = self.network_mgr.measure_link(
+                master_ip,
+                count=monitor_cfg.get("ping_count", 10),
+                interval=monitor_cfg.get("ping_interval", 0.2),
+            )
+        ping_result = link.received > 0
+        link_ok = link.score >= monitor_cfg.get("link_quality_min_score", 50.0)
         
-        # API 서버 포트 체크
-        api_port = 6443
-        port_result = self.network_mgr.port_check(master_ip, api_port, timeout=5)
+        # API 서버 포트 체크 (연결 지연시간 측정)
+        port_result, latency = self.network_mgr.measure_port_latency(master_ip, api_port, timeout=5)
         
-        is_healthy = ping_result and port_result
+        # API 서버 /livez, /readyz 프로브 (단계별 시간, 모니터 주기 간 keep-alive 연결 재사용)
+        api_probes = {}
+        if port_result:
+            api_probes = self.network_mgr.probe_apiserver(master_ip, api_port)
+        readyz = api_probes.get("readyz")
         
-        return {
-            "healthy": is_healthy,
-            "master_ip": master_ip,
-            "ping": "success" if ping_result else "failed",
-            "api_server": "accessible" if port_result else "not_accessible",
-            "message": "네트워크 연결 정상" if is_healthy else "마스터 노드와 통신 불가"
-        }
+        # 응답은 있지만 손실/지터가 큰 링크는 정상으로 보지 않음
+        is_healthy = ping_result and link_ok and port_result
+        
+        # 지연시간 이상 감지 (연결 실패 이전의 점진적 저하 조기 경보)
+        anomaly = None
+        if latency is not None:
+            anomaly = self.anomaly_detector.observe(f"api_connect:{master_ip}:{api_port}", latency)
+        
+        if is_healthy and readyz is not None and not readyz.success:
+            # 네트워크는 정상이지만 API 서버 자체가 준비되지 않음
+            status, message, args = CheckStatus.DEGRADED, MSG_API_NOT_READY, (readyz.message,)
+        elif is_healthy and anomaly and anomaly.degraded:
+            status, message, args = CheckStatus.DEGRADED, MSG_NETWORK_DEGRADED, (anomaly.value, anomaly.baseline)
+        elif is_healthy:
+            status, message, args = None, MSG_NETWORK_OK, ()
+        elif ping_result and port_result:
+            status, message, args = None, MSG_NETWORK_POOR_LINK, (link.score, link.loss_pct, link.jitter_ms)
+        else:
+            status, message, args = None, MSG_NETWORK_FAILED, ()
+        
+        return NetworkCheckResult(
+            is_healthy,
+            status,
+            message,
+            *args,
+            master_ip=master_ip,
+            ping=CheckStatus.SUCCESS if ping_result else CheckStatus.FAILED,
+            api_server=CheckStatus.ACCESSIBLE if port_result else CheckStatus.NOT_ACCESSIBLE,
+            latency_ms=round(latency, 3) if latency is not None else None,
+            baseline_ms=round(anomaly.baseline, 3) if anomaly else None,
+            link=link,
+            livez=api_probes.get("livez"),
+            http=readyz,
+            path=self.path_manager.status() if self.path_manager is not None else None,
+        )
     
-    def check_kubelet_status(self) -> Dict:
+    def check_kubelet_status(self) -> ServiceCheckResult:
         """Kubelet 서비스 상태 확인
         
         Returns:
-            Dict: Kubelet 상태 정보
+            ServiceCheckResult: Kubelet 상태 정보
         """
         try:
             # systemctl status kubelet
@@ -189,26 +326,22 @@ class HealthChecker:
             else:
                 version = "unknown"
             
-            return {
-                "healthy": is_active,
-                "status": "active" if is_active else "inactive",
-                "version": version,
-                "message": "Kubelet 정상 작동" if is_active else "Kubelet이 실행되지 않음"
-            }
+            return ServiceCheckResult(
+                is_active,
+                CheckStatus.ACTIVE if is_active else CheckStatus.INACTIVE,
+                MSG_KUBELET_OK if is_active else MSG_KUBELET_DOWN,
+                version=version,
+            )
             
         except Exception as e:
             self.logger.error(f"Kubelet 상태 확인 중 오류: {e}")
-            return {
-                "healthy": False,
-                "status": "error",
-                "message": str(e)
-            }
+            return ServiceCheckResult(False, CheckStatus.ERROR, str(e))
     
-    def check_crio_status(self) -> Dict:
+    def check_crio_status(self) -> ServiceCheckResult:
         """CRI-O 서비스 상태 확인
         
         Returns:
-            Dict: CRI-O 상태 정보
+            ServiceCheckResult: CRI-O 상태 정보
         """
         try:
             # systemctl status crio
@@ -233,30 +366,26 @@ class HealthChecker:
             else:
                 version = "unknown"
             
-            return {
-                "healthy": is_active,
-                "status": "active" if is_active else "inactive",
-                "version": version,
-                "message": "CRI-O 정상 작동" if is_active else "CRI-O가 실행되지 않음"
-            }
+            return ServiceCheckResult(
+                is_active,
+                CheckStatus.ACTIVE if is_active else CheckStatus.INACTIVE,
+                MSG_CRIO_OK if is_active else MSG_CRIO_DOWN,
+                version=version,
+            )
             
         except Exception as e:
             self.logger.error(f"CRI-O 상태 확인 중 오류: {e}")
-            return {
-                "healthy": False,
-                "status": "error",
-                "message": str(e)
-            }
+            return ServiceCheckResult(False, CheckStatus.ERROR, str(e))
     
-    def check_containerd_status(self) -> Dict:
+    def check_containerd_status(self) -> ServiceCheckResult:
         """하위 호환성을 위한 래퍼 - CRI-O 상태 확인"""
         return self.check_crio_status()
     
-    def check_node_ready_status(self) -> Dict:
+    def check_node_ready_status(self) -> NodeCheckResult:
         """Kubernetes 노드 Ready 상태 확인
         
         Returns:
-            Dict: 노드 상태 정보
+            NodeCheckResult: 노드 상태 정보
         """
         try:
             # kubectl get nodes 명령 실행
@@ -268,16 +397,11 @@ class HealthChecker:
             )
             
             if result.returncode != 0:
-                return {
-                    "healthy": False,
-                    "status": "kubectl_error",
-                    "message": f"kubectl 실행 실패: {result.stderr}"
-                }
+                return NodeCheckResult(False, CheckStatus.KUBECTL_ERROR, MSG_KUBECTL_FAILED, result.stderr)
             
             nodes_data = json.loads(result.stdout)
             
             # 현재 노드 찾기
-            import socket
             hostname = socket.gethostname()
             
             current_node = None
@@ -287,47 +411,62 @@ class HealthChecker:
                     break
             
             if not current_node:
-                return {
-                    "healthy": False,
-                    "status": "not_found",
-                    "message": f"노드를 찾을 수 없음: {hostname}"
-                }
+                return NodeCheckResult(False, CheckStatus.NOT_FOUND, MSG_NODE_NOT_FOUND, hostname)
             
             # Ready 상태 확인
             conditions = current_node.get("status", {}).get("conditions", [])
             ready_condition = next((c for c in conditions if c["type"] == "Ready"), None)
             
-            is_ready = ready_condition and ready_condition.get("status") == "True"
+            is_ready = bool(ready_condition and ready_condition.get("status") == "True")
             
-            return {
-                "healthy": is_ready,
-                "status": "Ready" if is_ready else "NotReady",
-                "hostname": hostname,
-                "node_info": current_node.get("status", {}).get("nodeInfo", {}),
-                "message": "노드가 Ready 상태" if is_ready else "노드가 Ready 상태가 아님"
-            }
+            return NodeCheckResult(
+                is_ready,
+                CheckStatus.READY if is_ready else CheckStatus.NOT_READY,
+                MSG_NODE_READY if is_ready else MSG_NODE_NOT_READY,
+                hostname=hostname,
+                node_info=current_node.get("status", {}).get("nodeInfo", {}),
+            )
             
         except FileNotFoundError:
-            return {
-                "healthy": False,
-                "status": "kubectl_not_found",
-                "message": "kubectl이 설치되지 않음"
-            }
+            return NodeCheckResult(False, CheckStatus.KUBECTL_NOT_FOUND, MSG_KUBECTL_NOT_INSTALLED)
         except json.JSONDecodeError as e:
-            return {
-                "healthy": False,
-                "status": "json_error",
-                "message": f"JSON 파싱 오류: {e}"
-            }
+            return NodeCheckResult(False, CheckStatus.JSON_ERROR, MSG_JSON_ERROR, str(e))
         except Exception as e:
             self.logger.error(f"노드 상태 확인 중 오류: {e}")
-            return {
-                "healthy": False,
-                "status": "error",
-                "message": str(e)
-            }
+            return NodeCheckResult(False, CheckStatus.ERROR, str(e))
     
-    def save_health_report(self, results: Dict) -> Path:
+    def check_disk_pressure(self) -> DiskCheckResult:
+        """nodefs/imagefs 디스크 압박 확인 및 eviction 임계값 도달 시간 예측
+        
+        Returns:
+            DiskCheckResult: 파일시스템별 사용량 및 예측 정보
+        """
+        try:
+            filesystems = self.disk_forecaster.sample()
+        except Exception as e:
+            self.logger.error(f"디스크 상태 확인 중 오류: {e}")
+            return DiskCheckResult(False, CheckStatus.ERROR, str(e))
+        
+        if not filesystems:
+            return DiskCheckResult(False, CheckStatus.ERROR, MSG_DISK_UNAVAILABLE)
+        
+        pressured = [fs["name"] for fs in filesystems if fs["pressure"]]
+        if pressured:
+            return DiskCheckResult(False, CheckStatus.UNHEALTHY, MSG_DISK_PRESSURE,
+                                   ", ".join(pressured), filesystems=filesystems)
+        
+        horizon = self.config.get("monitor", {}).get("disk_forecast_horizon_hours", 24.0) * 3600
+        forecast = [fs for fs in filesystems
+                    if fs["eta_seconds"] is not None and fs["eta_seconds"] <= horizon]
+        if forecast:
+            soonest = min(forecast, key=lambda fs: fs["eta_seconds"])
+            return DiskCheckResult(True, CheckStatus.DEGRADED, MSG_DISK_FORECAST,
+                                   soonest["name"], soonest["eta_seconds"] / 3600,
+                                   filesystems=filesystems)
+        
+        return DiskCheckResult(True, CheckStatus.HEALTHY, MSG_DISK_OK, filesystems=filesystems)
+    
+    def save_health_report(self, results: HealthReport) -> Path:
         """헬스체크 결과를 파일로 저장
         
         Args:
@@ -340,26 +479,67 @@ class HealthChecker:
         report_file = self.log_dir / f"health_report_{timestamp}.json"
         
         with open(report_file, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+            json.dump(results, f, indent=2, ensure_ascii=False, default=to_jsonable)
         
         self.logger.info(f"헬스 리포트 저장: {report_file}")
         return report_file
+    
+    def append_history(self, results: HealthReport) -> Path:
+        """헬스체크 결과를 히스토리 파일(JSON Lines)에 한 줄로 추가
+        
+        체크별 healthy 여부만 기록하는 압축 형식으로, analytics 모듈의
+        장기 분석 입력으로 사용됩니다.
+        
+        Args:
+            results: 헬스체크 결과
+            
+        Returns:
+            Path: 히스토리 파일 경로
+        """
+        record = {
+            "ts": round(datetime.fromisoformat(results.timestamp).timestamp(), 3),
+            "node": self.node_name,
+            "overall": 0 if results.overall_status == CheckStatus.UNHEALTHY else 1,
+            "checks": {name: int(result.healthy) for name, result in results.checks.items()},
+        }
+        
+        with open(self.history_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        
+        return self.history_file
 
 
 class NodeMonitor:
     """노드를 지속적으로 모니터링하는 클래스"""
     
-    def __init__(self, config: Dict, interval: int = 60):
+    def __init__(self, config: Dict, interval: int = 60, history_size: int = 120):
         """
         Args:
             config: 설정 딕셔너리
             interval: 모니터링 간격 (초)
+            history_size: 메모리에 보관할 최근 리포트 수
         """
         self.config = config
         self.interval = interval
         self.health_checker = HealthChecker(config)
-        self.logger = get_logger(__name__)
+        self.logger = get_logger()
         self.running = False
+        self.history = deque(maxlen=history_size)
+        
+        monitor_config = config.get("monitor", {})
+        self.event_bus = EventBus(capacity=monitor_config.get("events_buffer", 1000))
+        self.event_server = None
+        if monitor_config.get("events_socket") or monitor_config.get("events_port"):
+            self.event_server = EventStreamServer(
+                self.event_bus,
+                host=monitor_config.get("events_bind", "127.0.0.1"),
+                port=monitor_config.get("events_port", 0),
+                unix_socket=monitor_config.get("events_socket") or None,
+            )
+        # 피어 지연시간 측정 → 노드 지연 등급 레이블/어노테이션 게시
+        self.topology = TopologyReporter.from_config(
+            config, peers_source=self.health_checker.vpn_manager.get_peers
+        )
         
     def start_monitoring(self, duration: Optional[int] = None):
         """모니터링 시작
@@ -373,6 +553,9 @@ class NodeMonitor:
         start_time = time.time()
         check_count = 0
         
+        if self.event_server:
+            self.event_server.start()
+        
         try:
             while self.running:
                 check_count += 1
@@ -381,14 +564,27 @@ class NodeMonitor:
                 # 헬스체크 수행
                 results = self.health_checker.check_all()
                 
+                # 상태 전이 이벤트 발행
+                publish_transitions(self.event_bus, self.history[-1] if self.history else None, results)
+                self.history.append(results)
+                
                 # 결과 저장
                 self.health_checker.save_health_report(results)
+                self.health_checker.append_history(results)
+                
+                if self.topology and self.topology.due():
+                    try:
+                        self.topology.run()
+                    except Exception as e:
+                        self.logger.warning(f"토폴로지 게시 실패: {e}")
                 
                 # 경고 로그 (unhealthy인 경우)
-                if results["overall_status"] == "unhealthy":
+                if results.overall_status == CheckStatus.UNHEALTHY:
                     self.logger.warning(
-                        f"시스템이 비정상 상태입니다. 실패한 체크: {results.get('failed_checks', [])}"
+                        f"시스템이 비정상 상태입니다. 실패한 체크: {results.failed_checks or []}"
                     )
+                elif results.overall_status == CheckStatus.DEGRADED:
+                    self.logger.warning("시스템 성능 저하가 감지되었습니다.")
                 
                 # 지속 시간 체크
                 if duration and (time.time() - start_time) >= duration:
@@ -402,6 +598,8 @@ class NodeMonitor:
             self.logger.info("사용자에 의해 모니터링 중단")
         finally:
             self.running = False
+            if self.event_server:
+                self.event_server.stop()
     
     def stop_monitoring(self):
         """모니터링 중지"""
@@ -447,7 +645,8 @@ def generate_health_summary(log_dir: str = "/var/log/k8s-vpn-agent") -> Dict:
     # 통계 계산
     total_checks = len(recent_reports)
     healthy_checks = sum(1 for r in recent_reports if r.get("overall_status") == "healthy")
-    unhealthy_checks = total_checks - healthy_checks
+    degraded_checks = sum(1 for r in recent_reports if r.get("overall_status") == "degraded")
+    unhealthy_checks = total_checks - healthy_checks - degraded_checks
     
     # 최근 상태
     latest = recent_reports[0]
@@ -457,6 +656,7 @@ def generate_health_summary(log_dir: str = "/var/log/k8s-vpn-agent") -> Dict:
         "latest_status": latest["overall_status"],
         "total_checks": total_checks,
         "healthy_checks": healthy_checks,
+        "degraded_checks": degraded_checks,
         "unhealthy_checks": unhealthy_checks,
         "health_rate": round(healthy_checks / total_checks * 100, 2),
         "latest_details": latest["checks"],
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 네트워크 인터페이스 조회 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- /sys/class/net/<if>/ 의 operstate, carrier, mtu, flags 읽기
+- rtnetlink RTM_GETADDR 덤프로 IPv4/IPv6 주소 조회
+- 모든 인터페이스를 한 번에 수집하는 스냅샷 (주기당 netlink 덤프 1회, 프로세스 실행 없음)
+- SIOCSIFMTU ioctl 로 인터페이스 MTU 변경
+
+`ip link` / `ip addr` 출력을 파싱하던 방식을 대체합니다.
+"""
+
+import fcntl
+import os
+import socket
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from .logger import get_logger
+
+
+SYS_CLASS_NET = "/sys/class/net"
+
+IFF_UP = 0x1
+IFF_POINTOPOINT = 0x10
+IFF_RUNNING = 0x40
+
+NETLINK_ROUTE = 0
+NLM_F_REQUEST = 0x1
+NLM_F_DUMP = 0x300
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+RTM_NEWADDR = 20
+RTM_GETADDR = 22
+IFA_ADDRESS = 1
+IFA_LOCAL = 2
+
+SIOCSIFMTU = 0x8922
+
+_NLMSGHDR = struct.Struct("=IHHII")
+_IFADDRMSG = struct.Struct("=BBBBI")
+_RTATTR = struct.Struct("=HH")
+
+# (패밀리, 주소, 프리픽스 길이)
+Address = Tuple[int, str, int]
+
+
+class InterfaceInfo:
+    """단일 인터페이스 상태"""
+
+    __slots__ = ("name", "index", "operstate", "carrier", "mtu", "flags", "addresses")
+
+    def __init__(self, name: str, index: int = 0, operstate: str = "unknown",
+                 carrier: Optional[bool] = None, mtu: Optional[int] = None, flags: int = 0):
+        self.name = name
+        self.index = index
+        self.operstate = operstate
+        self.carrier = carrier
+        self.mtu = mtu
+        self.flags = flags
+        self.addresses: List[Address] = []
+
+    @property
+    def is_up(self) -> bool:
+        """인터페이스 활성 여부
+
+        tun 장치(tailscale0 등)와 lo 는 operstate 를 보고하지 않아 항상 "unknown" 이므로,
+        이 경우 IFF_UP 플래그와 carrier 로 판단합니다.
+        """
+        if self.operstate == "up":
+            return True
+        if self.operstate == "unknown":
+            return bool(self.flags & IFF_UP) and self.carrier is not False
+        return False
+
+    @property
+    def ipv4(self) -> Optional[str]:
+        return next((addr for family, addr, _ in self.addresses if family == socket.AF_INET), None)
+
+    @property
+    def ipv6(self) -> Optional[str]:
+        """IPv6 주소 (링크 로컬 fe80::/10 보다 전역 주소 우선)"""
+        candidates = [addr for family, addr, _ in self.addresses if family == socket.AF_INET6]
+        routable = [addr for addr in candidates if not addr.lower().startswith("fe80:")]
+        return (routable or candidates or [None])[0]
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "index": self.index,
+            "operstate": self.operstate,
+            "carrier": self.carrier,
+            "mtu": self.mtu,
+            "flags": self.flags,
+            "up": self.is_up,
+            "addresses": [f"{addr}/{prefix}" for _, addr, prefix in self.addresses],
+        }
+
+
+def _read_sysfs(name: str, attr: str, root: str = SYS_CLASS_NET) -> Optional[str]:
+    try:
+        with open(os.path.join(root, name, attr), "r") as f:
+            return f.read().strip()
+    except OSError:
+        # carrier 는 인터페이스가 내려가 있으면 EINVAL
+        return None
+
+
+def read_link(name: str, root: str = SYS_CLASS_NET) -> Optional[InterfaceInfo]:
+    """sysfs 에서 링크 상태 읽기 (주소 제외). 인터페이스가 없으면 None"""
+    if not os.path.isdir(os.path.join(root, name)):
+        return None
+    index = _read_sysfs(name, "ifindex", root)
+    carrier = _read_sysfs(name, "carrier", root)
+    mtu = _read_sysfs(name, "mtu", root)
+    flags = _read_sysfs(name, "flags", root)
+    return InterfaceInfo(
+        name,
+        index=int(index) if index and index.isdigit() else 0,
+        operstate=_read_sysfs(name, "operstate", root) or "unknown",
+        carrier=None if carrier is None else carrier == "1",
+        mtu=int(mtu) if mtu and mtu.isdigit() else None,
+        flags=int(flags, 16) if flags else 0,
+    )
+
+
+def _parse_addr_message(payload: bytes) -> Tuple[int, Optional[Address]]:
+    """RTM_NEWADDR 페이로드 → (인터페이스 인덱스, 주소)"""
+    family, prefixlen, _, _, index = _IFADDRMSG.unpack_from(payload)
+    attrs: Dict[int, bytes] = {}
+    offset = _IFADDRMSG.size
+    while offset + _RTATTR.size <= len(payload):
+        length, attr_type = _RTATTR.unpack_from(payload, offset)
+        if length < _RTATTR.size:
+            break
+        attrs[attr_type] = payload[offset + _RTATTR.size:offset + length]
+        offset += (length + 3) & ~3
+
+    # point-to-point 링크의 IFA_ADDRESS 는 상대편 주소이므로 IPv4 는 IFA_LOCAL 우선
+    raw = attrs.get(IFA_LOCAL) if family == socket.AF_INET else None
+    raw = raw or attrs.get(IFA_ADDRESS)
+    if family not in (socket.AF_INET, socket.AF_INET6) or not raw:
+        return index, None
+    return index, (family, socket.inet_ntop(family, raw), prefixlen)
+
+
+def dump_addresses() -> Dict[int, List[Address]]:
+    """rtnetlink 로 모든 인터페이스의 주소를 한 번에 조회
+
+    Returns:
+        Dict[int, List[Address]]: 인터페이스 인덱스 → 주소 목록 (netlink 사용 불가 시 빈 dict)
+    """
+    logger = get_logger()
+    addresses: Dict[int, List[Address]] = {}
+    try:
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+    except (OSError, AttributeError) as e:
+        logger.debug(f"rtnetlink 사용 불가: {e}")
+        return addresses
+
+    with sock:
+        sock.bind((0, 0))
+        body = _IFADDRMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0)
+        sock.send(_NLMSGHDR.pack(_NLMSGHDR.size + len(body), RTM_GETADDR,
+                                 NLM_F_REQUEST | NLM_F_DUMP, 1, 0) + body)
+        while True:
+            data = sock.recv(65536)
+            offset = 0
+            while offset + _NLMSGHDR.size <= len(data):
+                length, msg_type, _, _, _ = _NLMSGHDR.unpack_from(data, offset)
+                if length < _NLMSGHDR.size:
+                    return addresses
+                if msg_type == NLMSG_DONE:
+                    return addresses
+                if msg_type == NLMSG_ERROR:
+                    logger.debug("rtnetlink 주소 덤프 오류 응답")
+                    return addresses
+                if msg_type == RTM_NEWADDR:
+                    index, address = _parse_addr_message(
+                        data[offset + _NLMSGHDR.size:offset + length]
+                    )
+                    if address:
+                        addresses.setdefault(index, []).append(address)
+                offset += (length + 3) & ~3
+
+
+def snapshot(root: str = SYS_CLASS_NET) -> Dict[str, InterfaceInfo]:
+    """모든 인터페이스의 링크 상태와 주소를 한 번에 수집"""
+    try:
+        names = sorted(os.listdir(root))
+    except OSError:
+        return {}
+    interfaces = {}
+    for name in names:
+        info = read_link(name, root)
+        if info is not None:
+            interfaces[name] = info
+
+    by_index = {info.index: info for info in interfaces.values()}
+    for index, addresses in dump_addresses().items():
+        if index in by_index:
+            by_index[index].addresses = addresses
+    return interfaces
+
+
+def get_interface(name: str) -> Optional[InterfaceInfo]:
+    """단일 인터페이스 조회 (주소 포함)"""
+    info = read_link(name)
+    if info is not None:
+        info.addresses = dump_addresses().get(info.index, [])
+    return info
+
+
+def set_mtu(name: str, mtu: int) -> bool:
+    """인터페이스 MTU 변경 (CAP_NET_ADMIN 필요)"""
+    ifreq = struct.pack("16si12x", name.encode()[:15], mtu)
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+            fcntl.ioctl(sock.fileno(), SIOCSIFMTU, ifreq)
+    except OSError as e:
+        get_logger().warning(f"Failed to set MTU {mtu} on {name}: {e}")
+        return False
+    return True
@@ -3,77 +3,180 @@
 ping, 포트, DNS, HTTP 체크 기능
 """
 
-import subprocess
 import socket
+import threading
+import time
+import warnings
+import weakref
 import requests
-from typing import Tuple, Optional, Dict
+from urllib3.exceptions import InsecureRequestWarning
+from typing import Tuple, Optional, Dict, Sequence
 from rich.console import Console
 from .logger import get_logger
+from . import icmp, netif
+from .apiserver import HEALTH_PATHS, get_api_probe
+from .happy_eyeballs import RaceResult, race_connect
+from .probes import ProbeEngine
+from .resolver import Resolver, ResolvingHTTPAdapter, get_resolver
+from .results import APIProbeResult, HTTPProbeResult, LinkStats
 
 console = Console()
 
 
+class HTTPProbeSession:
+    """keep-alive 연결 풀을 공유하는 HTTP 프로브 세션
+
+    모니터 주기마다 새 연결과 TLS 핸드셰이크를 반복하지 않도록 호스트별로
+    최대 pool_maxsize 개의 연결을 유지하며 재사용합니다. 새 연결의 DNS 조회는
+    공유 리졸버(TTL 캐시)를 거칩니다.
+    (urllib3 는 새 연결에 TLS 세션 티켓을 넘기는 기능이 없으므로, 핸드셰이크
+    절감은 유지된 연결의 재사용으로 얻습니다.)
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 2, verify: bool = False):
+        """
+        Args:
+            pool_connections: 연결 풀을 유지할 호스트 수
+            pool_maxsize: 호스트별로 유지할 최대 연결 수
+            verify: TLS 인증서 검증 여부
+        """
+        self.session = requests.Session()
+        self.session.verify = verify
+        adapter = ResolvingHTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.requests = 0
+        self.reused = 0
+        self._seen = weakref.WeakSet()
+        self._lock = threading.Lock()
+
+    def get(self, url: str, timeout: float = 5) -> Tuple[requests.Response, bool]:
+        """GET 요청
+
+        Returns:
+            Tuple[requests.Response, bool]: (응답, 기존 연결 재사용 여부)
+        """
+        with warnings.catch_warnings():
+            if not self.session.verify:
+                # 검증을 끈 프로브가 매 주기마다 경고를 남기지 않도록 함
+                warnings.simplefilter("ignore", InsecureRequestWarning)
+            response = self.session.get(url, timeout=timeout, stream=True)
+        conn = getattr(response.raw, "connection", None)
+        # 본문을 모두 읽어야 연결이 풀로 반환된다
+        response.content
+        with self._lock:
+            reused = conn is not None and conn in self._seen
+            if conn is not None:
+                self._seen.add(conn)
+            self.requests += 1
+            self.reused += reused
+        return response, reused
+
+    def close(self):
+        self.session.close()
+
+
+_http_session: Optional[HTTPProbeSession] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> HTTPProbeSession:
+    """프로세스 전체에서 공유하는 HTTP 프로브 세션"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            _http_session = HTTPProbeSession()
+        return _http_session
+
+
 class NetworkChecker:
     """네트워크 연결성 확인 클래스"""
     
-    def __init__(self, debug: bool = False):
+    def __init__(self, debug: bool = False, http_session: Optional[HTTPProbeSession] = None,
+                 resolver: Optional[Resolver] = None):
         self.debug = debug
         self.logger = get_logger()
+        self.http_session = http_session or get_http_session()
+        self.resolver = resolver or get_resolver()
     
-    def check_ping(self, host: str, count: int = 3, timeout: int = 5) -> Tuple[bool, str]:
-        """호스트 핑 테스트"""
+    def measure_link(self, host: str, count: int = 10, interval: float = 0.2,
+                     timeout: float = 2) -> LinkStats:
+        """패킷 트레인으로 RTT(min/avg/max/mdev), 지터, 손실률과 링크 품질 점수 측정"""
+        result = icmp.ping(host, count=count, interval=interval, timeout=timeout)
+        link = result.stats()
+        if result.error:
+            self.logger.warning(f"✗ {host} ping failed: {result.error}")
+        else:
+            self.logger.debug(
+                f"{host} link: {link.received}/{link.sent}, loss {link.loss_pct}%, "
+                f"avg {link.avg_ms}ms, mdev {link.mdev_ms}ms, jitter {link.jitter_ms}ms, "
+                f"score {link.score} ({result.method})"
+            )
+        return link
+    
+    def check_ping(self, host: str, count: int = 3, timeout: int = 5,
+                   interval: float = 0.2) -> Tuple[bool, str]:
+        """호스트 핑 테스트 (ICMP 소켓 직접 사용, 불가 시 ping 명령)"""
         try:
             self.logger.debug(f"Pinging {host}...")
-            cmd = ["ping", "-c", str(count), "-W", str(timeout), host]
-            result = subprocess.run(
-                cmd, 
-                capture_output=True, 
-                text=True, 
-                timeout=timeout + 5
-            )
+            link = self.measure_link(host, count=count, interval=interval, timeout=timeout)
             
-            if result.returncode == 0:
-                self.logger.debug(f"✓ {host} is reachable")
-                return True, f"✓ {host} 응답 성공"
+            if link.received:
+                return True, (f"✓ {host} 응답 성공 ({link.avg_ms:.1f}ms, "
+                              f"손실 {link.loss_pct:.0f}%, 품질 {link.score:.0f})")
             else:
                 self.logger.warning(f"✗ {host} is unreachable")
                 return False, f"✗ {host} 응답 실패"
         
-        except subprocess.TimeoutExpired:
-            self.logger.error(f"✗ Ping timeout for {host}")
-            return False, f"✗ {host} 타임아웃"
         except Exception as e:
             self.logger.error(f"Ping error: {str(e)}")
             return False, f"✗ 핑 테스트 오류: {str(e)}"
     
+    def race_connect(self, host: str, port: int, timeout: float = 5,
+                     complete: bool = False) -> RaceResult:
+        """A/AAAA 주소로 Happy Eyeballs 연결 경쟁 (complete=True 면 패밀리별 지연시간 모두 측정)"""
+        result = race_connect(host, port, timeout=timeout, complete=complete, resolver=self.resolver)
+        for attempt in result.attempts:
+            self.logger.debug(
+                f"{host}:{port} attempt {attempt.address} at +{attempt.started_ms:.0f}ms: "
+                f"{f'{attempt.latency_ms:.1f}ms' if attempt.success else attempt.error}"
+            )
+        return result
+    
     def check_port(self, host: str, port: int, timeout: int = 5) -> Tuple[bool, str]:
-        """포트 연결 테스트"""
+        """포트 연결 테스트 (듀얼 스택이면 먼저 연결되는 패밀리 사용)"""
         try:
             self.logger.debug(f"Checking port {host}:{port}...")
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(timeout)
-            result = sock.connect_ex((host, port))
-            sock.close()
+            result = self.race_connect(host, port, timeout=timeout)
             
-            if result == 0:
-                self.logger.debug(f"✓ {host}:{port} is open")
-                return True, f"✓ {host}:{port} 연결 성공"
+            if result.success:
+                self.logger.debug(f"✓ {host}:{port} is open via {result.family} ({result.winner.address})")
+                return True, f"✓ {host}:{port} 연결 성공 ({result.family}, {result.latency_ms:.1f}ms)"
+            elif result.error == "호스트를 찾을 수 없습니다":
+                self.logger.error(f"✗ Cannot resolve {host}")
+                return False, f"✗ {host} 호스트를 찾을 수 없습니다"
             else:
                 self.logger.warning(f"✗ {host}:{port} is closed")
                 return False, f"✗ {host}:{port} 연결 실패"
         
-        except socket.gaierror:
-            self.logger.error(f"✗ Cannot resolve {host}")
-            return False, f"✗ {host} 호스트를 찾을 수 없습니다"
         except Exception as e:
             self.logger.error(f"Port check error: {str(e)}")
             return False, f"✗ 포트 테스트 오류: {str(e)}"
     
+    def measure_port_latency(self, host: str, port: int, timeout: int = 5) -> Tuple[bool, Optional[float]]:
+        """포트 연결 지연시간 측정 (가장 빠른 패밀리의 TCP connect 소요 시간, ms)"""
+        result = self.race_connect(host, port, timeout=timeout)
+        if result.success:
+            self.logger.debug(f"✓ {host}:{port} connect {result.latency_ms:.1f}ms ({result.family})")
+            return True, result.latency_ms
+        self.logger.debug(f"✗ {host}:{port} connect failed: {result.error}")
+        return False, None
+    
     def check_dns(self, domain: str = "google.com") -> Tuple[bool, str]:
         """DNS 조회 테스트"""
         try:
             self.logger.debug(f"Checking DNS for {domain}...")
-            socket.gethostbyname(domain)
+            self.resolver.resolve(domain)
             self.logger.debug("✓ DNS resolution successful")
             return True, f"✓ DNS 조회 성공 ({domain})"
         except socket.gaierror:
@@ -85,125 +188,160 @@ class NetworkChecker:
     
     def check_http(self, url: str, timeout: int = 5) -> Tuple[bool, str]:
         """HTTP/HTTPS 연결 테스트"""
+        result = self.probe_http(url, timeout)
+        return result.success, result.message
+    
+    def probe_http(self, url: str, timeout: float = 5) -> HTTPProbeResult:
+        """HTTP/HTTPS 연결 테스트 (공유 연결 풀 사용, 연결 재사용 여부 포함)"""
         try:
             self.logger.debug(f"Checking HTTP connection to {url}...")
-            response = requests.get(url, timeout=timeout, verify=False)
+            start = time.perf_counter()
+            response, reused = self.http_session.get(url, timeout=timeout)
+            elapsed = round((time.perf_counter() - start) * 1000, 3)
+            self.logger.debug(
+                f"HTTP {url} status {response.status_code}, "
+                f"{'reused' if reused else 'new'} connection, {elapsed}ms"
+            )
             if response.status_code < 400:
-                self.logger.debug(f"✓ HTTP connection successful (status: {response.status_code})")
-                return True, f"✓ HTTP 연결 성공 ({url})"
-            else:
-                self.logger.warning(f"✗ HTTP error: {response.status_code}")
-                return False, f"✗ HTTP 오류: {response.status_code}"
+                return HTTPProbeResult(True, "✓ HTTP 연결 성공 ({})", url, url=url,
+                                       status_code=response.status_code, reused=reused,
+                                       elapsed_ms=elapsed)
+            self.logger.warning(f"✗ HTTP error: {response.status_code}")
+            return HTTPProbeResult(False, "✗ HTTP 오류: {}", response.status_code, url=url,
+                                   status_code=response.status_code, reused=reused,
+                                   elapsed_ms=elapsed)
         except requests.exceptions.SSLError:
             self.logger.error("✗ SSL certificate error")
-            return False, f"✗ SSL 인증서 오류"
+            return HTTPProbeResult(False, "✗ SSL 인증서 오류", url=url)
         except requests.exceptions.ConnectionError:
             self.logger.error("✗ Connection failed")
-            return False, f"✗ 연결 실패"
+            return HTTPProbeResult(False, "✗ 연결 실패", url=url)
         except requests.exceptions.Timeout:
             self.logger.error("✗ Connection timeout")
-            return False, f"✗ 타임아웃"
+            return HTTPProbeResult(False, "✗ 타임아웃", url=url)
         except Exception as e:
             self.logger.error(f"HTTP check error: {str(e)}")
-            return False, f"✗ HTTP 테스트 오류: {str(e)}"
+            return HTTPProbeResult(False, "✗ HTTP 테스트 오류: {}", str(e), url=url)
     
-    def check_interface(self, interface: str) -> Tuple[bool, str]:
-        """네트워크 인터페이스 확인"""
+    def probe_apiserver(self, host: str, port: int = 6443,
+                        paths: Sequence[str] = HEALTH_PATHS) -> Dict[str, APIProbeResult]:
+        """API 서버 /livez, /readyz 프로브 (DNS/연결/TLS/첫 바이트 단계별 시간)
+
+        엔드포인트별 연결을 유지하므로 두 번째 요청부터는 서버 처리 시간(ttfb)만 측정됩니다.
+        """
+        self.logger.debug(f"Probing API server {host}:{port} {list(paths)}...")
+        return get_api_probe(host, port).probe_all(paths)
+    
+    def check_interface(self, interface: str,
+                        interfaces: Optional[Dict[str, netif.InterfaceInfo]] = None) -> Tuple[bool, str]:
+        """네트워크 인터페이스 확인 (sysfs 상태, interfaces 가 있으면 그 스냅샷 사용)"""
         try:
             self.logger.debug(f"Checking interface {interface}...")
-            result = subprocess.run(
-                ["ip", "link", "show", interface],
-                capture_output=True,
-                text=True
-            )
+            info = interfaces.get(interface) if interfaces is not None else netif.read_link(interface)
             
-            if result.returncode == 0:
-                if "state UP" in result.stdout:
-                    self.logger.debug(f"✓ Interface {interface} is UP")
-                    return True, f"✓ {interface} 인터페이스 활성화"
-                else:
-                    self.logger.warning(f"✗ Interface {interface} is DOWN")
-                    return False, f"✗ {interface} 인터페이스 비활성화"
-            else:
+            if info is None:
                 self.logger.warning(f"✗ Interface {interface} not found")
                 return False, f"✗ {interface} 인터페이스를 찾을 수 없습니다"
+            if info.is_up:
+                self.logger.debug(f"✓ Interface {interface} is UP ({info.operstate}, mtu {info.mtu})")
+                return True, f"✓ {interface} 인터페이스 활성화"
+            self.logger.warning(f"✗ Interface {interface} is DOWN ({info.operstate})")
+            return False, f"✗ {interface} 인터페이스 비활성화"
         
         except Exception as e:
             self.logger.error(f"Interface check error: {str(e)}")
             return False, f"✗ 인터페이스 확인 오류: {str(e)}"
     
-    def get_interface_ip(self, interface: str) -> Optional[str]:
-        """인터페이스의 IP 주소 가져오기"""
+    def get_interface_ip(self, interface: str,
+                         interfaces: Optional[Dict[str, netif.InterfaceInfo]] = None,
+                         family: int = socket.AF_INET) -> Optional[str]:
+        """인터페이스의 IP 주소 가져오기 (rtnetlink 조회, family 로 IPv4/IPv6 선택)"""
         try:
-            result = subprocess.run(
-                ["ip", "addr", "show", interface],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'inet ' in line:
-                        ip = line.strip().split()[1].split('/')[0]
-                        self.logger.debug(f"Interface {interface} IP: {ip}")
-                        return ip
-            
-            return None
+            info = interfaces.get(interface) if interfaces is not None else netif.get_interface(interface)
+            ip = None
+            if info:
+                ip = info.ipv6 if family == socket.AF_INET6 else info.ipv4
+            if ip:
+                self.logger.debug(f"Interface {interface} IP: {ip}")
+            return ip
         
         except Exception as e:
             self.logger.error(f"Get interface IP error: {str(e)}")
             return None
     
-    def comprehensive_check(self, master_ip: str, vpn_interface: Optional[str] = None) -> Dict:
-        """종합 네트워크 체크"""
+    def comprehensive_check(self, master_ip: str, vpn_interface: Optional[str] = None,
+                            api_port: int = 6443, probe_timeout: float = 5.0,
+                            overall_timeout: float = 10.0, ping_count: int = 10,
+                            ping_interval: float = 0.2, min_link_score: float = 50.0) -> Dict:
+        """종합 네트워크 체크
+
+        인터페이스, 마스터 핑, API 포트, API 서버 /readyz, DNS, 인터넷 프로브를 동시에 실행합니다.
+        링크가 끊긴 경우에도 전체 소요 시간은 overall_timeout 을 넘지 않습니다.
+        마스터 링크 품질 점수가 min_link_score 미만이면 응답이 있어도 실패로 판단합니다.
+        """
         console.print("\n[bold cyan]네트워크 연결성 체크 시작...[/bold cyan]\n")
         self.logger.info("Starting comprehensive network check...")
         
         results = {
             "vpn": None,
             "master_ping": None,
+            "master_link": None,
             "master_api": None,
+            "master_readyz": None,
             "dns": None,
             "internet": None,
             "overall": False,
         }
         
-        # VPN 인터페이스 체크
+        engine = ProbeEngine(probe_timeout, overall_timeout)
+        probes = {
+            "master_api": lambda: engine.tcp_connect(master_ip, api_port),
+            # 포트가 열려 있는 것만으로는 API 서버 정상으로 보지 않음
+            "master_readyz": lambda: engine.call_result(
+                get_api_probe(master_ip, api_port).probe, "/readyz"
+            ),
+            "dns": lambda: engine.resolve("google.com"),
+        }
+        # 마스터와 인터넷 핑은 하나의 ICMP 소켓으로 동시에 전송
+        probes.update(engine.ping_group({"master_ping": master_ip, "internet": "8.8.8.8"},
+                                        count=ping_count, interval=ping_interval))
+        # 인터페이스 상태와 주소는 한 번의 스냅샷으로 조회 (프로세스 실행 없음)
+        interfaces = netif.snapshot() if vpn_interface else None
         if vpn_interface:
-            success, msg = self.check_interface(vpn_interface)
-            results["vpn"] = {"success": success, "message": msg}
-            console.print(f"  {msg}")
-            
-            if success:
-                vpn_ip = self.get_interface_ip(vpn_interface)
+            probes["vpn"] = lambda: engine.call(self.check_interface, vpn_interface, interfaces)
+        
+        start = time.perf_counter()
+        results.update(engine.run(probes))
+        self.logger.debug(f"Network probes finished in {(time.perf_counter() - start) * 1000:.0f}ms")
+        
+        # VPN 인터페이스 체크
+        if results["vpn"]:
+            console.print(f"  {results['vpn'].message}")
+            if results["vpn"].success:
+                vpn_ip = self.get_interface_ip(vpn_interface, interfaces)
                 if vpn_ip:
                     console.print(f"    VPN IP: {vpn_ip}")
                     self.logger.info(f"VPN IP: {vpn_ip}")
         
-        # 마스터 노드 핑 체크
-        success, msg = self.check_ping(master_ip)
-        results["master_ping"] = {"success": success, "message": msg}
-        console.print(f"  {msg}")
-        
-        # K8s API 서버 포트 체크
-        success, msg = self.check_port(master_ip, 6443)
-        results["master_api"] = {"success": success, "message": msg}
-        console.print(f"  {msg}")
-        
-        # DNS 체크
-        success, msg = self.check_dns()
-        results["dns"] = {"success": success, "message": msg}
-        console.print(f"  {msg}")
-        
-        # 인터넷 연결 체크
-        success, msg = self.check_ping("8.8.8.8", count=2)
-        results["internet"] = {"success": success, "message": msg}
-        console.print(f"  {msg}")
+        for name in ("master_ping", "master_api", "master_readyz", "dns", "internet"):
+            console.print(f"  {results[name].message}")
+            readyz = results[name]
+            if name == "master_readyz" and getattr(readyz, "ttfb_ms", None) is not None:
+                console.print(f"    DNS {readyz.resolve_ms:.1f}ms / 연결 {readyz.connect_ms:.1f}ms / "
+                              f"TLS {readyz.tls_ms:.1f}ms / 첫 바이트 {readyz.ttfb_ms:.1f}ms")
         
-        # 전체 결과 판단
+        # 전체 결과 판단 (응답은 있지만 손실/지터가 큰 링크도 실패)
+        link = getattr(results["master_ping"], "link", None)
+        results["master_link"] = link
+        link_ok = link is not None and link.score >= min_link_score
+        if link is not None and link.received and not link_ok:
+            console.print(f"  [yellow]✗ 마스터 링크 품질 낮음: {link.score:.0f}점 "
+                          f"(손실 {link.loss_pct:.0f}%, 지터 {link.jitter_ms:.1f}ms)[/yellow]")
         critical_checks = [
-            results["master_ping"]["success"] if results["master_ping"] else False,
-            results["master_api"]["success"] if results["master_api"] else False,
+            results["master_ping"].success if results["master_ping"] else False,
+            link_ok,
+            results["master_api"].success if results["master_api"] else False,
+            results["master_readyz"].success if results["master_readyz"] else False,
         ]
         
         results["overall"] = all(critical_checks)
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - CNI 오버레이 캡슐화 UDP 프로브 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- VXLAN(RFC 7348), Geneve(RFC 8926), WireGuard 전송 메시지 형식으로 프레이밍한 UDP 프로브 패킷
+- 피어에서 실행하는 경량 응답기 (형식이 맞는 프로브 패킷만 그대로 돌려보냄)
+- 버스트 전송 후 오버레이 종류별 전달률, 순서 뒤바뀜, 중복, RTT 측정
+
+TCP 연결 테스트로는 캡슐화된 UDP 오버레이 트래픽이 경로와 방화벽을 통과하는지 알 수 없으므로,
+실제 오버레이 포트로 실제와 같은 헤더를 가진 패킷을 보냅니다.
+CNI 가 이미 커널에서 해당 포트를 사용 중인 노드에서는 응답기를 바인드할 수 없으므로,
+응답기는 CNI 설치 전(조인 전 점검)에 실행하거나 다른 포트를 지정해 사용합니다.
+"""
+
+import os
+import selectors
+import socket
+import struct
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .logger import get_logger
+from .probes import ProbeEngine
+from .resolver import get_resolver
+
+
+DEFAULT_PORTS = {"vxlan": 8472, "geneve": 6081, "wireguard": 51820}
+
+VXLAN_FLAG_VNI = 0x08
+GENEVE_PROTO_ETHERNET = 0x6558
+WG_MESSAGE_DATA = 4
+PROBE_VNI = 0xF1F1F1  # 실제 클러스터 VNI(flannel 1, Calico 4096)와 겹치지 않는 값
+
+# 내부 이더넷 프레임: 로컬 관리 MAC 주소와 로컬 실험용 EtherType (IEEE 802 로컬 실험용)
+_INNER_DST = bytes.fromhex("02000000f1f1")
+_INNER_SRC = bytes.fromhex("02000000f1f2")
+ETHERTYPE_EXPERIMENTAL = 0x88B5
+
+# 프로브 페이로드: 매직, 오버레이 코드, 세션, 순번, 전송 시각(ns)
+_MAGIC = b"K8VO"
+_PROBE = struct.Struct("!4sBIIQ")
+_OVERLAY_CODES = {"vxlan": 1, "geneve": 2, "wireguard": 3}
+
+_VXLAN = struct.Struct("!B3xI")          # flags, VNI << 8
+_GENEVE = struct.Struct("!BBHI")         # ver/optlen, flags, protocol, VNI << 8
+_WIREGUARD = struct.Struct("<B3xIQ")     # type, receiver index, counter (little endian)
+_ETHERNET = struct.Struct("!6s6sH")
+
+DEFAULT_PACKET_SIZE = 512
+
+
+def build_packet(overlay: str, session: int, seq: int, size: int = DEFAULT_PACKET_SIZE,
+                 sent_ns: Optional[int] = None) -> bytes:
+    """오버레이 형식의 프로브 UDP 페이로드 생성
+
+    Args:
+        overlay: "vxlan", "geneve", "wireguard"
+        session: 프로브 세션 식별자 (다른 프로브의 응답 구분)
+        seq: 순번
+        size: UDP 페이로드 크기 (바이트, 최소 크기보다 작으면 최소 크기)
+        sent_ns: 전송 시각 (기본값: 현재 monotonic ns)
+    """
+    sent_ns = time.monotonic_ns() if sent_ns is None else sent_ns
+    probe = _PROBE.pack(_MAGIC, _OVERLAY_CODES[overlay], session, seq, sent_ns)
+    if overlay == "vxlan":
+        header = _VXLAN.pack(VXLAN_FLAG_VNI, PROBE_VNI << 8)
+        inner = _ETHERNET.pack(_INNER_DST, _INNER_SRC, ETHERTYPE_EXPERIMENTAL) + probe
+    elif overlay == "geneve":
+        header = _GENEVE.pack(0, 0, GENEVE_PROTO_ETHERNET, PROBE_VNI << 8)
+        inner = _ETHERNET.pack(_INNER_DST, _INNER_SRC, ETHERTYPE_EXPERIMENTAL) + probe
+    elif overlay == "wireguard":
+        # 전송 데이터 메시지: 실제로는 암호화된 패킷이 오는 자리에 프로브 페이로드
+        header = _WIREGUARD.pack(WG_MESSAGE_DATA, session, seq)
+        inner = probe
+    else:
+        raise ValueError(f"지원하지 않는 오버레이: {overlay}")
+    packet = header + inner
+    return packet + b"\x00" * max(size - len(packet), 0)
+
+
+def parse_packet(data: bytes) -> Optional[Tuple[str, int, int, int]]:
+    """프로브 패킷이면 (오버레이, 세션, 순번, 전송 시각 ns), 아니면 None"""
+    if len(data) >= _VXLAN.size and data[0] == VXLAN_FLAG_VNI:
+        offset, overlay = _VXLAN.size + _ETHERNET.size, "vxlan"
+    elif len(data) >= _GENEVE.size and data[0] == 0 and \
+            struct.unpack_from("!H", data, 2)[0] == GENEVE_PROTO_ETHERNET:
+        offset, overlay = _GENEVE.size + _ETHERNET.size, "geneve"
+    elif len(data) >= _WIREGUARD.size and data[0] == WG_MESSAGE_DATA:
+        offset, overlay = _WIREGUARD.size, "wireguard"
+    else:
+        return None
+    if len(data) < offset + _PROBE.size:
+        return None
+    magic, code, session, seq, sent_ns = _PROBE.unpack_from(data, offset)
+    if magic != _MAGIC or _OVERLAY_CODES.get(overlay) != code:
+        return None
+    return overlay, session, seq, sent_ns
+
+
+class OverlayResponder:
+    """오버레이 프로브 응답기 (포트별 UDP 소켓, 스레드 하나에서 selectors 로 처리)"""
+
+    def __init__(self, host: str = "0.0.0.0", ports: Optional[Dict[str, int]] = None):
+        """
+        Args:
+            host: 바인드 주소 ("::" 이면 IPv4/IPv6 모두)
+            ports: 오버레이 → UDP 포트 (기본값: DEFAULT_PORTS)
+        """
+        self.host = host
+        self.ports = dict(ports or DEFAULT_PORTS)
+        self.logger = get_logger()
+        self.sockets: Dict[str, socket.socket] = {}
+        self.echoed = 0
+        self._sel: Optional[selectors.BaseSelector] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def addresses(self) -> Dict[str, int]:
+        """오버레이별 실제 바인드 포트 (포트 0 지정 시 할당된 포트)"""
+        return {name: sock.getsockname()[1] for name, sock in self.sockets.items()}
+
+    def start(self):
+        """소켓을 바인드하고 응답 스레드 시작 (바인드 실패한 오버레이는 경고 후 제외)"""
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        self._sel = selectors.DefaultSelector()
+        for name, port in self.ports.items():
+            sock = socket.socket(family, socket.SOCK_DGRAM)
+            if family == socket.AF_INET6:
+                sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0)
+            try:
+                sock.bind((self.host, port))
+            except OSError as e:
+                sock.close()
+                self.logger.warning(f"Overlay responder: cannot bind {name} port {port}: {e}")
+                continue
+            sock.setblocking(False)
+            self.sockets[name] = sock
+            self._sel.register(sock, selectors.EVENT_READ, name)
+        if not self.sockets:
+            raise OSError("바인드할 수 있는 오버레이 포트가 없습니다")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._serve, name="overlay-responder", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Overlay responder listening on {self.host}: {self.addresses}")
+
+    def _serve(self):
+        while not self._stop.is_set():
+            for key, _ in self._sel.select(0.2):
+                sock = key.fileobj
+                while True:
+                    try:
+                        data, addr = sock.recvfrom(65535)
+                    except (BlockingIOError, InterruptedError):
+                        break
+                    except OSError:
+                        break
+                    # 프로브 형식이 아닌 패킷(실제 오버레이 트래픽, 스캐너)은 무시
+                    if parse_packet(data) is None:
+                        continue
+                    try:
+                        sock.sendto(data, addr)
+                        self.echoed += 1
+                    except OSError:
+                        pass
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=2)
+        for sock in self.sockets.values():
+            sock.close()
+        self.sockets.clear()
+        if self._sel:
+            self._sel.close()
+
+
+class OverlayProbeResult:
+    """오버레이 종류별 버스트 프로브 결과"""
+
+    __slots__ = ("overlay", "host", "port", "sent", "rtts", "arrivals", "duplicates", "error")
+
+    def __init__(self, overlay: str, host: str, port: int):
+        self.overlay = overlay
+        self.host = host
+        self.port = port
+        self.sent = 0
+        self.rtts: Dict[int, float] = {}
+        self.arrivals: List[int] = []
+        self.duplicates = 0
+        self.error: Optional[str] = None
+
+    @property
+    def received(self) -> int:
+        return len(self.rtts)
+
+    @property
+    def delivery(self) -> float:
+        """전달률 (0.0 ~ 1.0)"""
+        return self.received / self.sent if self.sent else 0.0
+
+    @property
+    def reordered(self) -> int:
+        """앞서 도착한 패킷보다 순번이 작은 채로 도착한 패킷 수"""
+        count, highest = 0, -1
+        for seq in self.arrivals:
+            if seq < highest:
+                count += 1
+            highest = max(highest, seq)
+        return count
+
+    @property
+    def success(self) -> bool:
+        return self.received > 0
+
+    def _percentile(self, q: float) -> Optional[float]:
+        values = sorted(self.rtts.values())
+        if not values:
+            return None
+        return values[min(int(round(q * (len(values) - 1))), len(values) - 1)]
+
+    def to_dict(self) -> Dict:
+        def ms(value):
+            return round(value, 3) if value is not None else None
+
+        values = list(self.rtts.values())
+        return {
+            "overlay": self.overlay,
+            "host": self.host,
+            "port": self.port,
+            "sent": self.sent,
+            "received": self.received,
+            "delivery": round(self.delivery, 4),
+            "reordered": self.reordered,
+            "duplicates": self.duplicates,
+            "min_ms": ms(min(values)) if values else None,
+            "avg_ms": ms(sum(values) / len(values)) if values else None,
+            "p50_ms": ms(self._percentile(0.5)),
+            "p99_ms": ms(self._percentile(0.99)),
+            "max_ms": ms(max(values)) if values else None,
+            "error": self.error,
+        }
+
+
+def probe_overlay(host: str, overlay: str, port: Optional[int] = None, bursts: int = 5,
+                  burst_size: int = 20, burst_gap: float = 0.1, timeout: float = 1.0,
+                  size: int = DEFAULT_PACKET_SIZE) -> OverlayProbeResult:
+    """오버레이 형식 패킷을 버스트로 보내고 응답기의 에코로 전달률/순서/지연 측정
+
+    Args:
+        host: 응답기가 실행 중인 피어
+        overlay: "vxlan", "geneve", "wireguard"
+        port: UDP 포트 (기본값: 오버레이 기본 포트)
+        bursts: 버스트 수
+        burst_size: 버스트당 연속 전송 패킷 수
+        burst_gap: 버스트 간격 (초)
+        timeout: 마지막 버스트 후 응답 대기 시간 (초)
+        size: UDP 페이로드 크기 (바이트)
+    """
+    port = port or DEFAULT_PORTS[overlay]
+    result = OverlayProbeResult(overlay, host, port)
+    try:
+        address = get_resolver().resolve(host)[0]
+    except socket.gaierror:
+        result.error = "호스트를 찾을 수 없습니다"
+        return result
+
+    family = socket.AF_INET6 if ":" in address else socket.AF_INET
+    session = int.from_bytes(os.urandom(4), "big")
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    sel = selectors.DefaultSelector()
+    sel.register(sock, selectors.EVENT_READ)
+    total = bursts * burst_size
+
+    def drain():
+        while True:
+            try:
+                data = sock.recv(65535)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # 응답기 없음 (ICMP port unreachable)
+                result.error = result.error or str(e)
+                return
+            received_ns = time.monotonic_ns()
+            parsed = parse_packet(data)
+            if parsed is None or parsed[0] != overlay or parsed[1] != session:
+                continue
+            seq = parsed[2]
+            if seq in result.rtts:
+                result.duplicates += 1
+                continue
+            result.rtts[seq] = (received_ns - parsed[3]) / 1e6
+            result.arrivals.append(seq)
+
+    try:
+        sock.connect((address, port))
+        start = time.monotonic()
+        for burst in range(bursts):
+            next_burst = start + burst * burst_gap
+            while True:
+                wait = next_burst - time.monotonic()
+                if wait <= 0:
+                    break
+                if sel.select(wait):
+                    drain()
+            for i in range(burst_size):
+                seq = burst * burst_size + i
+                try:
+                    sock.send(build_packet(overlay, session, seq, size))
+                    result.sent += 1
+                except BlockingIOError:
+                    # 송신 버퍼가 가득 참: 손실로 집계
+                    result.sent += 1
+                except OSError as e:
+                    result.error = str(e)
+            drain()
+
+        deadline = time.monotonic() + timeout
+        while result.received < total:
+            wait = deadline - time.monotonic()
+            if wait <= 0 or not sel.select(wait):
+                break
+            drain()
+    except OSError as e:
+        result.error = str(e)
+    finally:
+        sel.close()
+        sock.close()
+
+    if result.success:
+        # 일부라도 도착했으면 중간에 받은 ICMP 오류는 일시적인 것으로 간주
+        result.error = None
+    elif result.error is None:
+        result.error = "응답 없음 (차단 또는 응답기 미실행)"
+    return result
+
+
+def probe_overlays(host: str, overlays: Sequence[str] = tuple(DEFAULT_PORTS),
+                   ports: Optional[Dict[str, int]] = None, bursts: int = 5, burst_size: int = 20,
+                   burst_gap: float = 0.1, timeout: float = 1.0,
+                   size: int = DEFAULT_PACKET_SIZE) -> Dict[str, OverlayProbeResult]:
+    """여러 오버레이 종류를 동시에 프로브"""
+    ports = ports or {}
+    duration = bursts * burst_gap + timeout
+    engine = ProbeEngine(probe_timeout=duration + 2, overall_timeout=duration + 3)
+    results: Dict[str, OverlayProbeResult] = {}
+
+    def run(overlay: str):
+        results[overlay] = probe_overlay(host, overlay, ports.get(overlay), bursts, burst_size,
+                                         burst_gap, timeout, size)
+        return results[overlay].success, overlay
+
+    engine.run({overlay: (lambda overlay=overlay: engine.call(run, overlay)) for overlay in overlays})
+    for overlay in overlays:
+        if overlay not in results:
+            result = OverlayProbeResult(overlay, host, ports.get(overlay) or DEFAULT_PORTS[overlay])
+            result.error = "타임아웃"
+            results[overlay] = result
+    return {overlay: results[overlay] for overlay in overlays}
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 제어 평면 경로 관리 모듈 (직접 연결 / VPN)
+
+이 모듈은 다음 기능을 제공합니다:
+- 직접 경로(master.ip)와 VPN 경로(master.vpn_ip)를 매 주기 동시에 프로브 (ICMP 링크 품질 + API 포트)
+- 경로별 품질 점수를 EWMA 로 평활화
+- 히스테리시스를 둔 선호 경로 전환
+  - 현재 경로가 연속 path_fail_samples 회 실패하고 다른 경로가 정상이면 즉시 페일오버
+  - 다른 경로가 연속 path_switch_samples 회 path_switch_margin 점 이상 좋고
+    마지막 전환 후 path_min_hold 초가 지났으면 전환
+- 전환 시각/사유 기록 (메모리 + JSON Lines 파일)
+
+조인 시점에 한 번 정한 경로는 이후 직접 경로가 나빠져도 바뀌지 않았으므로,
+모니터가 실행 중에 계속 경로를 재평가합니다.
+"""
+
+import json
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Deque, Dict, List, Optional
+
+from .logger import get_logger
+from .probes import ProbeEngine
+from .results import LinkStats, PingProbeResult
+
+
+DIRECT = "direct"
+VPN = "vpn"
+
+
+class PathSample:
+    """단일 경로의 한 주기 프로브 결과"""
+
+    __slots__ = ("name", "host", "link", "api_ok", "score")
+
+    def __init__(self, name: str, host: str, link: Optional[LinkStats], api_ok: bool):
+        self.name = name
+        self.host = host
+        self.link = link
+        self.api_ok = api_ok
+        # API 포트에 도달할 수 없으면 링크가 좋아도 사용할 수 없는 경로
+        self.score = link.score if (link is not None and api_ok) else 0.0
+
+    @property
+    def usable(self) -> bool:
+        return self.api_ok and self.link is not None and self.link.received > 0
+
+    def to_dict(self) -> Dict:
+        return {
+            "name": self.name,
+            "host": self.host,
+            "api_ok": self.api_ok,
+            "score": self.score,
+            "link": self.link.to_dict() if self.link is not None else None,
+        }
+
+
+class PathManager:
+    """직접/VPN 경로 프로브 및 선호 경로 전환"""
+
+    def __init__(self, paths: Dict[str, str], api_port: int = 6443, preferred: Optional[str] = None,
+                 switch_margin: float = 15.0, switch_samples: int = 3, fail_samples: int = 2,
+                 min_hold: float = 120.0, alpha: float = 0.3, ping_count: int = 5,
+                 ping_interval: float = 0.2, failover_file: Optional[str] = None,
+                 history_size: int = 100):
+        """
+        Args:
+            paths: 경로 이름 → 마스터 주소 (예: {"direct": "10.0.1.100", "vpn": "100.64.0.1"})
+            api_port: API 서버 포트
+            preferred: 초기 선호 경로 (기본값: 첫 번째 경로)
+            switch_margin: 전환에 필요한 평활 점수 차이 (0~100)
+            switch_samples: 점수 우위가 연속으로 유지되어야 하는 주기 수
+            fail_samples: 즉시 페일오버하기 전 현재 경로의 연속 실패 횟수
+            min_hold: 품질 기반 전환 사이의 최소 간격 (초, 페일오버에는 적용 안 함)
+            alpha: 점수 EWMA 가중치
+            ping_count: 경로별 ICMP 패킷 수
+            ping_interval: 패킷 전송 간격 (초)
+            failover_file: 전환 기록 파일 (JSON Lines, None 이면 저장하지 않음)
+            history_size: 메모리에 보관할 전환 기록 수
+        """
+        self.paths = dict(paths)
+        self.api_port = api_port
+        self.current = preferred if preferred in self.paths else next(iter(self.paths))
+        self.switch_margin = switch_margin
+        self.switch_samples = switch_samples
+        self.fail_samples = fail_samples
+        self.min_hold = min_hold
+        self.alpha = alpha
+        self.ping_count = ping_count
+        self.ping_interval = ping_interval
+        self.failover_file = Path(failover_file) if failover_file else None
+        self.failovers: Deque[Dict] = deque(maxlen=history_size)
+        self.scores: Dict[str, float] = {}
+        self.samples: Dict[str, PathSample] = {}
+        self.last_switch: Optional[float] = None
+        self._fail_run = 0
+        self._better_run = 0
+        self.logger = get_logger()
+
+    @classmethod
+    def from_config(cls, config: Dict, log_dir: str) -> Optional["PathManager"]:
+        """설정으로부터 생성 (master.ip 와 master.vpn_ip 가 모두 있어야 함)"""
+        master = config.get("master", {})
+        direct, vpn = master.get("ip"), master.get("vpn_ip")
+        if not direct or not vpn or direct == vpn:
+            return None
+        monitor = config.get("monitor", {})
+        failover_file = monitor.get("path_failover_file", "path_failovers.jsonl")
+        return cls(
+            {DIRECT: direct, VPN: vpn},
+            api_port=config.get("firewall", {}).get("k8s_api_port", 6443),
+            switch_margin=monitor.get("path_switch_margin", 15.0),
+            switch_samples=monitor.get("path_switch_samples", 3),
+            fail_samples=monitor.get("path_fail_samples", 2),
+            min_hold=monitor.get("path_min_hold", 120),
+            ping_count=monitor.get("ping_count", 10),
+            ping_interval=monitor.get("ping_interval", 0.2),
+            failover_file=str(Path(log_dir) / failover_file) if failover_file else None,
+        )
+
+    @property
+    def host(self) -> str:
+        """현재 선호 경로의 마스터 주소"""
+        return self.paths[self.current]
+
+    def probe(self) -> Dict[str, PathSample]:
+        """모든 경로의 링크 품질과 API 포트 도달성을 동시에 측정"""
+        engine = ProbeEngine(probe_timeout=5.0,
+                             overall_timeout=5.0 + self.ping_count * self.ping_interval)
+        probes = engine.ping_group({f"{name}_link": host for name, host in self.paths.items()},
+                                   count=self.ping_count, interval=self.ping_interval)
+        for name, host in self.paths.items():
+            probes[f"{name}_api"] = lambda host=host: engine.tcp_connect(host, self.api_port)
+        results = engine.run(probes)
+
+        samples = {}
+        for name, host in self.paths.items():
+            link_result = results.get(f"{name}_link")
+            link = link_result.link if isinstance(link_result, PingProbeResult) else None
+            samples[name] = PathSample(name, host, link, results[f"{name}_api"].success)
+        return samples
+
+    def update(self, samples: Dict[str, PathSample], now: Optional[float] = None) -> Optional[Dict]:
+        """프로브 결과를 반영하고 필요하면 선호 경로 전환
+
+        Returns:
+            Optional[Dict]: 전환했으면 전환 기록, 아니면 None
+        """
+        now = time.time() if now is None else now
+        self.samples = samples
+        for name, sample in samples.items():
+            previous = self.scores.get(name)
+            self.scores[name] = (sample.score if previous is None
+                                 else previous + self.alpha * (sample.score - previous))
+
+        current = samples.get(self.current)
+        others = [s for name, s in samples.items() if name != self.current and s.usable]
+        if not others:
+            self._fail_run = self._fail_run + 1 if current is None or not current.usable else 0
+            self._better_run = 0
+            return None
+        best = max(others, key=lambda s: self.scores[s.name])
+
+        # 1) 현재 경로 실패: 연속 fail_samples 회면 즉시 페일오버
+        if current is None or not current.usable:
+            self._fail_run += 1
+            self._better_run = 0
+            if self._fail_run >= self.fail_samples:
+                return self._switch(best.name, "failover", now)
+            return None
+        self._fail_run = 0
+
+        # 2) 품질 기반 전환: 평활 점수 우위가 연속 유지되고 최소 유지 시간이 지난 경우
+        if self.scores[best.name] - self.scores[self.current] >= self.switch_margin:
+            self._better_run += 1
+        else:
+            self._better_run = 0
+        held = self.last_switch is None or now - self.last_switch >= self.min_hold
+        if self._better_run >= self.switch_samples and held:
+            return self._switch(best.name, "quality", now)
+        return None
+
+    def evaluate(self, now: Optional[float] = None) -> Optional[Dict]:
+        """프로브 후 경로 평가"""
+        return self.update(self.probe(), now)
+
+    def _switch(self, target: str, reason: str, now: float) -> Dict:
+        record = {
+            "ts": round(now, 3),
+            "time": datetime.fromtimestamp(now).isoformat(),
+            "from": self.current,
+            "to": target,
+            "reason": reason,
+            "from_score": round(self.scores.get(self.current, 0.0), 1),
+            "to_score": round(self.scores.get(target, 0.0), 1),
+        }
+        self.logger.warning(
+            f"제어 평면 경로 전환: {self.current} → {target} ({reason}, "
+            f"점수 {record['from_score']} → {record['to_score']})"
+        )
+        self.current = target
+        self.last_switch = now
+        self._fail_run = 0
+        self._better_run = 0
+        self.failovers.append(record)
+        self._record(record)
+        return record
+
+    def _record(self, record: Dict):
+        if not self.failover_file:
+            return
+        try:
+            self.failover_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.failover_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, separators=(",", ":")) + "\n")
+        except OSError as e:
+            self.logger.warning(f"Failed to record path failover: {e}")
+
+    def status(self) -> Dict:
+        """현재 경로 상태 요약"""
+        return {
+            "preferred": self.current,
+            "host": self.host,
+            "scores": {name: round(score, 1) for name, score in self.scores.items()},
+            "last_switch": (datetime.fromtimestamp(self.last_switch).isoformat()
+                            if self.last_switch else None),
+            "failovers": len(self.failovers),
+        }
+
+    def recent_failovers(self, limit: int = 10) -> List[Dict]:
+        return list(self.failovers)[-limit:]
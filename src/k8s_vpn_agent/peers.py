@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - VPN 피어 테이블 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- tailscale 피어를 IP / 호스트 이름(MagicDNS 포함) / ACL 태그로 색인한 테이블
+- 전체 스냅샷과 비교해 바뀐 피어만 색인 갱신 (추가/삭제/변경 diff)
+- 외부 변경분(추가·변경 피어, 삭제 키)의 증분 적용
+- 변경될 때만 증가하는 버전 번호 (조회 결과 캐시 무효화용)
+
+피어가 수천 개인 tailnet 에서 조회 비용이 피어 수에 비례하지 않도록,
+조회는 색인으로 O(1) 에 처리하고 색인 갱신은 바뀐 피어에 대해서만 수행합니다.
+"""
+
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class PeerDiff:
+    """피어 테이블 변경 내역 (피어 키 목록)"""
+
+    __slots__ = ("added", "removed", "changed")
+
+    def __init__(self, added: List[str] = None, removed: List[str] = None,
+                 changed: List[str] = None):
+        self.added = added or []
+        self.removed = removed or []
+        self.changed = changed or []
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+    def to_dict(self) -> Dict:
+        return {"added": self.added, "removed": self.removed, "changed": self.changed}
+
+
+def _names(peer: Dict) -> Tuple[str, ...]:
+    """조회에 쓰는 이름: 호스트 이름, MagicDNS 전체 이름, MagicDNS 첫 레이블 (소문자)"""
+    names = {peer.get("HostName", "").lower()}
+    dns_name = peer.get("DNSName", "").lower().rstrip(".")
+    if dns_name:
+        names.update((dns_name, dns_name.split(".", 1)[0]))
+    names.discard("")
+    return tuple(sorted(names))
+
+
+def _fingerprint(peer: Dict) -> tuple:
+    """변경 감지용 필드 (색인 필드 + 온라인 여부)"""
+    return (tuple(peer.get("TailscaleIPs") or ()), peer.get("HostName", ""),
+            peer.get("DNSName", ""), tuple(peer.get("Tags") or ()), bool(peer.get("Online")))
+
+
+class PeerTable:
+    """IP / 이름 / 태그로 색인한 VPN 피어 테이블"""
+
+    def __init__(self):
+        self.peers: Dict[str, Dict] = {}
+        self.version = 0
+        self._fingerprints: Dict[str, tuple] = {}
+        self._by_ip: Dict[str, str] = {}
+        self._by_name: Dict[str, Set[str]] = {}
+        self._by_tag: Dict[str, Set[str]] = {}
+        self._online: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self.peers)
+
+    @property
+    def online_count(self) -> int:
+        return len(self._online)
+
+    def _index(self, key: str, peer: Dict):
+        for ip in peer.get("TailscaleIPs") or ():
+            self._by_ip[ip] = key
+        for name in _names(peer):
+            self._by_name.setdefault(name, set()).add(key)
+        for tag in peer.get("Tags") or ():
+            self._by_tag.setdefault(tag, set()).add(key)
+        if peer.get("Online"):
+            self._online.add(key)
+
+    def _unindex(self, key: str, peer: Dict):
+        for ip in peer.get("TailscaleIPs") or ():
+            if self._by_ip.get(ip) == key:
+                del self._by_ip[ip]
+        for index, values in ((self._by_name, _names(peer)), (self._by_tag, peer.get("Tags") or ())):
+            for value in values:
+                keys = index.get(value)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[value]
+        self._online.discard(key)
+
+    def _put(self, key: str, peer: Dict) -> Optional[str]:
+        """피어 추가/변경 → "added", "changed", 변경 없으면 None"""
+        fingerprint = _fingerprint(peer)
+        previous = self.peers.get(key)
+        if previous is not None and self._fingerprints[key] == fingerprint:
+            self.peers[key] = peer
+            return None
+        if previous is not None:
+            self._unindex(key, previous)
+        self.peers[key] = peer
+        self._fingerprints[key] = fingerprint
+        self._index(key, peer)
+        return "changed" if previous is not None else "added"
+
+    def _remove(self, key: str) -> bool:
+        peer = self.peers.pop(key, None)
+        if peer is None:
+            return False
+        self._unindex(key, peer)
+        del self._fingerprints[key]
+        return True
+
+    def apply_changes(self, upserts: Dict[str, Dict] = None,
+                      removed: Iterable[str] = ()) -> PeerDiff:
+        """변경분 증분 적용 (추가·변경된 피어와 삭제된 피어 키)"""
+        diff = PeerDiff()
+        for key, peer in (upserts or {}).items():
+            change = self._put(key, peer)
+            if change:
+                getattr(diff, change).append(key)
+        for key in removed:
+            if self._remove(key):
+                diff.removed.append(key)
+        if diff:
+            self.version += 1
+        return diff
+
+    def apply_snapshot(self, peers: Dict[str, Dict]) -> PeerDiff:
+        """전체 피어 스냅샷(tailscale status 의 Peer)과 비교해 바뀐 부분만 반영"""
+        removed = [key for key in self.peers if key not in peers]
+        return self.apply_changes(peers, removed)
+
+    def by_ip(self, ip: str) -> Optional[Dict]:
+        key = self._by_ip.get(ip)
+        return self.peers.get(key) if key else None
+
+    def by_name(self, name: str) -> List[Dict]:
+        """호스트 이름 또는 MagicDNS 이름(전체/첫 레이블)으로 조회"""
+        keys = self._by_name.get(name.lower().rstrip("."), ())
+        return [self.peers[key] for key in sorted(keys)]
+
+    def by_tag(self, tag: str) -> List[Dict]:
+        return [self.peers[key] for key in sorted(self._by_tag.get(tag, ()))]
+
+    def values(self) -> List[Dict]:
+        return list(self.peers.values())
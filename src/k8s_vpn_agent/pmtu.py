@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 경로 MTU 탐색 및 MTU 정합성 점검 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- DF 비트 ICMP 에코의 크기를 이진 탐색해 경로별 유효 MTU 측정
+- tailscale0 MTU 와 CNI MTU(설정 파일, 오버레이 인터페이스)를 측정값과 비교
+- 단편화/블랙홀 위험 판정과 권장 MTU 계산
+- 선택적 수정 (인터페이스 MTU 변경, CNI 설정 파일의 mtu 갱신)
+
+CNI MTU + 오버레이 헤더가 VPN 경로가 실제로 전달할 수 있는 크기를 넘으면
+큰 패킷만 사라져 파드 간 통신이 멈추거나 매우 느려집니다.
+"""
+
+import glob
+import json
+import os
+import socket
+from typing import Dict, List, Optional, Sequence
+
+from . import icmp
+from . import netif
+from .logger import get_logger
+from .resolver import get_resolver
+
+
+CNI_CONF_DIR = "/etc/cni/net.d"
+FLANNEL_SUBNET_ENV = "/run/flannel/subnet.env"
+
+# 최소 MTU (IPv4 는 RFC 791 의 576, IPv6 는 RFC 8200 의 1280)
+MIN_MTU = {socket.AF_INET: 576, socket.AF_INET6: 1280}
+
+# 연결된 UDP 소켓에서 커널이 아는 경로 MTU 조회 (linux/in.h, linux/in6.h)
+IP_MTU = 14
+IPV6_MTU = 24
+
+# 오버레이 인터페이스 이름 접두사 → (방식, 캡슐화 헤더 크기)
+OVERLAY_INTERFACES = (
+    ("flannel.", "vxlan", 50),
+    ("vxlan.calico", "vxlan", 50),
+    ("vxlan-v6.calico", "vxlan", 70),
+    ("cilium_vxlan", "vxlan", 50),
+    ("genev_sys_", "geneve", 50),
+    ("cilium_geneve", "geneve", 50),
+    ("tunl0", "ipip", 20),
+    ("wireguard.cali", "wireguard", 60),
+    ("flannel-wg", "wireguard", 60),
+)
+
+# 파드 트래픽이 지나가는 CNI 브리지/오버레이 인터페이스 접두사
+CNI_INTERFACE_PREFIXES = ("cni0", "cbr0", "weave") + tuple(p for p, _, _ in OVERLAY_INTERFACES)
+
+
+class PathMTU:
+    """단일 경로 MTU 측정 결과"""
+
+    __slots__ = ("host", "address", "mtu", "kernel_mtu", "probes", "error")
+
+    def __init__(self, host: str, address: Optional[str] = None):
+        self.host = host
+        self.address = address
+        self.mtu: Optional[int] = None
+        self.kernel_mtu: Optional[int] = None
+        self.probes = 0
+        self.error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "host": self.host,
+            "address": self.address,
+            "mtu": self.mtu,
+            "kernel_mtu": self.kernel_mtu,
+            "probes": self.probes,
+            "error": self.error,
+        }
+
+
+def kernel_path_mtu(address: str) -> Optional[int]:
+    """커널 라우팅 캐시의 경로 MTU (캐시가 없으면 출구 인터페이스 MTU)"""
+    family = socket.AF_INET6 if ":" in address else socket.AF_INET
+    try:
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.connect((address, 9))
+            if family == socket.AF_INET:
+                return sock.getsockopt(socket.IPPROTO_IP, IP_MTU)
+            return sock.getsockopt(socket.IPPROTO_IPV6, IPV6_MTU)
+    except OSError:
+        return None
+
+
+def discover_pmtu(host: str, max_mtu: Optional[int] = None, timeout: float = 1.0) -> PathMTU:
+    """DF 비트 에코 요청 크기를 이진 탐색해 경로 MTU 측정
+
+    Args:
+        host: 대상 호스트 (마스터, 피어의 VPN IP 등)
+        max_mtu: 탐색 상한 (기본값: 출구 인터페이스 MTU)
+        timeout: 크기별 응답 대기 시간 (초)
+
+    Returns:
+        PathMTU: 응답을 받은 가장 큰 패킷 크기 (최소 크기도 실패하면 mtu 는 None)
+    """
+    result = PathMTU(host)
+    try:
+        result.address = get_resolver().resolve(host)[0]
+    except socket.gaierror:
+        result.error = "호스트를 찾을 수 없습니다"
+        return result
+
+    family = socket.AF_INET6 if ":" in result.address else socket.AF_INET
+    result.kernel_mtu = kernel_path_mtu(result.address)
+    low, high = MIN_MTU[family], max_mtu or result.kernel_mtu or 1500
+
+    def probe(size: int) -> Optional[bool]:
+        result.probes += 1
+        return icmp.probe_packet_size(result.address, size, timeout)
+
+    # 상한이 통과하면 탐색 불필요 (대부분의 정상 경로)
+    reachable = probe(high)
+    if reachable is None:
+        result.error = "ICMP 소켓을 사용할 수 없습니다"
+        return result
+    if reachable:
+        result.mtu = high
+        return result
+    if not probe(low):
+        result.error = "최소 크기 패킷도 응답 없음"
+        return result
+
+    # 불변식: low 는 통과, high 는 실패
+    while high - low > 1:
+        middle = (low + high) // 2
+        if probe(middle):
+            low = middle
+        else:
+            high = middle
+    result.mtu = low
+    get_logger().debug(f"PMTU {host}: {low} ({result.probes} probes, kernel {result.kernel_mtu})")
+    return result
+
+
+def _find_mtu_values(data, path: str = "") -> Dict[str, int]:
+    """CNI 설정 JSON 에서 양수 mtu 값을 모두 찾기 (plugins 중첩 포함)"""
+    found: Dict[str, int] = {}
+    if isinstance(data, dict):
+        for key, value in data.items():
+            child = f"{path}.{key}" if path else key
+            if key.lower() == "mtu" and isinstance(value, int) and value > 0:
+                found[child] = value
+            else:
+                found.update(_find_mtu_values(value, child))
+    elif isinstance(data, list):
+        for i, value in enumerate(data):
+            found.update(_find_mtu_values(value, f"{path}[{i}]"))
+    return found
+
+
+def read_cni_mtus(conf_dir: str = CNI_CONF_DIR,
+                  flannel_env: str = FLANNEL_SUBNET_ENV) -> Dict[str, int]:
+    """CNI 설정에 지정된 MTU 값 ("파일:JSON 경로" → MTU)
+
+    Calico 의 "mtu": 0 (자동) 처럼 값이 없으면 포함하지 않습니다.
+    """
+    mtus: Dict[str, int] = {}
+    for path in sorted(glob.glob(os.path.join(conf_dir, "*.conf*"))):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for key, value in _find_mtu_values(data).items():
+            mtus[f"{path}:{key}"] = value
+
+    try:
+        with open(flannel_env, "r") as f:
+            for line in f:
+                name, _, value = line.strip().partition("=")
+                if name == "FLANNEL_MTU" and value.isdigit():
+                    mtus[f"{flannel_env}:FLANNEL_MTU"] = int(value)
+    except OSError:
+        pass
+    return mtus
+
+
+def overlay_type(interfaces: Dict[str, netif.InterfaceInfo]) -> Optional[tuple]:
+    """오버레이 인터페이스로 캡슐화 방식 판별 → (인터페이스, 방식, 헤더 크기)"""
+    for prefix, kind, overhead in OVERLAY_INTERFACES:
+        for name in interfaces:
+            if name.startswith(prefix):
+                return name, kind, overhead
+    return None
+
+
+class MTUReport:
+    """VPN/CNI MTU 정합성 점검 결과"""
+
+    __slots__ = ("vpn_interface", "vpn_mtu", "paths", "cni_mtus", "cni_interfaces", "overlay",
+                 "issues", "recommended_vpn_mtu", "recommended_cni_mtu")
+
+    def __init__(self, vpn_interface: str):
+        self.vpn_interface = vpn_interface
+        self.vpn_mtu: Optional[int] = None
+        self.paths: List[PathMTU] = []
+        self.cni_mtus: Dict[str, int] = {}
+        self.cni_interfaces: Dict[str, int] = {}
+        self.overlay: Optional[tuple] = None
+        self.issues: List[str] = []
+        self.recommended_vpn_mtu: Optional[int] = None
+        self.recommended_cni_mtu: Optional[int] = None
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    @property
+    def path_mtu(self) -> Optional[int]:
+        """측정된 경로 중 가장 작은 MTU (모든 피어와 통신 가능한 크기)"""
+        measured = [p.mtu for p in self.paths if p.mtu is not None]
+        return min(measured) if measured else None
+
+    def to_dict(self) -> Dict:
+        return {
+            "vpn_interface": self.vpn_interface,
+            "vpn_mtu": self.vpn_mtu,
+            "path_mtu": self.path_mtu,
+            "paths": [p.to_dict() for p in self.paths],
+            "cni_mtus": self.cni_mtus,
+            "cni_interfaces": self.cni_interfaces,
+            "overlay": ({"interface": self.overlay[0], "type": self.overlay[1],
+                         "overhead": self.overlay[2]} if self.overlay else None),
+            "issues": self.issues,
+            "recommended_vpn_mtu": self.recommended_vpn_mtu,
+            "recommended_cni_mtu": self.recommended_cni_mtu,
+            "ok": self.ok,
+        }
+
+
+def check_alignment(targets: Sequence[str], vpn_interface: str = "tailscale0",
+                    timeout: float = 1.0, conf_dir: str = CNI_CONF_DIR,
+                    interfaces: Optional[Dict[str, netif.InterfaceInfo]] = None) -> MTUReport:
+    """경로 MTU 를 측정하고 VPN/CNI MTU 설정과 비교
+
+    Args:
+        targets: 측정 대상 (VPN 을 거치는 마스터/피어 주소)
+        vpn_interface: VPN 인터페이스 이름
+        timeout: 크기별 응답 대기 시간 (초)
+        conf_dir: CNI 설정 디렉토리
+        interfaces: 인터페이스 스냅샷 (기본값: netif.snapshot())
+    """
+    interfaces = interfaces if interfaces is not None else netif.snapshot()
+    report = MTUReport(vpn_interface)
+    vpn = interfaces.get(vpn_interface)
+    report.vpn_mtu = vpn.mtu if vpn else None
+    report.cni_mtus = read_cni_mtus(conf_dir)
+    report.cni_interfaces = {name: info.mtu for name, info in interfaces.items()
+                             if name.startswith(CNI_INTERFACE_PREFIXES) and info.mtu}
+    report.overlay = overlay_type(interfaces)
+
+    for target in dict.fromkeys(targets):
+        report.paths.append(discover_pmtu(target, timeout=timeout))
+
+    path_mtu = report.path_mtu
+    if report.vpn_mtu is None:
+        report.issues.append(f"{vpn_interface} 인터페이스를 찾을 수 없습니다")
+    elif path_mtu is not None and path_mtu < report.vpn_mtu:
+        # 언더레이가 VPN 패킷을 전달하지 못해 큰 패킷이 사라지는 블랙홀
+        report.issues.append(
+            f"{vpn_interface} MTU {report.vpn_mtu} 가 측정된 경로 MTU {path_mtu} 보다 큽니다 (블랙홀 위험)"
+        )
+        report.recommended_vpn_mtu = path_mtu
+
+    known = [mtu for mtu in (path_mtu, report.vpn_mtu) if mtu is not None]
+    if known:
+        effective = min(known)
+        overhead = report.overlay[2] if report.overlay else 0
+        limit = effective - overhead
+        configured = dict(report.cni_mtus)
+        configured.update({f"interface:{name}": mtu for name, mtu in report.cni_interfaces.items()})
+        too_large = {source: mtu for source, mtu in configured.items() if mtu > limit}
+        for source, mtu in too_large.items():
+            report.issues.append(
+                f"CNI MTU {mtu} ({source}) + 오버레이 {overhead}바이트가 유효 MTU {effective} 를 넘습니다 "
+                f"(단편화 위험)"
+            )
+        if too_large:
+            report.recommended_cni_mtu = limit
+
+    for path in report.paths:
+        if path.mtu is None:
+            report.issues.append(f"{path.host} 경로 MTU 측정 실패: {path.error}")
+    return report
+
+
+def _rewrite_mtu(data, mtu: int):
+    """JSON 에서 양수 mtu 값을 mtu 로 교체 (제자리 수정)"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key.lower() == "mtu" and isinstance(value, int) and value > mtu:
+                data[key] = mtu
+            else:
+                _rewrite_mtu(value, mtu)
+    elif isinstance(data, list):
+        for value in data:
+            _rewrite_mtu(value, mtu)
+
+
+def apply_fix(report: MTUReport, conf_dir: str = CNI_CONF_DIR) -> List[str]:
+    """권장 MTU 적용 (인터페이스 MTU 변경, CNI 설정 파일 갱신)
+
+    CNI 설정 변경은 새로 생성되는 파드부터 적용되므로 기존 파드는 재시작이 필요합니다.
+
+    Returns:
+        List[str]: 수행한 변경 내역
+    """
+    logger = get_logger()
+    changes = []
+    if report.recommended_vpn_mtu is not None:
+        if netif.set_mtu(report.vpn_interface, report.recommended_vpn_mtu):
+            changes.append(f"{report.vpn_interface} MTU → {report.recommended_vpn_mtu}")
+
+    mtu = report.recommended_cni_mtu
+    if mtu is None:
+        return changes
+    for name, current in report.cni_interfaces.items():
+        if current > mtu and netif.set_mtu(name, mtu):
+            changes.append(f"{name} MTU {current} → {mtu}")
+
+    for path in sorted({source.rsplit(":", 1)[0] for source in report.cni_mtus}):
+        if not path.startswith(conf_dir):
+            continue
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+            _rewrite_mtu(data, mtu)
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+                f.write("\n")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to update CNI config {path}: {e}")
+            continue
+        changes.append(f"{path}: mtu → {mtu}")
+
+    for change in changes:
+        logger.info(f"MTU fix applied: {change}")
+    return changes
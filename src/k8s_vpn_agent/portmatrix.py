@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 클러스터 포트 도달성 매트릭스 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- 노드 목록 조회 (kubectl get nodes 의 InternalIP)
+- 검사 포트 집합 구성 (kubelet, NodePort 샘플, CNI/BGP, firewall.additional_ports)
+- selectors(epoll) 기반 논블로킹 connect 로 노드 × 포트 전체를 동시 스캔 (동시 연결 수 제한)
+- 노드별/포트별 도달성 매트릭스 보고
+
+check_port 처럼 포트마다 블로킹 소켓을 쓰면 노드 수 × 포트 수 만큼 타임아웃이 누적되므로,
+하나의 이벤트 루프에서 수천 개의 연결을 동시에 진행합니다.
+"""
+
+import errno
+import json
+import os
+import selectors
+import socket
+import subprocess
+import time
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .logger import get_logger
+from .resolver import Resolver, get_resolver
+
+
+OPEN = "open"
+CLOSED = "closed"      # RST 응답 (호스트는 도달 가능, 포트는 닫힘)
+TIMEOUT = "timeout"    # 응답 없음 (방화벽 차단 또는 경로 없음)
+ERROR = "error"        # 라우팅 불가, 주소 조회 실패 등
+
+DEFAULT_CONCURRENCY = 256
+
+# CNI/라우팅 관련 TCP 포트 (Calico BGP, Typha, Cilium 헬스체크)
+CNI_PORTS = (179, 5473, 4240)
+
+Target = Tuple[str, int]
+
+
+def parse_port_specs(specs: Iterable) -> List[int]:
+    """포트 지정 목록을 TCP 포트 목록으로 변환
+
+    "10250", 10250, "179/tcp", "30000-30002", "30000:30002/tcp" 형식을 지원하며,
+    UDP 포트("8472/udp")는 TCP connect 로 검사할 수 없으므로 제외합니다.
+    """
+    ports: List[int] = []
+    for spec in specs:
+        value = str(spec).strip()
+        if not value:
+            continue
+        value, _, proto = value.partition("/")
+        if proto and proto.lower() != "tcp":
+            continue
+        start, sep, end = value.replace(":", "-").partition("-")
+        try:
+            first = int(start)
+            last = int(end) if sep else first
+        except ValueError:
+            get_logger().warning(f"Invalid port spec ignored: {spec}")
+            continue
+        for port in range(first, last + 1):
+            if 0 < port < 65536 and port not in ports:
+                ports.append(port)
+    return ports
+
+
+def nodeport_samples(port_range: str, count: int = 3) -> List[int]:
+    """NodePort 범위에서 처음/중간/끝 포트 샘플"""
+    start, _, end = port_range.replace(":", "-").partition("-")
+    try:
+        first, last = int(start), int(end or start)
+    except ValueError:
+        return []
+    if count <= 1 or last <= first:
+        return [first]
+    step = (last - first) / (count - 1)
+    return sorted({first + round(step * i) for i in range(count)})
+
+
+def default_ports(firewall: Dict) -> List[int]:
+    """firewall 설정에서 노드 간 검사 포트 집합 구성"""
+    specs = [firewall.get("kubelet_port", 10250)]
+    specs += nodeport_samples(firewall.get("nodeport_range", "30000-32767"))
+    specs += list(CNI_PORTS)
+    specs += list(firewall.get("additional_ports") or [])
+    return parse_port_specs(specs)
+
+
+def list_nodes(kubeconfig: Optional[str] = None) -> Dict[str, str]:
+    """클러스터 노드 목록 (노드 이름 → InternalIP)
+
+    kubectl 이 없거나 실패하면 빈 dict 를 반환합니다.
+    """
+    logger = get_logger()
+    cmd = ["kubectl", "get", "nodes", "-o", "json"]
+    if kubeconfig:
+        cmd += ["--kubeconfig", kubeconfig]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        logger.warning(f"Failed to list nodes: {e}")
+        return {}
+    if result.returncode != 0:
+        logger.warning(f"Failed to list nodes: {result.stderr.strip()}")
+        return {}
+    return parse_nodes(json.loads(result.stdout or "{}"))
+
+
+def parse_nodes(data: Dict) -> Dict[str, str]:
+    """kubectl get nodes -o json 출력에서 노드 이름 → 주소 (InternalIP 우선)"""
+    nodes = {}
+    for item in data.get("items", []):
+        name = item.get("metadata", {}).get("name")
+        addresses = {a.get("type"): a.get("address")
+                     for a in item.get("status", {}).get("addresses", [])}
+        address = addresses.get("InternalIP") or addresses.get("ExternalIP") or addresses.get("Hostname")
+        if name and address:
+            nodes[name] = address
+    return nodes
+
+
+class PortMatrix:
+    """노드 × 포트 도달성 매트릭스"""
+
+    def __init__(self, nodes: Dict[str, str], ports: Sequence[int]):
+        """
+        Args:
+            nodes: 노드 이름 → 주소
+            ports: 검사 포트 목록
+        """
+        self.nodes = nodes
+        self.ports = list(ports)
+        self.cells: Dict[Tuple[str, int], Tuple[str, Optional[float]]] = {}
+        self.elapsed_ms = 0.0
+
+    def state(self, node: str, port: int) -> str:
+        return self.cells.get((node, port), (ERROR, None))[0]
+
+    def latency_ms(self, node: str, port: int) -> Optional[float]:
+        return self.cells.get((node, port), (ERROR, None))[1]
+
+    def unreachable(self) -> List[Tuple[str, int, str]]:
+        """열려 있지 않은 (노드, 포트, 상태) 목록"""
+        return [(node, port, self.state(node, port))
+                for node in self.nodes for port in self.ports
+                if self.state(node, port) != OPEN]
+
+    @property
+    def all_open(self) -> bool:
+        return not self.unreachable()
+
+    def to_dict(self) -> Dict:
+        return {
+            "ports": self.ports,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "nodes": {
+                node: {
+                    "address": address,
+                    "ports": {
+                        str(port): {
+                            "state": self.state(node, port),
+                            "latency_ms": (round(self.latency_ms(node, port), 3)
+                                           if self.latency_ms(node, port) is not None else None),
+                        }
+                        for port in self.ports
+                    },
+                }
+                for node, address in self.nodes.items()
+            },
+        }
+
+
+def scan(targets: Sequence[Target], timeout: float = 2.0,
+         concurrency: int = DEFAULT_CONCURRENCY) -> Dict[Target, Tuple[str, Optional[float]]]:
+    """(주소, 포트) 목록을 논블로킹 connect 로 동시에 검사
+
+    Args:
+        targets: (IP 주소, 포트) 목록
+        timeout: 연결별 타임아웃 (초)
+        concurrency: 동시에 진행할 최대 연결 수 (파일 디스크립터 한도 고려)
+
+    Returns:
+        Dict[Target, Tuple[str, Optional[float]]]: 대상별 (상태, 연결 지연시간 ms)
+    """
+    results: Dict[Target, Tuple[str, Optional[float]]] = {}
+    queue = deque(targets)
+    sel = selectors.DefaultSelector()
+    # 마감 시각 순서 = 시작 순서이므로 deque 앞쪽만 확인하면 됨
+    inflight: deque = deque()
+
+    def start(target: Target):
+        address, port = target
+        family = socket.AF_INET6 if ":" in address else socket.AF_INET
+        try:
+            sock = socket.socket(family, socket.SOCK_STREAM)
+        except OSError:
+            results[target] = (ERROR, None)
+            return
+        sock.setblocking(False)
+        now = time.monotonic()
+        err = sock.connect_ex((address, port))
+        if err == 0:
+            sock.close()
+            results[target] = (OPEN, 0.0)
+        elif err in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+            sel.register(sock, selectors.EVENT_WRITE, (target, now))
+            inflight.append((now + timeout, sock, target))
+        else:
+            sock.close()
+            results[target] = (_state_for(err), None)
+
+    try:
+        while queue or sel.get_map():
+            while queue and len(sel.get_map()) < concurrency:
+                start(queue.popleft())
+
+            now = time.monotonic()
+            while inflight and (inflight[0][2] in results or inflight[0][0] <= now):
+                deadline, sock, target = inflight.popleft()
+                if target not in results:
+                    sel.unregister(sock)
+                    sock.close()
+                    results[target] = (TIMEOUT, None)
+            if not inflight:
+                continue
+
+            for key, _ in sel.select(max(inflight[0][0] - now, 0)):
+                sock = key.fileobj
+                target, sent = key.data
+                finished = time.monotonic()
+                sel.unregister(sock)
+                err = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                sock.close()
+                if err:
+                    results[target] = (_state_for(err), None)
+                else:
+                    results[target] = (OPEN, (finished - sent) * 1000)
+    finally:
+        for key in list(sel.get_map().values()):
+            key.fileobj.close()
+        sel.close()
+    return results
+
+
+def _state_for(err: int) -> str:
+    if err == errno.ECONNREFUSED:
+        return CLOSED
+    if err in (errno.ETIMEDOUT,):
+        return TIMEOUT
+    get_logger().debug(f"connect error: {os.strerror(err)}")
+    return ERROR
+
+
+def build_matrix(nodes: Dict[str, str], ports: Sequence[int], timeout: float = 2.0,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 resolver: Optional[Resolver] = None) -> PortMatrix:
+    """모든 노드의 모든 포트를 스캔해 매트릭스 생성
+
+    Args:
+        nodes: 노드 이름 → 주소 (호스트 이름이면 리졸버로 조회, 첫 번째 주소 사용)
+        ports: 검사 포트 목록
+        timeout: 연결별 타임아웃 (초)
+        concurrency: 최대 동시 연결 수
+        resolver: 사용할 리졸버 (기본값: 공유 리졸버)
+    """
+    matrix = PortMatrix(nodes, ports)
+    resolver = resolver or get_resolver()
+    started = time.monotonic()
+
+    addresses: Dict[str, str] = {}
+    for node, host in nodes.items():
+        try:
+            addresses[node] = resolver.resolve(host)[0]
+        except (socket.gaierror, IndexError):
+            for port in matrix.ports:
+                matrix.cells[(node, port)] = (ERROR, None)
+
+    targets = list(dict.fromkeys((address, port) for address in addresses.values()
+                                 for port in matrix.ports))
+    scanned = scan(targets, timeout=timeout, concurrency=concurrency)
+    for node, address in addresses.items():
+        for port in matrix.ports:
+            matrix.cells[(node, port)] = scanned.get((address, port), (ERROR, None))
+
+    matrix.elapsed_ms = (time.monotonic() - started) * 1000
+    get_logger().info(
+        f"Port matrix: {len(nodes)} nodes x {len(matrix.ports)} ports in {matrix.elapsed_ms:.0f}ms, "
+        f"{len(matrix.unreachable())} unreachable"
+    )
+    return matrix
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - asyncio 프로브 엔진
+
+이 모듈은 다음 기능을 제공합니다:
+- TCP connect(Happy Eyeballs) / DNS 조회(resolver 캐시 사용) / ICMP 프로브
+- 여러 프로브의 동시 실행 (프로브별 타임아웃 + 전체 타임아웃)
+
+연결이 끊긴 환경에서 프로브를 순차 실행하면 타임아웃이 누적되므로,
+NetworkChecker.comprehensive_check 는 이 엔진으로 모든 프로브를 동시에 실행합니다.
+"""
+
+import asyncio
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from . import icmp
+from .happy_eyeballs import race_connect
+from .logger import get_logger
+from .resolver import get_resolver
+from .results import PingProbeResult, ProbeResult
+
+
+ProbeFactory = Callable[[], Awaitable[ProbeResult]]
+
+
+class ProbeEngine:
+    """asyncio 기반 동시 프로브 실행기"""
+
+    def __init__(self, probe_timeout: float = 5.0, overall_timeout: float = 10.0):
+        """
+        Args:
+            probe_timeout: 프로브별 타임아웃 (초)
+            overall_timeout: 전체 프로브 실행 타임아웃 (초)
+        """
+        self.probe_timeout = probe_timeout
+        self.overall_timeout = overall_timeout
+        self.logger = get_logger()
+
+    async def tcp_connect(self, host: str, port: int) -> ProbeResult:
+        """TCP 포트 연결 프로브 (A/AAAA Happy Eyeballs 경쟁, 승리한 패밀리 보고)"""
+        result = await self._in_thread(race_connect, host, port, self.probe_timeout)
+        if result.success:
+            self.logger.debug(f"✓ {host}:{port} connect {result.latency_ms:.1f}ms via {result.family}")
+            return ProbeResult(True, "✓ {}:{} 연결 성공 ({}, {:.1f}ms)",
+                               host, port, result.family, result.latency_ms)
+        if result.error == "호스트를 찾을 수 없습니다":
+            return ProbeResult(False, "✗ {} 호스트를 찾을 수 없습니다", host)
+        self.logger.debug(f"✗ {host}:{port} connect failed: {result.error}")
+        return ProbeResult(False, "✗ {}:{} 연결 실패", host, port)
+
+    async def resolve(self, domain: str) -> ProbeResult:
+        """DNS 조회 프로브"""
+        try:
+            await get_resolver().aresolve(domain)
+        except socket.gaierror:
+            return ProbeResult(False, "✗ DNS 조회 실패 ({})", domain)
+        except OSError as e:
+            return ProbeResult(False, "✗ DNS 테스트 오류: {}", str(e))
+        return ProbeResult(True, "✓ DNS 조회 성공 ({})", domain)
+
+    def _ping_wait(self, count: int, interval: float) -> float:
+        # 마지막 패킷 전송 후 남은 시간만큼만 응답을 기다려 프로브 타임아웃 안에 끝낸다
+        return max(self.probe_timeout - (count - 1) * interval - 0.1, 0.2)
+
+    @staticmethod
+    def _ping_result(host: str, result: icmp.PingResult) -> PingProbeResult:
+        link = result.stats()
+        if result.success:
+            return PingProbeResult(True, "✓ {} 응답 성공 ({:.1f}ms, 손실 {:.0f}%, 품질 {:.0f})",
+                                   host, result.avg_ms, link.loss_pct, link.score, link=link)
+        return PingProbeResult(False, "✗ {} 응답 실패", host, link=link)
+
+    async def _in_thread(self, func: Callable, *args):
+        """블로킹 함수를 루프의 기본 실행기에서 실행"""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+    async def ping(self, host: str, count: int = 3, interval: float = 0.2) -> PingProbeResult:
+        """ICMP 에코 프로브"""
+        result = await self._in_thread(icmp.ping, host, count, interval,
+                                       self._ping_wait(count, interval))
+        return self._ping_result(host, result)
+
+    def ping_group(self, hosts: Dict[str, str], count: int = 3,
+                   interval: float = 0.2) -> Dict[str, ProbeFactory]:
+        """여러 호스트를 한 번의 icmp.ping_hosts 호출(소켓 하나)로 핑하는 프로브 팩토리
+
+        Args:
+            hosts: 프로브 이름 → 호스트
+
+        Returns:
+            Dict[str, ProbeFactory]: 프로브 이름별 팩토리 (gather/run 에 그대로 전달)
+        """
+        shared: Dict[str, asyncio.Future] = {}
+
+        def batch() -> asyncio.Future:
+            if "future" not in shared:
+                shared["future"] = asyncio.ensure_future(self._in_thread(
+                    icmp.ping_hosts, list(hosts.values()), count, interval,
+                    self._ping_wait(count, interval),
+                ))
+            return shared["future"]
+
+        def factory(host: str) -> ProbeFactory:
+            async def probe() -> ProbeResult:
+                # 한 프로브의 타임아웃이 공유 배치를 취소하지 않도록 shield
+                results = await asyncio.shield(batch())
+                return self._ping_result(host, results[host])
+            return probe
+
+        return {name: factory(host) for name, host in hosts.items()}
+
+    async def call(self, func: Callable[..., Tuple[bool, str]], *args) -> ProbeResult:
+        """(성공 여부, 메시지)를 반환하는 블로킹 체크 함수를 스레드에서 실행"""
+        success, msg = await self._in_thread(func, *args)
+        return ProbeResult(success, msg)
+
+    async def call_result(self, func: Callable[..., ProbeResult], *args) -> ProbeResult:
+        """ProbeResult 를 반환하는 블로킹 프로브 함수를 스레드에서 실행"""
+        return await self._in_thread(func, *args)
+
+    async def _guard(self, name: str, factory: ProbeFactory,
+                     timeout: Optional[float]) -> ProbeResult:
+        try:
+            return await asyncio.wait_for(factory(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"Probe timeout: {name}")
+            return ProbeResult(False, "✗ {} 타임아웃", name)
+        except Exception as e:
+            self.logger.error(f"Probe error ({name}): {str(e)}")
+            return ProbeResult(False, "✗ {} 오류: {}", name, str(e))
+
+    async def gather(self, probes: Dict[str, ProbeFactory],
+                     timeouts: Optional[Dict[str, float]] = None) -> Dict[str, ProbeResult]:
+        """프로브를 동시에 실행하고 이름별 결과 반환
+
+        전체 타임아웃 내에 끝나지 않은 프로브는 취소되고 타임아웃 결과로 채워집니다.
+        """
+        timeouts = timeouts or {}
+        tasks = {
+            name: asyncio.create_task(
+                self._guard(name, factory, timeouts.get(name, self.probe_timeout))
+            )
+            for name, factory in probes.items()
+        }
+        if not tasks:
+            return {}
+
+        _, pending = await asyncio.wait(tasks.values(), timeout=self.overall_timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        results = {}
+        for name, task in tasks.items():
+            if task in pending:
+                self.logger.warning(f"Probe cancelled by overall timeout: {name}")
+                results[name] = ProbeResult(False, "✗ {} 타임아웃", name)
+            else:
+                results[name] = task.result()
+        return results
+
+    def run(self, probes: Dict[str, ProbeFactory],
+            timeouts: Optional[Dict[str, float]] = None) -> Dict[str, ProbeResult]:
+        """동기 코드에서 프로브 실행 (이벤트 루프가 없는 스레드에서 호출)
+
+        블로킹 프로브(getaddrinfo, 스레드 실행 체크)는 전용 실행기에서 돌고,
+        타임아웃된 스레드는 기다리지 않으므로 반환 시간은 overall_timeout 을 넘지 않습니다.
+        (asyncio.run 은 종료 시 기본 실행기의 스레드가 끝날 때까지 대기합니다.)
+        """
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=max(len(probes), 4), thread_name_prefix="probe")
+        loop.set_default_executor(executor)
+        try:
+            return loop.run_until_complete(self.gather(probes, timeouts))
+        finally:
+            # 공유 핑 배치 등 남은 태스크 정리 (실행기 스레드 완료는 기다리지 않음)
+            leftover = asyncio.all_tasks(loop)
+            for task in leftover:
+                task.cancel()
+            if leftover:
+                loop.run_until_complete(asyncio.gather(*leftover, return_exceptions=True))
+            _shutdown_nowait(executor)
+            try:
+                loop.run_until_complete(loop.shutdown_asyncgens())
+            finally:
+                loop.close()
+
+
+def _shutdown_nowait(executor: ThreadPoolExecutor):
+    """대기 중인 작업은 취소하고 실행 중인 스레드는 기다리지 않고 실행기 종료"""
+    try:
+        executor.shutdown(wait=False, cancel_futures=True)
+    except TypeError:
+        # Python 3.8 에는 cancel_futures 가 없음
+        executor.shutdown(wait=False)
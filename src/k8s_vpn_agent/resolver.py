@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 캐싱 DNS 리졸버 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- /etc/hosts 조회 후 /etc/resolv.conf 네임서버로 직접 A/AAAA 질의 (응답 TTL 사용)
+- 응답 TTL 동안 결과 캐시, 실패(NXDOMAIN 등)는 짧은 시간 동안 음성 캐시
+- 같은 이름에 대한 동시 조회를 하나의 질의로 합침 (스레드/asyncio 공통)
+- 직접 질의가 불가능하면 getaddrinfo 로 대체 (기본 TTL 적용)
+- requests/urllib3 연결이 이 리졸버를 쓰도록 하는 어댑터
+"""
+
+import asyncio
+import ipaddress
+import os
+import random
+import select
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from .logger import get_logger
+
+
+RESOLV_CONF = "/etc/resolv.conf"
+HOSTS_FILE = "/etc/hosts"
+
+QTYPE_A = 1
+QTYPE_AAAA = 28
+RCODE_NXDOMAIN = 3
+
+Nameserver = Union[str, Tuple[str, int]]
+
+
+class _DNSError(Exception):
+    """직접 질의 실패 (getaddrinfo 대체 대상)"""
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.split("%")[0])
+        return True
+    except ValueError:
+        return False
+
+
+def _family_of(address: str) -> int:
+    return socket.AF_INET6 if ":" in address else socket.AF_INET
+
+
+def _build_query(qid: int, name: str, qtype: int) -> bytes:
+    header = struct.pack("!HHHHHH", qid, 0x0100, 1, 0, 0, 0)
+    labels = b"".join(
+        bytes([len(label)]) + label for label in name.rstrip(".").encode("idna").split(b".") if label
+    )
+    return header + labels + b"\x00" + struct.pack("!HH", qtype, 1)
+
+
+def _skip_name(data: bytes, offset: int) -> int:
+    while True:
+        length = data[offset]
+        if length & 0xC0 == 0xC0:
+            return offset + 2
+        offset += 1
+        if length == 0:
+            return offset
+        offset += length
+
+
+def _parse_response(data: bytes) -> Tuple[int, int, bool, List[Tuple[str, int]]]:
+    """DNS 응답 파싱
+
+    Returns:
+        Tuple: (질의 ID, RCODE, TC 플래그, [(주소, TTL)])
+    """
+    qid, flags, qdcount, ancount, _, _ = struct.unpack("!HHHHHH", data[:12])
+    offset = 12
+    for _ in range(qdcount):
+        offset = _skip_name(data, offset) + 4
+
+    answers = []
+    for _ in range(ancount):
+        offset = _skip_name(data, offset)
+        rtype, _, ttl, rdlength = struct.unpack("!HHIH", data[offset:offset + 10])
+        offset += 10
+        rdata = data[offset:offset + rdlength]
+        offset += rdlength
+        if rtype == QTYPE_A and rdlength == 4:
+            answers.append((socket.inet_ntop(socket.AF_INET, rdata), ttl))
+        elif rtype == QTYPE_AAAA and rdlength == 16:
+            answers.append((socket.inet_ntop(socket.AF_INET6, rdata), ttl))
+    return qid, flags & 0x000F, bool(flags & 0x0200), answers
+
+
+def _read_resolv_conf(path: str = RESOLV_CONF) -> Tuple[List[str], List[str], int, float]:
+    """resolv.conf 에서 (네임서버, search 도메인, ndots, timeout) 읽기"""
+    nameservers: List[str] = []
+    search: List[str] = []
+    ndots, timeout = 1, 2.0
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                fields = line.split("#", 1)[0].split()
+                if not fields:
+                    continue
+                if fields[0] == "nameserver" and len(fields) > 1:
+                    nameservers.append(fields[1])
+                elif fields[0] in ("search", "domain"):
+                    search = fields[1:]
+                elif fields[0] == "options":
+                    for option in fields[1:]:
+                        key, _, value = option.partition(":")
+                        if key == "ndots" and value.isdigit():
+                            ndots = int(value)
+                        elif key == "timeout" and value.isdigit():
+                            timeout = float(value)
+    except OSError:
+        pass
+    return nameservers, search, ndots, timeout
+
+
+class _HostsFile:
+    """/etc/hosts 조회 (파일 변경 시 다시 읽음)"""
+
+    def __init__(self, path: str = HOSTS_FILE):
+        self.path = path
+        self._mtime: Optional[float] = None
+        self._entries: Dict[str, List[str]] = {}
+
+    def lookup(self, name: str) -> List[str]:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            return []
+        if mtime != self._mtime:
+            entries: Dict[str, List[str]] = {}
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        fields = line.split("#", 1)[0].split()
+                        if len(fields) < 2 or not _is_ip(fields[0]):
+                            continue
+                        for alias in fields[1:]:
+                            entries.setdefault(alias.lower(), []).append(fields[0])
+            except OSError:
+                return []
+            self._entries, self._mtime = entries, mtime
+        return list(self._entries.get(name.lower().rstrip("."), []))
+
+
+class Resolver:
+    """TTL 캐시 + 음성 캐시 + 동시 조회 병합 리졸버"""
+
+    def __init__(self, nameservers: Optional[Sequence[Nameserver]] = None,
+                 timeout: Optional[float] = None, min_ttl: float = 1.0, max_ttl: float = 300.0,
+                 negative_ttl: float = 5.0, fallback_ttl: float = 30.0,
+                 resolv_conf: str = RESOLV_CONF, hosts_file: str = HOSTS_FILE):
+        """
+        Args:
+            nameservers: 네임서버 목록 ("IP" 또는 (IP, 포트)). None 이면 resolv.conf 사용
+            timeout: 네임서버별 질의 타임아웃 (초). None 이면 resolv.conf 값
+            min_ttl: 캐시 최소 유지 시간 (초)
+            max_ttl: 캐시 최대 유지 시간 (초)
+            negative_ttl: 조회 실패 결과 캐시 시간 (초)
+            fallback_ttl: getaddrinfo 로 대체 조회한 결과의 캐시 시간 (TTL 정보 없음)
+            resolv_conf: resolv.conf 경로
+            hosts_file: hosts 파일 경로
+        """
+        conf_servers, self.search, self.ndots, conf_timeout = _read_resolv_conf(resolv_conf)
+        servers = nameservers if nameservers is not None else conf_servers
+        self.nameservers: List[Tuple[str, int]] = [
+            server if isinstance(server, tuple) else (server, 53) for server in servers
+        ]
+        self.timeout = timeout if timeout is not None else conf_timeout
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.fallback_ttl = fallback_ttl
+        self.hosts = _HostsFile(hosts_file)
+        self.logger = get_logger()
+        # 이름 → (만료 시각, 주소 목록 또는 None(음성 캐시))
+        self._cache: Dict[str, Tuple[float, Optional[List[str]]]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    def resolve(self, host: str, family: int = socket.AF_UNSPEC) -> List[str]:
+        """호스트 이름을 주소 목록으로 변환 (IPv4 우선 순서)
+
+        Raises:
+            socket.gaierror: 조회 실패 (음성 캐시 포함)
+        """
+        return self._select(host, self._lookup(host).result(), family)
+
+    async def aresolve(self, host: str, family: int = socket.AF_UNSPEC) -> List[str]:
+        """resolve 의 asyncio 버전 (이벤트 루프를 막지 않음)"""
+        future = self._lookup(host, in_thread=True)
+        # 한 호출자의 취소(프로브 타임아웃)가 공유 조회를 취소하지 않도록 shield
+        return self._select(host, await asyncio.shield(asyncio.wrap_future(future)), family)
+
+    def invalidate(self, host: Optional[str] = None):
+        """캐시 삭제 (host 가 None 이면 전체)"""
+        with self._lock:
+            if host is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(host.lower().rstrip("."), None)
+
+    @staticmethod
+    def _select(host: str, addresses: Optional[List[str]], family: int) -> List[str]:
+        if addresses and family != socket.AF_UNSPEC:
+            addresses = [a for a in addresses if _family_of(a) == family]
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, f"Name or service not known: {host}")
+        return addresses
+
+    def _lookup(self, host: str, in_thread: bool = False) -> Future:
+        """캐시 또는 진행 중인 조회의 Future 반환 (없으면 조회 시작)"""
+        if _is_ip(host):
+            return _done([host])
+        key = host.lower().rstrip(".")
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > now:
+                return _done(cached[1])
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            future = self._inflight[key] = Future()
+
+        if in_thread:
+            threading.Thread(target=self._run, args=(key, future), name="resolver", daemon=True).start()
+        else:
+            self._run(key, future)
+        return future
+
+    def _run(self, key: str, future: Future):
+        try:
+            addresses, ttl = self._query(key)
+        except Exception as e:
+            self.logger.debug(f"DNS 조회 오류: {key} - {e}")
+            addresses, ttl = None, self.negative_ttl
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, addresses)
+            self._inflight.pop(key, None)
+        if not future.cancelled():
+            future.set_result(addresses)
+
+    def _query(self, name: str) -> Tuple[Optional[List[str]], float]:
+        """(주소 목록 또는 None, 캐시 시간) 반환"""
+        hosts = self.hosts.lookup(name)
+        if hosts:
+            return _ipv4_first(hosts), self.fallback_ttl
+
+        if self.nameservers:
+            for candidate in self._candidates(name):
+                try:
+                    answers = self._query_dns(candidate)
+                except _DNSError as e:
+                    self.logger.debug(f"DNS 직접 질의 실패, getaddrinfo 로 대체: {name} - {e}")
+                    break
+                if answers:
+                    ttl = min(ttl for _, ttl in answers)
+                    ttl = max(self.min_ttl, min(self.max_ttl, ttl))
+                    return _ipv4_first(list(dict.fromkeys(a for a, _ in answers))), ttl
+
+        # NXDOMAIN 이어도 nsswitch 의 다른 소스(myhostname, mdns 등)를 위해 한 번 더 확인
+        return self._getaddrinfo(name)
+
+    def _candidates(self, name: str) -> List[str]:
+        if name.count(".") >= self.ndots or not self.search:
+            return [name] + [f"{name}.{domain}" for domain in self.search if "." not in name]
+        return [f"{name}.{domain}" for domain in self.search] + [name]
+
+    def _getaddrinfo(self, name: str) -> Tuple[Optional[List[str]], float]:
+        try:
+            infos = socket.getaddrinfo(name, None, type=socket.SOCK_STREAM)
+        except (socket.gaierror, UnicodeError):
+            return None, self.negative_ttl
+        return _ipv4_first(list(dict.fromkeys(info[4][0] for info in infos))), self.fallback_ttl
+
+    def _query_dns(self, name: str) -> List[Tuple[str, int]]:
+        """네임서버에 A/AAAA 를 동시에 질의
+
+        Returns:
+            List[Tuple[str, int]]: (주소, TTL) 목록. NXDOMAIN/응답 없음은 빈 목록
+
+        Raises:
+            _DNSError: 모든 네임서버 질의 실패 또는 잘린(TC) 응답
+        """
+        last_error = "네임서버 없음"
+        for server in self.nameservers:
+            family = _family_of(server[0])
+            self.queries += 1
+            try:
+                with socket.socket(family, socket.SOCK_DGRAM) as sock:
+                    sock.connect(server)
+                    pending = {}
+                    for qtype in (QTYPE_A, QTYPE_AAAA):
+                        qid = random.getrandbits(16)
+                        pending[qid] = qtype
+                        sock.send(_build_query(qid, name, qtype))
+
+                    answers: List[Tuple[str, int]] = []
+                    deadline = time.monotonic() + self.timeout
+                    while pending:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0 or not select.select([sock], [], [], remaining)[0]:
+                            raise _DNSError("응답 시간 초과")
+                        qid, rcode, truncated, records = _parse_response(sock.recv(4096))
+                        if qid not in pending:
+                            continue
+                        if truncated:
+                            raise _DNSError("잘린 응답 (TCP 필요)")
+                        if rcode not in (0, RCODE_NXDOMAIN):
+                            raise _DNSError(f"RCODE {rcode}")
+                        del pending[qid]
+                        answers.extend(records)
+                    return answers
+            except (OSError, struct.error, IndexError, _DNSError) as e:
+                last_error = f"{server[0]}:{server[1]} - {e}"
+        raise _DNSError(last_error)
+
+
+def _ipv4_first(addresses: List[str]) -> List[str]:
+    return sorted(addresses, key=lambda a: _family_of(a) != socket.AF_INET)
+
+
+def _done(value) -> Future:
+    future: Future = Future()
+    future.set_result(value)
+    return future
+
+
+_resolver: Optional[Resolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver() -> Resolver:
+    """프로세스 전체에서 공유하는 리졸버"""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = Resolver()
+        return _resolver
+
+
+class _ResolvingConnectionMixin:
+    """urllib3 연결이 DNS 조회에 공유 리졸버를 사용하도록 함
+
+    TLS SNI/인증서 검증에는 원래 호스트 이름(self.host)이 그대로 사용됩니다.
+    """
+
+    def _new_conn(self):
+        original = self._dns_host
+        self._dns_host = get_resolver().resolve(original)[0]
+        try:
+            return super()._new_conn()
+        finally:
+            self._dns_host = original
+
+
+class ResolvingHTTPConnection(_ResolvingConnectionMixin, HTTPConnection):
+    pass
+
+
+class ResolvingHTTPSConnection(_ResolvingConnectionMixin, HTTPSConnection):
+    pass
+
+
+class ResolvingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = ResolvingHTTPConnection
+
+
+class ResolvingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = ResolvingHTTPSConnection
+
+
+class ResolvingHTTPAdapter(HTTPAdapter):
+    """공유 리졸버로 DNS 를 조회하는 requests 어댑터"""
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": ResolvingHTTPConnectionPool,
+            "https": ResolvingHTTPSConnectionPool,
+        }
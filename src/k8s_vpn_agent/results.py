@@ -0,0 +1,393 @@
+"""
+체크 결과 레코드 모듈
+__slots__ 기반 경량 결과 타입, 인터닝된 상태 값, 지연 메시지 포맷팅 및
+기존 JSON 형식으로의 직렬화 제공
+"""
+
+import sys
+from enum import Enum
+from typing import Any, Dict, Optional, Tuple, Union
+
+
+class CheckStatus(str, Enum):
+    """헬스체크 공통 상태 값
+
+    str 을 상속하므로 기존 코드의 문자열 비교와 json 직렬화가 그대로 동작한다.
+    """
+    HEALTHY = "healthy"
+    UNHEALTHY = "unhealthy"
+    DEGRADED = "degraded"
+    NOT_CONFIGURED = "not_configured"
+    NOT_INSTALLED = "not_installed"
+    NO_CONFIG = "no_config"
+    ERROR = "error"
+    TIMEOUT = "timeout"
+    ACTIVE = "active"
+    INACTIVE = "inactive"
+    RUNNING = "Running"
+    READY = "Ready"
+    NOT_READY = "NotReady"
+    NOT_FOUND = "not_found"
+    KUBECTL_ERROR = "kubectl_error"
+    KUBECTL_NOT_FOUND = "kubectl_not_found"
+    JSON_ERROR = "json_error"
+    SUCCESS = "success"
+    FAILED = "failed"
+    ACCESSIBLE = "accessible"
+    NOT_ACCESSIBLE = "not_accessible"
+
+    def __str__(self) -> str:
+        return self.value
+
+
+_STATUS_BY_VALUE = {member.value: member for member in CheckStatus}
+
+
+def intern_status(value: Union[str, CheckStatus]) -> Union[str, CheckStatus]:
+    """상태 문자열을 공유 객체로 변환
+
+    알려진 값은 CheckStatus 멤버로, 그 외(예: Tailscale BackendState)는
+    sys.intern 으로 인터닝하여 보관된 결과들이 같은 문자열 객체를 공유하게 한다.
+    """
+    if isinstance(value, CheckStatus):
+        return value
+    member = _STATUS_BY_VALUE.get(value)
+    if member is not None:
+        return member
+    return sys.intern(str(value))
+
+
+class _Record:
+    """슬롯 레코드 공통 기반
+
+    기존 dict 기반 호출부(`result["healthy"]`, `result.get("status")`)와의
+    호환을 위해 읽기 전용 매핑 접근을 지원한다.
+    """
+
+    __slots__ = ()
+
+    # 직렬화 순서대로 나열한 필드 이름
+    _fields: Tuple[str, ...] = ()
+    # 값이 None 이면 직렬화에서 생략되는 필드
+    _optional: Tuple[str, ...] = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """기존 JSON 형식의 딕셔너리로 변환"""
+        data = {}
+        for name in self._fields:
+            value = getattr(self, name)
+            if value is None and name in self._optional:
+                continue
+            if isinstance(value, _Record):
+                value = value.to_dict()
+            data[name] = value
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None and key in self._optional:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self._fields)
+
+    __hash__ = None
+
+
+class _LazyMessage(_Record):
+    """메시지 템플릿과 인자를 보관하고 접근 시점에 포맷팅하는 레코드 기반"""
+
+    __slots__ = ("_msg",)
+
+    def _set_message(self, message: str, args: tuple):
+        self._msg = (message, args) if args else message
+
+    @property
+    def message(self) -> str:
+        msg = self._msg
+        if isinstance(msg, tuple):
+            template, args = msg
+            msg = template.format(*args)
+            self._msg = msg
+        return msg
+
+
+class CheckResult(_LazyMessage):
+    """헬스체크 단일 항목 결과"""
+
+    __slots__ = ("healthy", "status")
+    _fields = ("healthy", "status", "message")
+
+    def __init__(self, healthy: bool, status: Union[str, CheckStatus], message: str, *args):
+        self.healthy = bool(healthy)
+        self.status = intern_status(status)
+        self._set_message(message, args)
+
+
+class VPNCheckResult(CheckResult):
+    """VPN 체크 결과"""
+
+    __slots__ = ("peers", "path")
+    _fields = ("healthy", "status", "peers", "path", "message")
+    _optional = ("peers", "path")
+
+    def __init__(self, healthy: bool, status: Union[str, CheckStatus], message: str, *args,
+                 peers: Optional[int] = None, path: Optional["PeerPathResult"] = None):
+        super().__init__(healthy, status, message, *args)
+        self.peers = peers
+        self.path = path
+
+
+class PeerPathResult(_Record):
+    """VPN 피어까지의 경로 (direct: 직접 UDP, relay: DERP 릴레이 경유, 지연시간 ms)"""
+
+    __slots__ = ("ip", "mode", "via", "latency_ms", "relay_ms", "direct_ms", "error")
+    _fields = ("ip", "mode", "via", "latency_ms", "relay_ms", "direct_ms", "error")
+    _optional = ("via", "latency_ms", "relay_ms", "direct_ms", "error")
+
+    def __init__(self, ip: str, mode: str, via: Optional[str] = None,
+                 latency_ms: Optional[float] = None, relay_ms: Optional[float] = None,
+                 direct_ms: Optional[float] = None, error: Optional[str] = None):
+        self.ip = ip
+        self.mode = mode
+        self.via = via
+        self.latency_ms = latency_ms
+        self.relay_ms = relay_ms
+        self.direct_ms = direct_ms
+        self.error = error
+
+
+class LinkStats(_Record):
+    """패킷 트레인 기반 링크 통계와 품질 점수 (0~100)"""
+
+    __slots__ = ("host", "sent", "received", "loss_pct", "min_ms", "avg_ms", "max_ms",
+                 "mdev_ms", "jitter_ms", "score")
+    _fields = ("host", "sent", "received", "loss_pct", "min_ms", "avg_ms", "max_ms",
+               "mdev_ms", "jitter_ms", "score")
+    _optional = ("min_ms", "avg_ms", "max_ms", "mdev_ms", "jitter_ms")
+
+    def __init__(self, host: str, sent: int, received: int, loss_pct: float,
+                 min_ms: Optional[float] = None, avg_ms: Optional[float] = None,
+                 max_ms: Optional[float] = None, mdev_ms: Optional[float] = None,
+                 jitter_ms: Optional[float] = None, score: float = 0.0):
+        self.host = host
+        self.sent = sent
+        self.received = received
+        self.loss_pct = loss_pct
+        self.min_ms = min_ms
+        self.avg_ms = avg_ms
+        self.max_ms = max_ms
+        self.mdev_ms = mdev_ms
+        self.jitter_ms = jitter_ms
+        self.score = score
+
+
+class NetworkCheckResult(CheckResult):
+    """마스터 노드 네트워크 체크 결과"""
+
+    __slots__ = ("master_ip", "ping", "api_server", "latency_ms", "baseline_ms", "link", "livez",
+                 "http", "path")
+    _fields = ("healthy", "status", "master_ip", "ping", "api_server", "latency_ms", "baseline_ms",
+               "link", "livez", "http", "path", "message")
+    _optional = ("status", "master_ip", "ping", "api_server", "latency_ms", "baseline_ms", "link",
+                 "livez", "http", "path")
+
+    def __init__(self, healthy: bool, status: Optional[Union[str, CheckStatus]], message: str, *args,
+                 master_ip: Optional[str] = None, ping: Optional[CheckStatus] = None,
+                 api_server: Optional[CheckStatus] = None, latency_ms: Optional[float] = None,
+                 baseline_ms: Optional[float] = None, link: Optional[LinkStats] = None,
+                 livez: Optional["APIProbeResult"] = None, http: Optional["HTTPProbeResult"] = None,
+                 path: Optional[Dict] = None):
+        self.healthy = bool(healthy)
+        self.status = intern_status(status) if status is not None else None
+        self._set_message(message, args)
+        self.master_ip = master_ip
+        self.ping = ping
+        self.api_server = api_server
+        self.latency_ms = latency_ms
+        self.baseline_ms = baseline_ms
+        self.link = link
+        self.livez = livez
+        self.http = http
+        self.path = path
+
+
+class ServiceCheckResult(CheckResult):
+    """systemd 서비스 체크 결과 (kubelet, crio)"""
+
+    __slots__ = ("version",)
+    _fields = ("healthy", "status", "version", "message")
+    _optional = ("version",)
+
+    def __init__(self, healthy: bool, status: Union[str, CheckStatus], message: str, *args,
+                 version: Optional[str] = None):
+        super().__init__(healthy, status, message, *args)
+        self.version = version
+
+
+class NodeCheckResult(CheckResult):
+    """Kubernetes 노드 Ready 체크 결과"""
+
+    __slots__ = ("hostname", "node_info")
+    _fields = ("healthy", "status", "hostname", "node_info", "message")
+    _optional = ("hostname", "node_info")
+
+    def __init__(self, healthy: bool, status: Union[str, CheckStatus], message: str, *args,
+                 hostname: Optional[str] = None, node_info: Optional[Dict] = None):
+        super().__init__(healthy, status, message, *args)
+        self.hostname = hostname
+        self.node_info = node_info
+
+
+class DiskCheckResult(CheckResult):
+    """디스크 압박 예측 결과"""
+
+    __slots__ = ("filesystems",)
+    _fields = ("healthy", "status", "filesystems", "message")
+    _optional = ("filesystems",)
+
+    def __init__(self, healthy: bool, status: Union[str, CheckStatus], message: str, *args,
+                 filesystems: Optional[list] = None):
+        super().__init__(healthy, status, message, *args)
+        self.filesystems = filesystems
+
+
+class ProbeResult(_LazyMessage):
+    """NetworkChecker 개별 프로브 결과"""
+
+    __slots__ = ("success",)
+    _fields = ("success", "message")
+
+    def __init__(self, success: bool, message: str, *args):
+        self.success = bool(success)
+        self._set_message(message, args)
+
+
+class PingProbeResult(ProbeResult):
+    """ICMP 프로브 결과 (링크 통계 포함)"""
+
+    __slots__ = ("link",)
+    _fields = ("success", "link", "message")
+
+    def __init__(self, success: bool, message: str, *args, link: Optional[LinkStats] = None):
+        super().__init__(success, message, *args)
+        self.link = link
+
+
+class HTTPProbeResult(ProbeResult):
+    """HTTP 프로브 결과 (연결 재사용 여부 포함)"""
+
+    __slots__ = ("url", "status_code", "reused", "elapsed_ms")
+    _fields = ("success", "url", "status_code", "reused", "elapsed_ms", "message")
+    _optional = ("status_code", "reused", "elapsed_ms")
+
+    def __init__(self, success: bool, message: str, *args, url: str = "",
+                 status_code: Optional[int] = None, reused: Optional[bool] = None,
+                 elapsed_ms: Optional[float] = None):
+        super().__init__(success, message, *args)
+        self.url = url
+        self.status_code = status_code
+        self.reused = reused
+        self.elapsed_ms = elapsed_ms
+
+
+class APIProbeResult(HTTPProbeResult):
+    """API 서버 헬스 프로브 결과 (단계별 시간, ms)
+
+    재사용한 연결이면 resolve/connect/tls 는 0 입니다.
+    """
+
+    __slots__ = ("resolve_ms", "connect_ms", "tls_ms", "ttfb_ms")
+    _fields = ("success", "url", "status_code", "reused", "resolve_ms", "connect_ms", "tls_ms",
+               "ttfb_ms", "elapsed_ms", "message")
+    _optional = ("status_code", "reused", "resolve_ms", "connect_ms", "tls_ms", "ttfb_ms",
+                 "elapsed_ms")
+
+    def __init__(self, success: bool, message: str, *args, url: str = "",
+                 status_code: Optional[int] = None, reused: Optional[bool] = None,
+                 elapsed_ms: Optional[float] = None, resolve_ms: Optional[float] = None,
+                 connect_ms: Optional[float] = None, tls_ms: Optional[float] = None,
+                 ttfb_ms: Optional[float] = None):
+        super().__init__(success, message, *args, url=url, status_code=status_code,
+                         reused=reused, elapsed_ms=elapsed_ms)
+        self.resolve_ms = resolve_ms
+        self.connect_ms = connect_ms
+        self.tls_ms = tls_ms
+        self.ttfb_ms = ttfb_ms
+
+
+class EndpointProbeResult(ProbeResult):
+    """제어 평면 엔드포인트 프로브 결과 (TCP 연결 + /readyz 지연시간, ms)"""
+
+    __slots__ = ("endpoint", "host", "port", "connect_ms", "readyz_ms")
+    _fields = ("success", "endpoint", "connect_ms", "readyz_ms", "message")
+    _optional = ("connect_ms", "readyz_ms")
+
+    def __init__(self, success: bool, message: str, *args, endpoint: str = "", host: str = "",
+                 port: int = 6443, connect_ms: Optional[float] = None,
+                 readyz_ms: Optional[float] = None):
+        super().__init__(success, message, *args)
+        self.endpoint = endpoint
+        self.host = host
+        self.port = port
+        self.connect_ms = connect_ms
+        self.readyz_ms = readyz_ms
+
+    @property
+    def latency_ms(self) -> Optional[float]:
+        """순위 결정용 지연시간 (네트워크 연결 + API 서버 응답)"""
+        if self.connect_ms is None:
+            return None
+        return self.connect_ms + (self.readyz_ms or 0.0)
+
+
+class HealthReport(_Record):
+    """HealthChecker.check_all 결과 리포트"""
+
+    __slots__ = ("timestamp", "checks", "overall_status", "failed_checks")
+    _fields = ("timestamp", "checks", "overall_status", "failed_checks")
+    _optional = ("failed_checks",)
+
+    def __init__(self, timestamp: str, checks: Dict[str, CheckResult],
+                 overall_status: Union[str, CheckStatus] = CheckStatus.HEALTHY,
+                 failed_checks: Optional[list] = None):
+        self.timestamp = timestamp
+        self.checks = checks
+        self.overall_status = intern_status(overall_status)
+        self.failed_checks = failed_checks or None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = super().to_dict()
+        data["checks"] = {name: to_jsonable(result) for name, result in self.checks.items()}
+        return data
+
+
+def to_jsonable(value: Any) -> Any:
+    """결과 레코드를 json 직렬화 가능한 값으로 변환 (json.dump 의 default 로도 사용)"""
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: to_jsonable(item) for key, item in value.items()}
+    return value
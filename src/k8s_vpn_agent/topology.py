@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 네트워크 토폴로지 게시 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- 마스터와 모든 VPN 피어까지의 RTT 를 주기적으로 동시 측정 (ICMP 소켓 하나)
+- RTT 를 지연 등급(local/near/regional/far/unreachable)으로 변환해 노드 레이블로 게시
+- 피어별 RTT 를 압축 JSON 노드 어노테이션으로 게시
+
+worker.labels 의 zone=remote 같은 정적 레이블과 달리 실제 네트워크 거리를 반영하므로,
+nodeAffinity / podAffinity 규칙으로 통신이 잦은 파드를 가까운 노드에 배치할 수 있습니다.
+"""
+
+import json
+import socket
+import subprocess
+import time
+from statistics import median
+from typing import Callable, Dict, List, Optional, Sequence
+
+from . import icmp
+from .logger import get_logger
+from .vpn import VPNManager
+
+
+LABEL_PREFIX = "k8s-vpn-agent"
+MASTER_TIER_LABEL = f"{LABEL_PREFIX}/master-latency-tier"
+PEER_TIER_LABEL = f"{LABEL_PREFIX}/peer-latency-tier"
+LATENCY_ANNOTATION = f"{LABEL_PREFIX}/peer-latency-ms"
+
+# 등급 경계 (ms): local < 5 <= near < 30 <= regional < 100 <= far
+DEFAULT_TIER_THRESHOLDS_MS = (5.0, 30.0, 100.0)
+TIERS = ("local", "near", "regional", "far")
+UNREACHABLE = "unreachable"
+
+
+def latency_tier(rtt_ms: Optional[float],
+                 thresholds: Sequence[float] = DEFAULT_TIER_THRESHOLDS_MS) -> str:
+    """RTT 를 지연 등급으로 변환 (응답 없음은 unreachable)"""
+    if rtt_ms is None:
+        return UNREACHABLE
+    for tier, limit in zip(TIERS, thresholds):
+        if rtt_ms < limit:
+            return tier
+    return TIERS[min(len(thresholds), len(TIERS) - 1)]
+
+
+class TopologyReporter:
+    """피어 지연시간 측정 및 노드 레이블/어노테이션 게시"""
+
+    def __init__(self, master_ip: Optional[str], node_name: Optional[str] = None,
+                 interval: float = 300, count: int = 5, ping_interval: float = 0.2,
+                 thresholds: Sequence[float] = DEFAULT_TIER_THRESHOLDS_MS,
+                 peers_source: Optional[Callable[[], List[Dict]]] = None):
+        """
+        Args:
+            master_ip: 마스터 노드 IP
+            node_name: 레이블을 게시할 노드 이름 (기본값: 호스트 이름)
+            interval: 측정/게시 주기 (초)
+            count: 대상별 ICMP 패킷 수
+            ping_interval: 패킷 전송 간격 (초)
+            thresholds: 지연 등급 경계 (ms, 오름차순)
+            peers_source: VPN 피어 목록 제공 함수 (기본값: VPNManager.get_peers)
+        """
+        self.master_ip = master_ip
+        self.node_name = node_name or socket.gethostname()
+        self.interval = interval
+        self.count = count
+        self.ping_interval = ping_interval
+        self.thresholds = tuple(thresholds)
+        self.peers_source = peers_source or VPNManager({}).get_peers
+        self.last_run: Optional[float] = None
+        self._published: Optional[Dict[str, str]] = None
+        self.logger = get_logger()
+
+    @classmethod
+    def from_config(cls, config: Dict, peers_source: Optional[Callable[[], List[Dict]]] = None
+                    ) -> Optional["TopologyReporter"]:
+        """설정으로부터 생성 (monitor.topology_interval 이 0 이면 None)"""
+        monitor = config.get("monitor", {})
+        interval = monitor.get("topology_interval", 300)
+        if not interval:
+            return None
+        return cls(
+            config.get("master", {}).get("ip"),
+            node_name=config.get("worker", {}).get("hostname") or None,
+            interval=interval,
+            count=monitor.get("topology_ping_count", 5),
+            ping_interval=monitor.get("ping_interval", 0.2),
+            thresholds=monitor.get("topology_tier_thresholds_ms", DEFAULT_TIER_THRESHOLDS_MS),
+            peers_source=peers_source,
+        )
+
+    def due(self, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        return self.last_run is None or now - self.last_run >= self.interval
+
+    def targets(self) -> Dict[str, str]:
+        """측정 대상 (이름 → 주소): 마스터와 온라인 VPN 피어"""
+        targets = {}
+        if self.master_ip:
+            targets["master"] = self.master_ip
+        for peer in self.peers_source():
+            name = peer.get("hostname") or peer.get("dns_name")
+            ips = peer.get("ips") or []
+            if not name or not ips or not peer.get("online") or name == self.node_name:
+                continue
+            # IPv4 VPN 주소 우선
+            targets.setdefault(name, next((ip for ip in ips if ":" not in ip), ips[0]))
+        return targets
+
+    def measure(self) -> Dict[str, Optional[float]]:
+        """모든 대상의 평균 RTT 를 동시에 측정 (응답 없음은 None)"""
+        targets = self.targets()
+        if not targets:
+            return {}
+        results = icmp.ping_hosts(list(targets.values()), self.count, self.ping_interval, 1.0)
+        return {
+            name: (round(results[address].avg_ms, 1) if results[address].success else None)
+            for name, address in targets.items()
+        }
+
+    def labels(self, latencies: Dict[str, Optional[float]]) -> Dict[str, str]:
+        """지연 등급 레이블 (피어 등급은 응답한 피어 RTT 의 중앙값 기준)"""
+        labels = {}
+        if "master" in latencies:
+            labels[MASTER_TIER_LABEL] = latency_tier(latencies["master"], self.thresholds)
+        peers = [rtt for name, rtt in latencies.items() if name != "master"]
+        if peers:
+            replied = [rtt for rtt in peers if rtt is not None]
+            labels[PEER_TIER_LABEL] = latency_tier(median(replied) if replied else None,
+                                                   self.thresholds)
+        return labels
+
+    @staticmethod
+    def annotations(latencies: Dict[str, Optional[float]]) -> Dict[str, str]:
+        """피어별 RTT 어노테이션 (RTT 오름차순, ms 정수, 응답 없음은 null)"""
+        ordered = sorted(latencies.items(), key=lambda item: (item[1] is None, item[1] or 0.0))
+        compact = {name: (round(rtt) if rtt is not None else None) for name, rtt in ordered}
+        return {LATENCY_ANNOTATION: json.dumps(compact, separators=(",", ":"))}
+
+    def _kubectl(self, verb: str, values: Dict[str, str]) -> bool:
+        cmd = ["kubectl", verb, "node", self.node_name, "--overwrite"]
+        cmd += [f"{key}={value}" for key, value in values.items()]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            self.logger.warning(f"kubectl {verb} failed: {e}")
+            return False
+        if result.returncode != 0:
+            self.logger.warning(f"kubectl {verb} failed: {result.stderr.strip()}")
+            return False
+        return True
+
+    def publish(self, latencies: Dict[str, Optional[float]]) -> bool:
+        """레이블/어노테이션 게시 (이전 게시 값과 같으면 API 서버 요청 생략)
+
+        Returns:
+            bool: kubectl 로 갱신했는지
+        """
+        if not latencies:
+            return False
+        labels = self.labels(latencies)
+        annotations = self.annotations(latencies)
+        values = {**labels, **annotations}
+        if values == self._published:
+            return False
+        if labels and not self._kubectl("label", labels):
+            return False
+        if not self._kubectl("annotate", annotations):
+            return False
+        self._published = values
+        self.logger.info(f"Topology published for {self.node_name}: {labels}")
+        return True
+
+    def run(self, now: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """측정 후 게시"""
+        self.last_run = time.monotonic() if now is None else now
+        latencies = self.measure()
+        self.logger.debug(f"Peer latency: {latencies}")
+        self.publish(latencies)
+        return latencies
@@ -4,14 +4,77 @@ idempotent 및 롤백 지원
 """
 
 import subprocess
-import time
 import json
-from typing import Tuple, Optional, Dict
+from typing import Callable, Tuple, Optional, Dict, List, Sequence
 from rich.console import Console
+from .derp import DIRECT, UNKNOWN, PeerPathTracker, parse_ping_output, parse_ping_result, peer_path
+from .localapi import DEFAULT_SOCKET, LocalAPIClient, LocalAPIError
 from .logger import get_logger
+from .peers import PeerDiff, PeerTable
+from .results import PeerPathResult
+from .waiters import describe, socket_exists, wait_for
 
 console = Console()
 
+# 준비 상태 대기 시간 (초)
+TAILSCALED_START_TIMEOUT = 30
+BACKEND_RUNNING_TIMEOUT = 30
+
+
+class MasterPeerResolver:
+    """tailscale 피어 테이블에서 마스터 노드의 VPN 주소 조회
+
+    알려진 IP(master.ip, master.vpn_ip), 호스트 이름/MagicDNS 이름, ACL 태그 순으로
+    피어 테이블 색인을 조회합니다. 결과는 테이블 버전이 바뀔 때까지 캐시합니다.
+    """
+
+    def __init__(self, hostname: str = "", tag: str = ""):
+        """
+        Args:
+            hostname: 마스터 피어의 호스트 이름 또는 MagicDNS 이름
+            tag: 마스터 피어의 ACL 태그 (예: tag:k8s-master)
+        """
+        self.hostname = hostname
+        self.tag = tag
+        self._key = None
+        self._cached: Optional[str] = None
+        self.logger = get_logger()
+
+    def _candidates(self, table: PeerTable, known_ips: Sequence[str]) -> List[Dict]:
+        """우선순위가 가장 높은 일치 피어 목록"""
+        by_ip = [peer for peer in (table.by_ip(ip) for ip in known_ips) if peer]
+        if by_ip:
+            return by_ip
+        if self.hostname:
+            by_name = table.by_name(self.hostname)
+            if by_name:
+                return by_name
+        if self.tag:
+            return table.by_tag(self.tag)
+        return []
+
+    def resolve(self, table: PeerTable, known_ips: Sequence[str] = ()) -> Optional[str]:
+        """마스터 피어의 VPN IP (IPv4 우선, 온라인 피어 우선). 찾지 못하면 None
+
+        Args:
+            table: VPN 피어 테이블
+            known_ips: 마스터의 알려진 주소
+        """
+        known = tuple(ip for ip in known_ips if ip)
+        key = (id(table), table.version, known)
+        if key == self._key:
+            return self._cached
+
+        candidates = [peer for peer in self._candidates(table, known) if peer.get("TailscaleIPs")]
+        address = None
+        if candidates:
+            peer = min(candidates, key=lambda p: not p.get("Online"))
+            ips = peer["TailscaleIPs"]
+            address = next((ip for ip in ips if ":" not in ip), ips[0])
+            self.logger.info(f"Master VPN peer: {peer.get('HostName', '')} ({address})")
+        self._key, self._cached = key, address
+        return address
+
 
 class VPNManager:
     """VPN 관리 클래스"""
@@ -24,15 +87,57 @@ class VPNManager:
         self.headscale_url = config.get("headscale_url", "")
         self.auth_key = config.get("auth_key", "")
         self.namespace = config.get("namespace", "default")
+        self.master_resolver = MasterPeerResolver(config.get("master_hostname", ""),
+                                                  config.get("master_tag", ""))
+        self.peer_table = PeerTable()
+        # tailscaled LocalAPI 우선, 소켓이 없거나 실패하면 tailscale CLI 사용
+        self.localapi = LocalAPIClient(config.get("localapi_socket") or DEFAULT_SOCKET)
+        self.path_tracker = PeerPathTracker(self.ping_peer)
         self.idempotent = True
         self.original_state = None
     
+    def _local(self, action: str, func: Callable):
+        """LocalAPI 호출 (소켓이 없거나 실패하면 None → CLI 로 대체)"""
+        if not self.localapi.available():
+            return None
+        try:
+            return func()
+        except LocalAPIError as e:
+            self.logger.debug(f"LocalAPI {action} failed, falling back to CLI: {e}")
+            return None
+    
+    def _resume(self) -> bool:
+        """로그인된 채 중지된 노드를 LocalAPI 로 다시 연결 (tailscale up 과 같은 효과)"""
+        status = self._local("status", lambda: self.localapi.status(peers=False))
+        if status is None or status.backend_state != "Stopped":
+            return False
+        if self.vpn_type == "headscale" and self.headscale_url:
+            # 다른 제어 서버에 로그인되어 있으면 CLI 로 다시 로그인
+            prefs = self._local("prefs", self.localapi.prefs)
+            if not prefs or prefs.get("ControlURL", "").rstrip("/") != self.headscale_url.rstrip("/"):
+                return False
+        if self._local("up", lambda: self.localapi.set_running(True)) is None:
+            return False
+        console.print("[green]✓ VPN 연결 성공![/green]")
+        self.logger.info("VPN resumed via LocalAPI")
+        self._wait_running()
+        return True
+    
+    def _wait_running(self) -> bool:
+        """BackendState 가 Running 이 될 때까지 대기"""
+        waited = wait_for(self.is_connected, BACKEND_RUNNING_TIMEOUT, name="VPN BackendState Running")
+        if waited:
+            console.print(f"[green]✓ VPN Running ({describe(waited)})[/green]")
+        else:
+            console.print(f"[yellow]⚠ VPN 이 아직 Running 상태가 아닙니다 ({describe(waited)})[/yellow]")
+        return waited.ok
+    
     def save_state(self):
         """현재 상태 저장 (롤백용)"""
         try:
             self.original_state = {
                 "connected": self.is_connected(),
-                "status": self.get_status()
+                "status": self.get_status(peers=False)
             }
             self.logger.debug(f"Saved VPN state: {self.original_state}")
         except Exception as e:
@@ -63,6 +168,9 @@ class VPNManager:
     
     def is_installed(self) -> bool:
         """Tailscale 클라이언트 설치 확인"""
+        if self.localapi.available():
+            # tailscaled 가 실행 중이면 설치된 것으로 판단
+            return True
         try:
             result = subprocess.run(
                 ["which", "tailscale"],
@@ -104,11 +212,23 @@ class VPNManager:
             self.logger.exception(error_msg)
             return False, error_msg
     
-    def get_status(self) -> Dict:
-        """VPN 상태 확인"""
+    def get_status(self, peers: bool = True) -> Dict:
+        """VPN 상태 확인
+        
+        Args:
+            peers: False 면 자기 노드 정보만 조회 (큰 tailnet 에서 상태 확인용 빠른 경로)
+        """
+        status = self._local("status", lambda: self.localapi.status(peers=peers))
+        if status is not None:
+            self.logger.debug(f"VPN status: {status.backend_state}")
+            return status.raw
+        
+        cmd = ["tailscale", "status", "--json"]
+        if not peers:
+            cmd.append("--peers=false")
         try:
             result = subprocess.run(
-                ["tailscale", "status", "--json"],
+                cmd,
                 capture_output=True,
                 text=True
             )
@@ -124,9 +244,89 @@ class VPNManager:
             self.logger.error(f"Failed to get VPN status: {e}")
             return {}
     
+    def refresh_peers(self) -> PeerDiff:
+        """전체 피어 목록을 조회해 피어 테이블 갱신 (바뀐 피어만 색인 갱신)"""
+        status = self.get_status()
+        if not status:
+            return PeerDiff()
+        diff = self.peer_table.apply_snapshot(status.get("Peer") or {})
+        if diff:
+            self.logger.debug(
+                f"Peer table: +{len(diff.added)} -{len(diff.removed)} ~{len(diff.changed)} "
+                f"({len(self.peer_table)} peers)"
+            )
+        return diff
+    
+    def get_peers(self) -> List[Dict]:
+        """VPN 피어 목록 (호스트 이름, VPN IP, 온라인 여부)"""
+        self.refresh_peers()
+        return [
+            {
+                "hostname": peer.get("HostName", ""),
+                "dns_name": peer.get("DNSName", "").rstrip("."),
+                "ips": peer.get("TailscaleIPs") or [],
+                "online": bool(peer.get("Online")),
+            }
+            for peer in self.peer_table.values()
+        ]
+    
+    def get_master_vpn_ip(self, known_ips: Sequence[str] = ()) -> Optional[str]:
+        """피어 테이블에서 마스터 노드의 VPN IP 조회 (피어가 바뀌지 않았으면 캐시 사용)"""
+        self.refresh_peers()
+        return self.master_resolver.resolve(self.peer_table, known_ips)
+    
+    def get_peer_path(self, ip: str) -> Optional[PeerPathResult]:
+        """피어 상태의 CurAddr/Relay 로 현재 경로 확인 (피어가 없으면 None)"""
+        self.refresh_peers()
+        peer = self.peer_table.by_ip(ip)
+        if peer is None:
+            return None
+        mode, via = peer_path(peer)
+        return PeerPathResult(ip, mode, via)
+    
+    def ping_peer(self, ip: str, timeout: float = 2.0) -> PeerPathResult:
+        """피어로 disco ping 한 번 (경로 탐색 유도, 경로와 지연시간 확인)"""
+        data = self._local("ping", lambda: self.localapi.ping(ip))
+        if data is not None:
+            return parse_ping_result(ip, data)
+        try:
+            result = subprocess.run(
+                ["tailscale", "ping", "-c", "1", f"--timeout={timeout:g}s", ip],
+                capture_output=True,
+                text=True,
+                timeout=timeout + 5
+            )
+            # 직접 경로가 없으면 종료 코드가 0 이 아니어도 pong 은 출력됨
+            return parse_ping_output(ip, result.stdout + result.stderr)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            return PeerPathResult(ip, UNKNOWN, error=str(e))
+    
+    def establish_direct_path(self, ip: str, timeout: float) -> Tuple[Optional[PeerPathResult], bool, str]:
+        """DERP 릴레이 경유면 직접 경로가 생길 때까지 ping 으로 경로 탐색 유도
+        
+        Returns:
+            Tuple[Optional[PeerPathResult], bool, str]: 마지막 경로, 직접 경로 여부, 대기 요약
+        """
+        initial = self.get_peer_path(ip)
+        if initial is not None:
+            self.logger.info(f"Initial path to {ip}: {initial.mode} {initial.via or ''}")
+        if initial is None or initial.mode != DIRECT:
+            console.print(f"[cyan]마스터 피어 직접 경로 확인 중 ({ip})...[/cyan]")
+        result, waited = self.path_tracker.establish(ip, timeout)
+        if waited:
+            console.print(f"[green]✓ 직접 경로: {result.via} {result.latency_ms}ms "
+                          f"({describe(waited)})[/green]")
+        elif result is not None and result.mode != DIRECT and result.via:
+            console.print(f"[yellow]⚠ DERP 릴레이 경유: {result.via} {result.latency_ms}ms "
+                          f"({describe(waited)})[/yellow]")
+        else:
+            error = result.error if result is not None else ""
+            console.print(f"[yellow]⚠ 마스터 피어 경로 확인 실패: {error} ({describe(waited)})[/yellow]")
+        return result, waited.ok, describe(waited)
+    
     def is_connected(self) -> bool:
         """VPN 연결 상태 확인"""
-        status = self.get_status()
+        status = self.get_status(peers=False)
         connected = status.get("BackendState") == "Running"
         self.logger.debug(f"VPN connected: {connected}")
         return connected
@@ -164,13 +364,22 @@ class VPNManager:
                     ["systemctl", "start", "tailscaled"],
                     check=True
                 )
-                time.sleep(2)
+                # LocalAPI 소켓이 생기면 tailscaled 가 요청을 받을 수 있는 상태
+                waited = wait_for(socket_exists(self.localapi.socket_path), TAILSCALED_START_TIMEOUT,
+                                  name="tailscaled socket")
+                if waited:
+                    console.print(f"[green]✓ tailscaled 준비 ({describe(waited)})[/green]")
+                else:
+                    console.print(f"[yellow]⚠ tailscaled 소켓 대기 {describe(waited)}[/yellow]")
                 self.logger.debug("tailscaled started")
             except subprocess.CalledProcessError as e:
                 error_msg = f"tailscaled 시작 실패: {str(e)}"
                 self.logger.error(error_msg)
                 return False, error_msg
             
+            if self._resume():
+                return True, "연결 성공"
+            
             # Headscale 서버로 연결
             cmd = [
                 "tailscale", "up",
@@ -197,7 +406,7 @@ class VPNManager:
                     self.logger.info("VPN connected successfully")
                     
                     # 연결 정보 표시
-                    time.sleep(2)
+                    self._wait_running()
                     self.show_status()
                     
                     return True, "연결 성공"
@@ -230,6 +439,9 @@ class VPNManager:
             console.print("[cyan]Tailscale 연결 중...[/cyan]")
             self.logger.info("Connecting to Tailscale...")
             
+            if self._resume():
+                return True, "연결 성공"
+            
             try:
                 result = subprocess.run(
                     ["tailscale", "up"],
@@ -256,6 +468,11 @@ class VPNManager:
         """VPN 연결 해제"""
         try:
             self.logger.info("Disconnecting VPN...")
+            if self._local("down", lambda: self.localapi.set_running(False)) is not None:
+                console.print("[green]✓ VPN 연결 해제[/green]")
+                self.logger.info("VPN disconnected")
+                return True, "연결 해제 완료"
+            
             result = subprocess.run(
                 ["tailscale", "down"],
                 capture_output=True,
@@ -291,16 +508,9 @@ class VPNManager:
                 self.logger.debug(f"VPN status:\n{result.stdout}")
             
             # IP 정보 표시
-            result = subprocess.run(
-                ["tailscale", "ip"],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                ips = result.stdout.strip().split('\n')
-                console.print(f"[bold]VPN IP:[/bold] {ips[0] if ips else 'N/A'}")
-                self.logger.info(f"VPN IP: {ips[0] if ips else 'N/A'}")
+            ip = self.get_vpn_ip()
+            console.print(f"[bold]VPN IP:[/bold] {ip or 'N/A'}")
+            self.logger.info(f"VPN IP: {ip or 'N/A'}")
         
         except Exception as e:
             console.print(f"[yellow]상태 조회 실패: {str(e)}[/yellow]")
@@ -308,6 +518,11 @@ class VPNManager:
     
     def get_vpn_ip(self) -> Optional[str]:
         """VPN IP 주소 가져오기"""
+        status = self._local("ip", lambda: self.localapi.status(peers=False))
+        if status is not None and status.ipv4:
+            self.logger.debug(f"VPN IP: {status.ipv4}")
+            return status.ipv4
+        
         try:
             result = subprocess.run(
                 ["tailscale", "ip", "-4"],
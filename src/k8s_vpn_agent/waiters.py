@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+K8s VPN Agent - 준비 상태 대기 모듈
+
+이 모듈은 다음 기능을 제공합니다:
+- 조건이 참이 될 때까지 지수 백오프로 폴링하며 대기 (마감 시각 이후 실패)
+- 실제 대기 시간과 확인 횟수 보고
+- 조인 경로에서 쓰는 조건: 유닉스 소켓 생성, systemd 유닛 active, 쿠버네티스 노드 Ready
+
+고정 sleep 은 빠른 머신에서는 시간을 낭비하고 느린 머신에서는 부족하므로,
+조건을 짧은 간격부터 확인해 준비되는 즉시 다음 단계로 넘어갑니다.
+"""
+
+import os
+import stat
+import subprocess
+import time
+from typing import Any, Callable, Dict
+
+from .logger import get_logger
+
+
+class WaitResult:
+    """대기 결과 (bool 로 성공 여부 판단)"""
+
+    __slots__ = ("name", "ok", "elapsed", "attempts", "value")
+
+    def __init__(self, name: str, ok: bool, elapsed: float, attempts: int, value: Any = None):
+        self.name = name
+        self.ok = ok
+        self.elapsed = elapsed
+        self.attempts = attempts
+        self.value = value
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+    def to_dict(self) -> Dict:
+        return {"name": self.name, "ok": self.ok, "elapsed": round(self.elapsed, 3),
+                "attempts": self.attempts}
+
+
+def wait_for(condition: Callable[[], Any], timeout: float, name: str = "condition",
+             initial_interval: float = 0.05, max_interval: float = 2.0, factor: float = 2.0,
+             clock: Callable[[], float] = time.monotonic,
+             sleep: Callable[[float], None] = time.sleep) -> WaitResult:
+    """조건이 참(truthy)이 될 때까지 백오프 폴링
+
+    Args:
+        condition: 확인 함수 (참 값을 반환하면 완료, 예외는 미충족으로 처리)
+        timeout: 최대 대기 시간 (초)
+        name: 로그/보고용 이름
+        initial_interval: 첫 재확인 간격 (초)
+        max_interval: 최대 재확인 간격 (초)
+        factor: 간격 증가 배수
+        clock, sleep: 시간 함수 (테스트용)
+
+    Returns:
+        WaitResult: 성공 여부, 대기 시간, 확인 횟수, 마지막 조건 값
+    """
+    logger = get_logger()
+    start = clock()
+    deadline = start + timeout
+    interval = initial_interval
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            value = condition()
+        except Exception as e:
+            logger.debug(f"Wait {name}: check failed: {e}")
+            value = None
+        now = clock()
+        if value:
+            result = WaitResult(name, True, now - start, attempts, value)
+            logger.info(f"{name} ready after {result.elapsed:.2f}s ({attempts} checks)")
+            return result
+        remaining = deadline - now
+        if remaining <= 0:
+            result = WaitResult(name, False, now - start, attempts, value)
+            logger.warning(f"{name} not ready after {result.elapsed:.2f}s ({attempts} checks)")
+            return result
+        sleep(min(interval, remaining))
+        interval = min(interval * factor, max_interval)
+
+
+def socket_exists(path: str) -> Callable[[], bool]:
+    """유닉스 소켓 파일이 생성되었는지 확인하는 조건"""
+    def check() -> bool:
+        try:
+            return stat.S_ISSOCK(os.stat(path).st_mode)
+        except OSError:
+            return False
+    return check
+
+
+def unit_active(unit: str) -> Callable[[], bool]:
+    """systemd 유닛이 active 인지 확인하는 조건"""
+    def check() -> bool:
+        result = subprocess.run(["systemctl", "is-active", unit],
+                                capture_output=True, text=True, timeout=10)
+        return result.stdout.strip() == "active"
+    return check
+
+
+def node_ready(node: str) -> Callable[[], bool]:
+    """쿠버네티스 노드의 Ready 조건이 True 인지 확인하는 조건"""
+    def check() -> bool:
+        result = subprocess.run(
+            ["kubectl", "get", "node", node, "-o",
+             "jsonpath={.status.conditions[?(@.type=='Ready')].status}"],
+            capture_output=True, text=True, timeout=10
+        )
+        return result.stdout.strip() == "True"
+    return check
+
+
+def describe(result: WaitResult) -> str:
+    """콘솔 출력용 요약 (예: "1.3초, 확인 5회")"""
+    summary = f"{result.elapsed:.1f}초, 확인 {result.attempts}회"
+    return summary if result.ok else f"시간 초과: {summary}"
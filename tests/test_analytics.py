@@ -0,0 +1,114 @@
+"""
+헬스 히스토리 분석 모듈 테스트
+"""
+
+import json
+from k8s_vpn_agent.analytics import load_history, analyze_history
+
+
+def _write_history(path, node, start, states, interval=30):
+    with open(path, "a", encoding="utf-8") as f:
+        for i, healthy in enumerate(states):
+            record = {
+                "ts": start + i * interval,
+                "node": node,
+                "overall": healthy,
+                "checks": {"vpn": healthy, "kubelet": 1},
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+def test_availability_and_outages(tmp_path):
+    """가용성, 장애 구간, MTTR 계산"""
+    history = tmp_path / "health_history.jsonl"
+    # 10개 샘플 중 2번의 장애 (각 2샘플, 1샘플)
+    _write_history(history, "worker-1", 1_700_000_000, [1, 1, 0, 0, 1, 1, 1, 0, 1, 1])
+
+    result = analyze_history(load_history([str(tmp_path)]))
+    vpn = result["checks"]["vpn"]
+
+    assert result["samples"] == 10
+    assert vpn["outages"] == 2
+    assert vpn["downtime"] == 90
+    assert vpn["uptime"] == 210
+    assert vpn["mttr"] == 45
+    assert vpn["availability"] == 70
+    assert sorted(o["duration"] for o in vpn["outage_intervals"]) == [30, 60]
+    assert result["checks"]["kubelet"]["outages"] == 0
+    assert result["checks"]["kubelet"]["mtbf"] is None
+
+
+def test_gap_splits_outage_and_multiple_nodes(tmp_path):
+    """수집 공백은 장애 구간을 끊고 노드별로 따로 집계"""
+    history = tmp_path / "health_history.jsonl"
+    _write_history(history, "worker-1", 1_700_000_000, [0, 0, 0])
+    _write_history(history, "worker-1", 1_700_010_000, [0, 1])
+    _write_history(history, "worker-2", 1_700_000_000, [1, 1, 1, 1])
+
+    result = analyze_history(load_history([str(history)]))
+    vpn = result["checks"]["vpn"]
+
+    assert result["nodes"] == 2
+    assert vpn["outages"] == 2
+    assert vpn["node_availability_percentiles"]["p50"] == 60
+
+
+def test_column_cache_roundtrip(tmp_path):
+    """.npz 컬럼 캐시 재사용"""
+    history = tmp_path / "health_history.jsonl"
+    _write_history(history, "worker-1", 1_700_000_000, [1, 0, 1])
+
+    first = load_history([str(history)])
+    assert (tmp_path / "health_history.jsonl.npz").exists()
+    second = load_history([str(history)])
+
+    assert second.nodes == first.nodes
+    assert second.checks == first.checks
+    assert (second.states == first.states).all()
+
+
+def test_incremental_cache_parses_appended_tail(tmp_path):
+    """캐시 이후 추가된 줄만 반영하고, 기록 중인 마지막 줄은 캐시에 포함하지 않음"""
+    history = tmp_path / "health_history.jsonl"
+    _write_history(history, "worker-1", 1_700_000_000, [1, 0, 1])
+    assert len(load_history([str(history)])) == 3
+
+    _write_history(history, "worker-1", 1_700_000_090, [0, 1])
+    with open(history, "a", encoding="utf-8") as f:
+        f.write('{"ts": 1700000150, "node": "worker-1", "overall": 1')
+    assert len(load_history([str(history)])) == 5
+
+    with open(history, "a", encoding="utf-8") as f:
+        f.write(', "checks": {"vpn": 1}}\n')
+    columns = load_history([str(history)])
+    assert len(columns) == 6
+    assert list(columns.ts[-3:]) == [1_700_000_090, 1_700_000_120, 1_700_000_150]
+
+    # 로테이션으로 파일이 바뀌면 캐시를 버리고 다시 파싱
+    history.unlink()
+    _write_history(history, "worker-2", 1_800_000_000, [1])
+    columns = load_history([str(history)])
+    assert len(columns) == 1 and columns.nodes == ["worker-2"]
+
+
+def test_malformed_records_are_skipped(tmp_path):
+    """ts 가 없거나 깨진 레코드/리포트는 건너뛰고 나머지를 분석"""
+    history = tmp_path / "health_history.jsonl"
+    _write_history(history, "worker-1", 1_700_000_000, [1, 1])
+    with open(history, "a", encoding="utf-8") as f:
+        f.write('{"node": "worker-1", "overall": 0}\n')
+        f.write('not json\n')
+        f.write('[1, 2]\n')
+    assert len(load_history([str(history)], use_cache=False)) == 2
+
+    legacy_dir = tmp_path / "legacy"
+    legacy_dir.mkdir()
+    (legacy_dir / "health_report_1.json").write_text(
+        json.dumps({"overall_status": "healthy", "checks": {}}), encoding="utf-8"
+    )
+    (legacy_dir / "health_report_2.json").write_text(json.dumps({
+        "timestamp": "2024-01-01T00:00:00",
+        "overall_status": "unhealthy",
+        "checks": {"vpn": {"healthy": False}},
+    }), encoding="utf-8")
+    assert len(load_history([str(legacy_dir)])) == 1
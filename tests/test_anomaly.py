@@ -0,0 +1,75 @@
+"""
+지연시간 이상 감지 모듈 테스트
+"""
+
+import random
+from k8s_vpn_agent.anomaly import AnomalyDetector
+
+
+def _warm(detector, name="rtt", samples=50, base=20.0):
+    rng = random.Random(1)
+    for _ in range(samples):
+        detector.observe(name, base + rng.uniform(-2, 2))
+
+
+def test_gradual_creep_detected():
+    """RTT 가 서서히 증가하면 degraded 판정"""
+    detector = AnomalyDetector()
+    _warm(detector)
+
+    degraded_at = None
+    for step in range(100):
+        rtt = 20 + step * 3
+        if detector.observe("rtt", rtt).degraded:
+            degraded_at = rtt
+            break
+
+    assert degraded_at is not None
+    assert degraded_at < 100
+
+
+def test_single_spike_ignored():
+    """단발성 스파이크는 무시"""
+    detector = AnomalyDetector()
+    _warm(detector)
+
+    assert not detector.observe("rtt", 60).degraded
+    assert not detector.observe("rtt", 20).degraded
+
+
+def test_no_verdict_during_warmup():
+    """워밍업 기간에는 판정하지 않음"""
+    detector = AnomalyDetector(warmup=10)
+    detector.observe("rtt", 20)
+    result = detector.observe("rtt", 500)
+    assert not result.warmed_up
+    assert not result.degraded
+
+
+def test_state_persists(tmp_path):
+    """상태 파일을 통한 기준선 복원"""
+    state_file = tmp_path / "anomaly_state.json"
+    detector = AnomalyDetector(state_file=str(state_file))
+    _warm(detector)
+    detector.save()
+
+    restored = AnomalyDetector(state_file=str(state_file))
+    assert restored.series["rtt"].count == 50
+    assert abs(restored.series["rtt"].baseline - detector.series["rtt"].baseline) < 1e-9
+    for _ in range(5):
+        result = restored.observe("rtt", 200)
+    assert result.degraded
+
+
+def test_permanent_shift_rebaselines():
+    """지연시간이 영구히 바뀌면 일정 횟수 후 새 수준을 기준선으로 채택"""
+    detector = AnomalyDetector(rebaseline_after=30)
+    _warm(detector)
+
+    verdicts = [detector.observe("rtt", 150.0).degraded for _ in range(60)]
+
+    assert any(verdicts[:30])
+    assert not any(verdicts[40:])
+    assert abs(detector.series["rtt"].baseline - 150.0) < 5
+    # 새 기준선에서 다시 증가하면 감지
+    assert any(detector.observe("rtt", 300.0).degraded for _ in range(20))
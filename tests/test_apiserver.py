@@ -0,0 +1,79 @@
+"""
+API 서버 헬스 프로브 테스트 (로컬 HTTPS 서버)
+"""
+
+import shutil
+import ssl
+import subprocess
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from k8s_vpn_agent.apiserver import APIServerProbe
+
+
+class _HealthHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        if self.path == "/livez":
+            status, body = 200, b"ok"
+        else:
+            status, body = 500, b"[-]etcd failed: reason withheld\nreadyz check failed"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def https_server(tmp_path):
+    if not shutil.which("openssl"):
+        pytest.skip("openssl 명령 없음")
+    cert, key = tmp_path / "cert.pem", tmp_path / "key.pem"
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-subj", "/CN=localhost", "-keyout", str(key), "-out", str(cert)],
+        check=True, capture_output=True,
+    )
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _HealthHandler)
+    server.daemon_threads = True
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(str(cert), str(key))
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_phase_breakdown_and_connection_reuse(https_server):
+    """첫 요청은 단계별 시간 측정, 두 번째 요청은 같은 연결 재사용"""
+    probe = APIServerProbe("127.0.0.1", https_server.server_address[1], timeout=5)
+    try:
+        results = probe.probe_all()
+    finally:
+        probe.close()
+
+    livez, readyz = results["livez"], results["readyz"]
+    assert livez.success and livez.status_code == 200
+    assert livez.reused is False
+    assert livez.tls_ms > 0 and livez.connect_ms >= 0 and livez.ttfb_ms > 0
+
+    assert readyz.reused is True
+    assert (readyz.resolve_ms, readyz.connect_ms, readyz.tls_ms) == (0.0, 0.0, 0.0)
+    assert not readyz.success and readyz.status_code == 500
+    assert "readyz check failed" in readyz.message
+
+
+def test_unreachable_endpoint(tmp_path):
+    """연결 실패는 실패 결과로 반환"""
+    probe = APIServerProbe("127.0.0.1", 1, timeout=1)
+    result = probe.probe("/livez")
+    assert not result.success and result.status_code is None
+    assert "tls_ms" not in result.to_dict()
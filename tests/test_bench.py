@@ -0,0 +1,42 @@
+"""
+네트워크 벤치마크 테스트 (루프백)
+"""
+
+import pytest
+
+from k8s_vpn_agent.bench import BenchClient, BenchServer
+
+
+@pytest.fixture
+def bench_server():
+    server = BenchServer("127.0.0.1", 0)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_tcp_throughput_loopback(bench_server):
+    """TCP 업로드/다운로드 처리량 측정"""
+    port = int(bench_server.address.rsplit(":", 1)[1])
+    client = BenchClient("127.0.0.1", port)
+
+    upload = client.tcp_upload(duration=0.2)
+    assert upload["bytes"] > 0 and upload["bytes"] == upload["sent"]
+    assert upload["mbps"] > 0
+
+    download = client.tcp_download(duration=0.2)
+    assert download["bytes"] > 0 and download["mbps"] > 0
+
+
+def test_udp_rtt_and_loss_loopback(bench_server):
+    """UDP 에코 RTT 분포와 부하 손실률 측정"""
+    port = int(bench_server.address.rsplit(":", 1)[1])
+    result = BenchClient("127.0.0.1", port).run(
+        duration=0.2, udp_rate_mbps=5, rtt_count=10, rtt_interval=0.01
+    )
+
+    udp = result["udp"]
+    assert udp["rtt"]["received"] == 10
+    assert udp["rtt"]["min_ms"] <= udp["rtt"]["p50_ms"] <= udp["rtt"]["max_ms"]
+    assert udp["sent"] > 0 and udp["loss"] < 0.5
+    assert "error" not in result["tcp_upload"] and "error" not in result["tcp_download"]
@@ -0,0 +1,51 @@
+"""
+DERP 릴레이 감지 및 직접 경로 확립 테스트
+"""
+
+from k8s_vpn_agent.derp import (
+    DIRECT, RELAY, UNKNOWN, PeerPathTracker, parse_ping_output, parse_ping_result, peer_path,
+)
+from k8s_vpn_agent.results import PeerPathResult, VPNCheckResult
+
+
+def test_path_from_peer_status_and_ping():
+    """피어 상태 / LocalAPI ping 응답 / tailscale ping 출력으로 경로 판별"""
+    assert peer_path({"CurAddr": "203.0.113.7:41641", "Relay": "fra"}) == (DIRECT, "203.0.113.7:41641")
+    assert peer_path({"CurAddr": "", "Relay": "fra"}) == (RELAY, "DERP(fra)")
+    assert peer_path({}) == (UNKNOWN, None)
+
+    relayed = parse_ping_result("100.64.0.1", {"DERPRegionID": 4, "DERPRegionCode": "fra",
+                                               "LatencySeconds": 0.0481})
+    assert (relayed.mode, relayed.via, relayed.latency_ms) == (RELAY, "DERP(fra)", 48.1)
+    direct = parse_ping_result("100.64.0.1", {"Endpoint": "203.0.113.7:41641", "LatencySeconds": 0.012})
+    assert (direct.mode, direct.via) == (DIRECT, "203.0.113.7:41641")
+    assert parse_ping_result("100.64.0.1", {"Err": "no matching peer"}).error == "no matching peer"
+
+    output = ("pong from master (100.64.0.1) via DERP(fra) in 52ms\n"
+              "pong from master (100.64.0.1) via 203.0.113.7:41641 in 11ms\n")
+    result = parse_ping_output("100.64.0.1", output)
+    assert (result.mode, result.via, result.latency_ms) == (DIRECT, "203.0.113.7:41641", 11.0)
+    assert parse_ping_output("100.64.0.1", "pong from m (100.64.0.1) via DERP(nyc) in 80ms").mode == RELAY
+    assert parse_ping_output("100.64.0.1", "timeout waiting for ping reply\n").mode == UNKNOWN
+
+
+def test_establish_direct_path_reports_both_latencies():
+    """직접 경로가 생길 때까지 ping 반복, 릴레이/직접 지연시간 보고"""
+    replies = iter([PeerPathResult("100.64.0.1", RELAY, "DERP(fra)", 50.0),
+                    PeerPathResult("100.64.0.1", RELAY, "DERP(fra)", 48.0),
+                    PeerPathResult("100.64.0.1", DIRECT, "203.0.113.7:41641", 12.0)])
+    tracker = PeerPathTracker(lambda ip: next(replies))
+    result, waited = tracker.establish("100.64.0.1", timeout=5)
+    assert waited and waited.attempts == 3
+    assert (result.mode, result.relay_ms, result.direct_ms) == (DIRECT, 48.0, 12.0)
+
+    check = VPNCheckResult(True, "Running", "ok", peers=3, path=result)
+    assert check.to_dict()["path"] == {"ip": "100.64.0.1", "mode": DIRECT, "via": "203.0.113.7:41641",
+                                       "latency_ms": 12.0, "relay_ms": 48.0, "direct_ms": 12.0}
+
+
+def test_establish_gives_up_at_deadline():
+    """마감 시각까지 릴레이면 마지막 결과와 실패 반환"""
+    tracker = PeerPathTracker(lambda ip: PeerPathResult(ip, RELAY, "DERP(fra)", 50.0))
+    result, waited = tracker.establish("100.64.0.1", timeout=0.3)
+    assert not waited and result.mode == RELAY and result.relay_ms == 50.0
@@ -0,0 +1,71 @@
+"""
+디스크 압박 예측 모듈 테스트
+"""
+
+from k8s_vpn_agent.disk import (
+    DiskPressureForecaster,
+    FilesystemTrend,
+    load_eviction_thresholds,
+    parse_threshold,
+)
+
+
+def test_parse_threshold():
+    """퍼센트/수량 임계값 변환"""
+    assert parse_threshold("10%", 1000) == 100
+    assert parse_threshold("500Mi", 0) == 500 * 1024 ** 2
+    assert parse_threshold("1G", 0) == 1000 ** 3
+    assert parse_threshold("invalid", 1000) is None
+
+
+def test_trend_time_to_threshold():
+    """선형 감소 추세의 임계값 도달 시간"""
+    trend = FilesystemTrend(window=10)
+    # 100초마다 1000 바이트씩 감소
+    for i in range(5):
+        trend.add(i * 100.0, 10_000 - i * 1000)
+
+    assert abs(trend.slope() + 10) < 1e-9
+    # 마지막 6000 바이트 → 임계값 1000 까지 5000 바이트 / 10 B/s
+    assert abs(trend.time_to_threshold(1000) - 500) < 1e-6
+
+
+def test_trend_not_decreasing():
+    """여유 공간이 줄지 않으면 예측하지 않음"""
+    trend = FilesystemTrend()
+    for i in range(5):
+        trend.add(i * 60.0, 5000)
+    assert trend.time_to_threshold(1000) is None
+
+
+def test_kubelet_eviction_thresholds(tmp_path):
+    """kubelet 설정의 evictionHard 우선, 설정 override 최우선"""
+    kubelet_config = tmp_path / "config.yaml"
+    kubelet_config.write_text("evictionHard:\n  nodefs.available: 5%\n")
+
+    thresholds = load_eviction_thresholds(str(kubelet_config))
+    assert thresholds["nodefs.available"] == "5%"
+    assert thresholds["imagefs.available"] == "15%"
+
+    thresholds = load_eviction_thresholds(str(kubelet_config), {"nodefs.available": "2Gi"})
+    assert thresholds["nodefs.available"] == "2Gi"
+
+
+def test_forecaster_shares_device_and_persists(tmp_path):
+    """같은 파일시스템은 추세를 공유하고 상태를 저장"""
+    state_file = tmp_path / "disk_trend.json"
+    forecaster = DiskPressureForecaster(
+        {"nodefs": str(tmp_path), "imagefs": str(tmp_path)},
+        {"nodefs.available": "0%", "imagefs.available": "0%"},
+        min_interval=0,
+        state_file=str(state_file),
+    )
+    results = forecaster.sample(now=1000.0)
+
+    assert [fs["name"] for fs in results] == ["nodefs", "imagefs"]
+    assert not results[0]["pressure"]
+
+    restored = DiskPressureForecaster(
+        {"nodefs": str(tmp_path)}, {"nodefs.available": "0%"}, state_file=str(state_file),
+    )
+    assert len(restored.trends["nodefs"].samples) == 1
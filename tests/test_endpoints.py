@@ -0,0 +1,52 @@
+"""
+제어 평면 엔드포인트 선택 테스트
+"""
+
+from k8s_vpn_agent import endpoints
+from k8s_vpn_agent.endpoints import EndpointSelector, master_endpoints, parse_endpoint
+from k8s_vpn_agent.results import EndpointProbeResult
+
+
+def test_parse_endpoint_formats():
+    """URL, host:port, IPv6 형식 파싱"""
+    assert parse_endpoint("https://10.0.0.1:6443") == ("10.0.0.1", 6443)
+    assert parse_endpoint("master-2.example.com") == ("master-2.example.com", 6443)
+    assert parse_endpoint("[fd00::1]:8443") == ("fd00::1", 8443)
+    assert master_endpoints({"api_endpoint": "https://10.0.0.1:6443"}) == ["10.0.0.1:6443"]
+    assert master_endpoints({"endpoints": ["fd00::1", "10.0.0.2:7443"]}) == ["[fd00::1]:6443",
+                                                                             "10.0.0.2:7443"]
+
+
+def _fake_probe(latencies):
+    def probe(endpoint, timeout=5.0):
+        host, port = parse_endpoint(endpoint)
+        latency = latencies[endpoint]
+        if latency is None:
+            return EndpointProbeResult(False, "✗ {} 연결 실패", endpoint, endpoint=endpoint,
+                                       host=host, port=port)
+        return EndpointProbeResult(True, "✓ {}", endpoint, endpoint=endpoint, host=host, port=port,
+                                   connect_ms=latency, readyz_ms=1.0)
+    return probe
+
+
+def test_ranking_and_hysteresis(monkeypatch):
+    """정상 우선/지연시간 순 정렬, 작은 개선으로는 전환하지 않음"""
+    latencies = {"a:6443": 50.0, "b:6443": 20.0, "c:6443": None}
+    monkeypatch.setattr(endpoints, "probe_endpoint", _fake_probe(latencies))
+    selector = EndpointSelector(list(latencies), hysteresis=0.2)
+
+    assert selector.select().endpoint == "b:6443"
+    assert [r.endpoint for r in selector.ranking] == ["b:6443", "a:6443", "c:6443"]
+
+    # a 가 약간(10%) 빨라져도 현재 b 유지
+    latencies["a:6443"] = 18.0
+    assert selector.select().endpoint == "b:6443"
+
+    # 현재 엔드포인트가 실패하면 즉시 전환
+    latencies["b:6443"] = None
+    assert selector.select().endpoint == "a:6443"
+
+    # 모두 실패하면 현재 선택 유지
+    latencies["a:6443"] = None
+    current = selector.select()
+    assert current.endpoint == "a:6443" and not current.success
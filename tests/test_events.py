@@ -0,0 +1,158 @@
+"""
+상태 전이 이벤트 스트림 모듈 테스트
+"""
+
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+from k8s_vpn_agent.events import EventBus, EventStreamServer, publish_transitions
+from k8s_vpn_agent.results import CheckResult, CheckStatus, HealthReport
+
+
+def _report(vpn_healthy: bool) -> HealthReport:
+    vpn = CheckResult(vpn_healthy, "Running" if vpn_healthy else "Stopped", "vpn")
+    kubelet = CheckResult(True, CheckStatus.ACTIVE, "kubelet")
+    return HealthReport(
+        timestamp="t",
+        checks={"vpn": vpn, "kubelet": kubelet},
+        overall_status=CheckStatus.HEALTHY if vpn_healthy else CheckStatus.UNHEALTHY,
+        failed_checks=[] if vpn_healthy else ["vpn"],
+    )
+
+
+def _read_events(response, count):
+    events = []
+    current = {}
+    while len(events) < count:
+        line = response.fp.readline().decode("utf-8").rstrip("\n")
+        if not line:
+            if "data" in current:
+                events.append(current)
+            current = {}
+            continue
+        if line.startswith(":"):
+            continue
+        key, _, value = line.partition(": ")
+        current[key] = value
+    return events
+
+
+def test_transitions_only_on_change():
+    """상태가 바뀐 체크만 이벤트 발행"""
+    bus = EventBus()
+    first = publish_transitions(bus, None, _report(True))
+    assert {e.data.get("check") for e in first} == {"vpn", "kubelet", None}
+
+    assert publish_transitions(bus, _report(True), _report(True)) == []
+
+    changed = publish_transitions(bus, _report(True), _report(False))
+    assert [e.type for e in changed] == ["transition", "overall"]
+    assert changed[0].data["from"] == "Running"
+    assert changed[0].data["to"] == "Stopped"
+
+
+def test_ring_buffer_reports_gap():
+    """버퍼에서 밀려난 이벤트는 gap 으로 표시"""
+    bus = EventBus(capacity=3)
+    for i in range(5):
+        bus.publish("test", {"i": i})
+
+    events, missed = bus.since(0)
+    assert missed
+    assert [e.seq for e in events] == [3, 4, 5]
+
+    events, missed = bus.since(4)
+    assert not missed
+    assert [e.seq for e in events] == [5]
+
+
+def test_sse_stream_and_resume():
+    """SSE 스트림 수신 및 Last-Event-ID 이어받기"""
+    bus = EventBus()
+    server = EventStreamServer(bus, port=0, keepalive=0.2)
+    server.start()
+    try:
+        host, port = server._server.server_address[:2]
+        bus.publish("transition", {"check": "vpn"})
+        bus.publish("transition", {"check": "network"})
+
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request("GET", "/events?since=0")
+        response = conn.getresponse()
+        assert response.status == 200
+        assert response.getheader("Content-Type").startswith("text/event-stream")
+        events = _read_events(response, 2)
+        assert [e["id"] for e in events] == [f"{bus.epoch}-1", f"{bus.epoch}-2"]
+
+        # 새 이벤트는 연결 중에 즉시 전달
+        threading.Timer(0.05, bus.publish, ("transition", {"check": "kubelet"})).start()
+        live = _read_events(response, 1)
+        assert json.loads(live[0]["data"])["check"] == "kubelet"
+        conn.close()
+
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request("GET", "/events", headers={"Last-Event-ID": events[1]["id"]})
+        resumed = _read_events(conn.getresponse(), 1)
+        assert resumed[0]["id"] == f"{bus.epoch}-3"
+        conn.close()
+    finally:
+        server.stop()
+
+
+def test_resume_after_restart_sends_gap():
+    """재시작 전 epoch 의 id 로 재접속하면 gap 과 함께 버퍼 전체 수신"""
+    old_bus = EventBus()
+    for _ in range(5):
+        old_bus.publish("transition", {"check": "vpn"})
+
+    bus = EventBus()
+    for i in range(12):
+        bus.publish("transition", {"check": f"c{i}"})
+    server = EventStreamServer(bus, port=0, keepalive=0.2)
+    server.start()
+    try:
+        host, port = server._server.server_address[:2]
+        conn = http.client.HTTPConnection(host, port, timeout=5)
+        conn.request("GET", "/events", headers={"Last-Event-ID": f"{old_bus.epoch}-5"})
+        events = _read_events(conn.getresponse(), 13)
+        conn.close()
+    finally:
+        server.stop()
+
+    assert events[0]["event"] == "gap"
+    assert [e["id"] for e in events[1:]] == [f"{bus.epoch}-{i}" for i in range(1, 13)]
+
+
+def test_unix_socket_refuses_non_socket_path(tmp_path):
+    """소켓이 아닌 파일이 있는 경로에서는 시작하지 않고 파일을 보존"""
+    path = tmp_path / "events.sock"
+    path.write_text("keep me", encoding="utf-8")
+    server = EventStreamServer(EventBus(), unix_socket=str(path))
+    with pytest.raises(FileExistsError):
+        server.start()
+    assert path.read_text(encoding="utf-8") == "keep me"
+
+
+def test_unix_socket_latest(tmp_path):
+    """유닉스 소켓으로 마지막 리포트 조회"""
+    bus = EventBus()
+    publish_transitions(bus, None, _report(False))
+    path = str(tmp_path / "events.sock")
+    server = EventStreamServer(bus, unix_socket=path)
+    server.start()
+    try:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(5)
+        sock.connect(path)
+        conn = http.client.HTTPConnection("localhost")
+        conn.sock = sock
+        conn.request("GET", "/latest")
+        body = json.loads(conn.getresponse().read())
+        assert body["overall_status"] == "unhealthy"
+        conn.close()
+    finally:
+        server.stop()
@@ -0,0 +1,79 @@
+"""
+Happy Eyeballs 연결 경쟁 테스트
+"""
+
+import socket
+
+import pytest
+
+from k8s_vpn_agent.happy_eyeballs import interleave, race_connect
+from k8s_vpn_agent.resolver import Resolver
+
+
+def _listener(family, address, port=0):
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((address, port))
+    sock.listen(8)
+    return sock
+
+
+@pytest.fixture
+def dual_resolver(tmp_path):
+    hosts = tmp_path / "hosts"
+    hosts.write_text("::1 dual.test\n127.0.0.1 dual.test\n")
+    return Resolver(nameservers=[], resolv_conf=str(tmp_path / "resolv.conf"),
+                    hosts_file=str(hosts))
+
+
+def _ipv6_loopback_available():
+    try:
+        _listener(socket.AF_INET6, "::1").close()
+        return True
+    except OSError:
+        return False
+
+
+def test_interleave_prefers_ipv6():
+    """IPv6 부터 패밀리를 번갈아 정렬"""
+    assert interleave(["10.0.0.1", "10.0.0.2", "fd00::1"]) == ["fd00::1", "10.0.0.1", "10.0.0.2"]
+
+
+def test_falls_back_to_ipv4_when_ipv6_refused(dual_resolver):
+    """IPv6 연결이 거부되면 즉시 IPv4 로 넘어가 승자가 됨"""
+    if not _ipv6_loopback_available():
+        pytest.skip("IPv6 루프백 사용 불가")
+    server = _listener(socket.AF_INET, "127.0.0.1")
+    try:
+        port = server.getsockname()[1]
+        result = race_connect("dual.test", port, timeout=2.0, resolver=dual_resolver)
+        assert result.success and result.family == "ipv4"
+        assert result.attempts[0].family == socket.AF_INET6 and result.attempts[0].error
+        # 거부 직후 시작되므로 250ms 지연을 기다리지 않음
+        assert result.attempts[1].started_ms < 200
+        assert result.family_latency["ipv6"] is None
+    finally:
+        server.close()
+
+
+def test_complete_measures_both_families(dual_resolver):
+    """complete=True 면 두 패밀리의 지연시간을 모두 보고"""
+    if not _ipv6_loopback_available():
+        pytest.skip("IPv6 루프백 사용 불가")
+    v4 = _listener(socket.AF_INET, "127.0.0.1")
+    port = v4.getsockname()[1]
+    try:
+        v6 = _listener(socket.AF_INET6, "::1", port)
+    except OSError:
+        v4.close()
+        pytest.skip("같은 포트로 IPv6 리스너 생성 불가")
+    try:
+        result = race_connect("dual.test", port, timeout=2.0, delay=0.05, complete=True,
+                              resolver=dual_resolver)
+        assert result.family == "ipv6"
+        latency = result.family_latency
+        assert latency["ipv4"] is not None and latency["ipv6"] is not None
+        assert result.to_dict()["address"] == "::1"
+    finally:
+        v4.close()
+        v6.close()
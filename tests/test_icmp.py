@@ -0,0 +1,63 @@
+"""
+네이티브 ICMP 에코 모듈 테스트
+"""
+
+import socket
+import struct
+
+import pytest
+
+from k8s_vpn_agent import icmp
+
+
+def test_echo_checksum_valid():
+    """IPv4 에코 요청 체크섬 검증"""
+    packet = icmp._build_echo(socket.AF_INET, 0x1234, 7)
+    assert icmp._checksum(packet) == 0
+    assert struct.unpack("!BBHHH", packet[:8])[3:] == (0x1234, 7)
+
+
+def test_parse_reply_strips_ip_header():
+    """raw 소켓 응답의 IP 헤더 제거 후 파싱"""
+    reply = struct.pack("!BBHHH", icmp.ICMP_ECHO_REPLY, 0, 0, 42, 9) + b"x" * 8
+    ip_header = bytes([0x45]) + b"\x00" * 19
+    assert icmp._parse_reply(socket.AF_INET, "raw", ip_header + reply) == (42, 9)
+    assert icmp._parse_reply(socket.AF_INET, "dgram", reply) == (42, 9)
+
+    request = struct.pack("!BBHHH", icmp.ICMP_ECHO_REQUEST, 0, 0, 42, 9)
+    assert icmp._parse_reply(socket.AF_INET, "dgram", request) is None
+
+
+def test_ping_hosts_loopback():
+    """루프백 동시 핑 및 패킷별 RTT"""
+    results = icmp.ping_hosts(["127.0.0.1", "no-such-host.invalid"],
+                              count=3, interval=0.05, timeout=1.0)
+    loopback = results["127.0.0.1"]
+    if loopback.error:
+        pytest.skip(f"ICMP 사용 불가: {loopback.error}")
+
+    assert loopback.received == 3
+    assert all(rtt is not None and rtt >= 0 for rtt in loopback.rtts)
+    assert loopback.loss == 0.0
+    assert not results["no-such-host.invalid"].success
+
+
+def test_link_stats_and_quality_score():
+    """RTT 통계, 지터, 손실률과 링크 품질 점수"""
+    good = icmp.PingResult("10.0.0.1", "10.0.0.1", count=4)
+    good.rtts = [10.0, 12.0, 10.0, 12.0]
+    stats = good.stats()
+    assert (stats.min_ms, stats.avg_ms, stats.max_ms) == (10.0, 11.0, 12.0)
+    assert stats.mdev_ms == 1.0
+    assert stats.jitter_ms == 2.0
+    assert stats.loss_pct == 0.0 and stats.score > 90
+
+    lossy = icmp.PingResult("10.0.0.1", "10.0.0.1", count=10)
+    lossy.rtts = [10.0] * 6 + [None] * 4
+    assert lossy.success
+    assert lossy.stats().loss_pct == 40.0
+    assert lossy.stats().score == 0.0
+
+    down = icmp.PingResult("10.0.0.1", count=3).stats()
+    assert down.score == 0.0 and down.avg_ms is None
+    assert "avg_ms" not in down.to_dict()
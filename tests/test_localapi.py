@@ -0,0 +1,118 @@
+"""
+Tailscale LocalAPI 클라이언트 테스트 (가짜 tailscaled 유닉스 소켓 서버)
+"""
+
+import json
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from k8s_vpn_agent.localapi import LocalAPIClient, LocalAPIError
+from k8s_vpn_agent.vpn import VPNManager
+
+
+class _FakeTailscaled(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(("GET", self.path, self.headers.get("Host")))
+        server.connections.add(id(self.connection))
+        if self.path.startswith("/localapi/v0/status"):
+            status = {"BackendState": server.state, "TailscaleIPs": ["fd7a:115c:a1e0::5", "100.64.0.5"]}
+            if "peers=false" not in self.path:
+                status["Peer"] = {"nodekey:m": {"HostName": "k8s-master", "TailscaleIPs": ["100.64.0.1"],
+                                                "Online": True}}
+            self._reply(200, status)
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        self.server.requests.append(("POST", self.path, None))
+        self._reply(200, {"IP": "100.64.0.1", "Endpoint": "203.0.113.7:41641", "LatencySeconds": 0.012})
+
+    def do_PATCH(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(("PATCH", self.path, body))
+        self.server.state = "Running" if body["WantRunning"] else "Stopped"
+        self._reply(200, {"WantRunning": body["WantRunning"]})
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def tailscaled(tmp_path):
+    path = str(tmp_path / "tailscaled.sock")
+    server = _Server(path, _FakeTailscaled)
+    server.requests, server.connections, server.state = [], set(), "Running"
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server, path
+    server.shutdown()
+    server.server_close()
+
+
+def test_status_and_connection_reuse(tailscaled):
+    """상태 조회 및 연결 재사용"""
+    server, path = tailscaled
+    client = LocalAPIClient(path)
+    assert client.available()
+
+    status = client.status(peers=False)
+    assert status.running and status.ipv4 == "100.64.0.5" and status.peers == {}
+    assert "nodekey:m" in client.status().peers
+    assert client.ips() == ["fd7a:115c:a1e0::5", "100.64.0.5"]
+
+    assert server.requests[0] == ("GET", "/localapi/v0/status?peers=false", "local-tailscaled.sock")
+    assert len(server.connections) == 1
+    client.close()
+
+
+def test_error_response_and_missing_socket(tailscaled, tmp_path):
+    """HTTP 오류 응답 및 소켓 없음"""
+    _, path = tailscaled
+    with pytest.raises(LocalAPIError) as error:
+        LocalAPIClient(path).request("GET", "nope")
+    assert error.value.status == 404
+
+    missing = LocalAPIClient(str(tmp_path / "missing.sock"))
+    assert not missing.available()
+    with pytest.raises(LocalAPIError):
+        missing.status()
+
+
+def test_vpn_manager_uses_localapi(tailscaled, monkeypatch):
+    """VPNManager 는 소켓이 있으면 CLI 대신 LocalAPI 사용"""
+    server, path = tailscaled
+    monkeypatch.setattr("subprocess.run", lambda *a, **k: pytest.fail("tailscale CLI 호출"))
+    manager = VPNManager({"type": "tailscale", "localapi_socket": path})
+
+    assert manager.is_connected()
+    assert manager.get_vpn_ip() == "100.64.0.5"
+    assert manager.get_master_vpn_ip(["100.64.0.1"]) == "100.64.0.1"
+    route = manager.ping_peer("100.64.0.1")
+    assert (route.mode, route.via, route.latency_ms) == ("direct", "203.0.113.7:41641", 12.0)
+    assert server.requests[-1][:2] == ("POST", "/localapi/v0/ping?ip=100.64.0.1&type=disco")
+
+    assert manager.disconnect()[0]
+    assert server.requests[-1] == ("PATCH", "/localapi/v0/prefs",
+                                   {"WantRunning": False, "WantRunningSet": True})
+    assert not manager.is_connected()
+    # 로그인된 채 중지된 노드는 LocalAPI 로 다시 연결
+    assert manager.connect() == (True, "연결 성공")
+    assert manager.is_connected()
@@ -0,0 +1,57 @@
+"""
+네트워크 인터페이스 조회 모듈 테스트
+"""
+
+import socket
+import struct
+
+from k8s_vpn_agent import netif
+from k8s_vpn_agent.network import NetworkChecker
+
+
+def _fake_link(root, name, operstate, flags, carrier="1", index=7, mtu=1280):
+    link = root / name
+    link.mkdir()
+    (link / "operstate").write_text(f"{operstate}\n")
+    (link / "flags").write_text(f"{flags}\n")
+    (link / "ifindex").write_text(f"{index}\n")
+    (link / "mtu").write_text(f"{mtu}\n")
+    if carrier is not None:
+        (link / "carrier").write_text(f"{carrier}\n")
+
+
+def test_tun_unknown_operstate_counts_as_up(tmp_path):
+    """operstate 가 unknown 인 tun 장치는 IFF_UP 과 carrier 로 판단"""
+    _fake_link(tmp_path, "tailscale0", "unknown", "0x10d1")
+    _fake_link(tmp_path, "wg0", "unknown", "0x1090", carrier=None, index=8)
+    _fake_link(tmp_path, "eth1", "down", "0x1003", carrier="0", index=9)
+
+    tun = netif.read_link("tailscale0", str(tmp_path))
+    assert tun.is_up and tun.mtu == 1280 and tun.index == 7
+    assert not netif.read_link("wg0", str(tmp_path)).is_up
+    assert not netif.read_link("eth1", str(tmp_path)).is_up
+    assert netif.read_link("missing0", str(tmp_path)) is None
+
+
+def test_parse_addr_message_prefers_local_for_ipv4():
+    """point-to-point IPv4 는 IFA_LOCAL 을 주소로 사용"""
+    def attr(attr_type, value):
+        return struct.pack("=HH", 4 + len(value), attr_type) + value
+
+    payload = (struct.pack("=BBBBI", socket.AF_INET, 32, 0, 0, 5)
+               + attr(netif.IFA_ADDRESS, socket.inet_aton("100.64.0.1"))
+               + attr(netif.IFA_LOCAL, socket.inet_aton("100.101.102.103")))
+    assert netif._parse_addr_message(payload) == (5, (socket.AF_INET, "100.101.102.103", 32))
+
+
+def test_snapshot_loopback():
+    """스냅샷으로 lo 상태와 주소를 한 번에 조회"""
+    interfaces = netif.snapshot()
+    lo = interfaces["lo"]
+    assert lo.is_up
+    assert lo.ipv4 == "127.0.0.1"
+
+    checker = NetworkChecker()
+    assert checker.check_interface("lo", interfaces)[0]
+    assert checker.get_interface_ip("lo", interfaces) == "127.0.0.1"
+    assert not checker.check_interface("no-such-if0")[0]
@@ -27,3 +27,41 @@ def test_check_port_invalid():
     success, msg = checker.check_port("127.0.0.1", 99999, timeout=1)
     assert success == False
 
+
+
+
+def test_probe_http_reuses_connection():
+    """HTTP 프로브의 keep-alive 연결 재사용"""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from k8s_vpn_agent.network import HTTPProbeSession
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/healthz"
+    checker = NetworkChecker(http_session=HTTPProbeSession())
+    try:
+        first = checker.probe_http(url)
+        second = checker.probe_http(url)
+        assert first.success and first.reused is False
+        assert second.success and second.reused is True
+        assert second.to_dict()["reused"] is True
+        assert checker.http_session.reused == 1
+    finally:
+        # keep-alive 연결을 먼저 닫아야 핸들러 스레드가 종료된다
+        checker.http_session.close()
+        server.shutdown()
+        server.server_close()
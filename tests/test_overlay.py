@@ -0,0 +1,55 @@
+"""
+오버레이 캡슐화 프로브 테스트
+"""
+
+import socket
+import struct
+
+from k8s_vpn_agent.overlay import (
+    OverlayProbeResult, OverlayResponder, build_packet, parse_packet, probe_overlay, probe_overlays,
+)
+
+
+def test_packet_framing():
+    """오버레이별 헤더 형식과 왕복 파싱"""
+    vxlan = build_packet("vxlan", 7, 3, size=100, sent_ns=42)
+    assert len(vxlan) == 100
+    assert vxlan[0] == 0x08 and struct.unpack("!I", vxlan[4:8])[0] >> 8 == 0xF1F1F1
+    assert struct.unpack("!H", vxlan[20:22])[0] == 0x88B5  # 내부 EtherType
+    geneve = build_packet("geneve", 7, 3, sent_ns=42)
+    assert struct.unpack("!H", geneve[2:4])[0] == 0x6558
+    wireguard = build_packet("wireguard", 7, 3, sent_ns=42)
+    assert wireguard[0] == 4 and struct.unpack("<Q", wireguard[8:16])[0] == 3
+
+    for packet, overlay in ((vxlan, "vxlan"), (geneve, "geneve"), (wireguard, "wireguard")):
+        assert parse_packet(packet) == (overlay, 7, 3, 42)
+    assert parse_packet(b"\x08" + b"\x00" * 60) is None
+
+
+def test_reordering_count():
+    """순서 뒤바뀜 집계"""
+    result = OverlayProbeResult("vxlan", "h", 1)
+    result.arrivals = [0, 2, 1, 3, 5, 4]
+    assert result.reordered == 2
+
+
+def test_probe_against_responder():
+    """응답기로 세 오버레이 모두 전달 확인, 응답기 없는 포트는 실패"""
+    responder = OverlayResponder("127.0.0.1", {"vxlan": 0, "geneve": 0, "wireguard": 0})
+    responder.start()
+    try:
+        results = probe_overlays("127.0.0.1", ports=responder.addresses, bursts=2, burst_size=10,
+                                 burst_gap=0.02, timeout=0.5)
+    finally:
+        responder.stop()
+    for overlay, result in results.items():
+        assert result.received == result.sent == 20, overlay
+        assert result.duplicates == 0
+    assert responder.echoed == 60
+
+    closed = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    closed.bind(("127.0.0.1", 0))
+    port = closed.getsockname()[1]
+    closed.close()
+    missing = probe_overlay("127.0.0.1", "vxlan", port=port, bursts=1, burst_size=2, timeout=0.2)
+    assert not missing.success and missing.error
@@ -0,0 +1,61 @@
+"""
+직접/VPN 경로 전환 테스트
+"""
+
+import json
+import socket
+
+from k8s_vpn_agent.paths import DIRECT, VPN, PathManager, PathSample
+from k8s_vpn_agent.results import LinkStats
+
+
+def _samples(direct_score, vpn_score, direct_api=True, vpn_api=True):
+    def sample(name, score, api_ok):
+        received = 0 if score is None else 10
+        link = LinkStats(name, 10, received, 100.0 if score is None else 0.0, score=score or 0.0)
+        return PathSample(name, name, link, api_ok)
+    return {DIRECT: sample(DIRECT, direct_score, direct_api), VPN: sample(VPN, vpn_score, vpn_api)}
+
+
+def test_failover_and_quality_switch(tmp_path):
+    """연속 실패 시 즉시 페일오버, 품질 전환은 연속 우위 + 최소 유지 시간 필요"""
+    log = tmp_path / "path_failovers.jsonl"
+    manager = PathManager({DIRECT: "10.0.0.1", VPN: "100.64.0.1"}, switch_margin=15,
+                          switch_samples=3, fail_samples=2, min_hold=100, failover_file=str(log))
+    assert manager.current == DIRECT
+
+    # 작은 점수 차이로는 전환하지 않음
+    for t in range(5):
+        assert manager.update(_samples(80, 90), now=t) is None
+
+    # 직접 경로 API 포트 실패 2회 → VPN 으로 페일오버
+    assert manager.update(_samples(80, 90, direct_api=False), now=10) is None
+    record = manager.update(_samples(80, 90, direct_api=False), now=11)
+    assert record["to"] == VPN and record["reason"] == "failover"
+    assert manager.host == "100.64.0.1"
+
+    # 직접 경로가 회복되어 훨씬 좋아져도 최소 유지 시간 전에는 복귀하지 않음
+    for t in range(12, 30):
+        assert manager.update(_samples(95, 40), now=t) is None
+    record = manager.update(_samples(95, 40), now=120)
+    assert record["to"] == DIRECT and record["reason"] == "quality"
+
+    lines = [json.loads(line) for line in log.read_text().splitlines()]
+    assert [line["to"] for line in lines] == [VPN, DIRECT]
+    assert manager.status()["failovers"] == 2
+
+
+def test_probe_loopback_paths():
+    """두 경로를 동시에 프로브 (열린 API 포트)"""
+    server = socket.socket(socket.AF_INET6)
+    server.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0)
+    server.bind(("::", 0))
+    server.listen(8)
+    try:
+        manager = PathManager({DIRECT: "127.0.0.1", VPN: "::1"}, api_port=server.getsockname()[1],
+                              ping_count=2, ping_interval=0.05)
+        samples = manager.probe()
+    finally:
+        server.close()
+    assert all(sample.usable and sample.score > 90 for sample in samples.values())
+    assert manager.update(samples) is None
@@ -0,0 +1,44 @@
+"""
+VPN 피어 테이블 테스트
+"""
+
+from k8s_vpn_agent.peers import PeerTable
+
+
+def _peer(host, ip, tags=(), online=True):
+    return {"HostName": host, "DNSName": f"{host}.tailnet.ts.net.", "TailscaleIPs": [ip],
+            "Tags": list(tags), "Online": online}
+
+
+def test_snapshot_diff_and_indexes():
+    """스냅샷 비교로 추가/삭제/변경만 반영하고 색인 유지"""
+    table = PeerTable()
+    diff = table.apply_snapshot({"a": _peer("node-a", "100.64.0.1", ["tag:k8s"]),
+                                 "b": _peer("node-b", "100.64.0.2")})
+    assert sorted(diff.added) == ["a", "b"] and table.version == 1
+    assert table.by_ip("100.64.0.1")["HostName"] == "node-a"
+    assert [p["HostName"] for p in table.by_name("NODE-B")] == ["node-b"]
+    assert [p["HostName"] for p in table.by_name("node-a.tailnet.ts.net")] == ["node-a"]
+    assert [p["HostName"] for p in table.by_tag("tag:k8s")] == ["node-a"]
+
+    # 변경 없음 → 버전 유지
+    assert not table.apply_snapshot({"a": _peer("node-a", "100.64.0.1", ["tag:k8s"]),
+                                     "b": _peer("node-b", "100.64.0.2")})
+    assert table.version == 1
+
+    # a 의 IP/태그 변경, b 삭제, c 추가
+    diff = table.apply_snapshot({"a": _peer("node-a", "100.64.0.9"),
+                                 "c": _peer("node-c", "100.64.0.3", online=False)})
+    assert diff.to_dict() == {"added": ["c"], "removed": ["b"], "changed": ["a"]}
+    assert table.by_ip("100.64.0.1") is None and table.by_ip("100.64.0.9")["HostName"] == "node-a"
+    assert table.by_tag("tag:k8s") == [] and table.by_name("node-b") == []
+    assert len(table) == 2 and table.online_count == 1
+
+
+def test_incremental_changes():
+    """변경분 증분 적용"""
+    table = PeerTable()
+    table.apply_changes({f"k{i}": _peer(f"n{i}", f"100.64.1.{i}") for i in range(100)})
+    diff = table.apply_changes({"k5": _peer("n5", "100.64.1.5", online=False)}, removed=["k7", "zz"])
+    assert diff.changed == ["k5"] and diff.removed == ["k7"]
+    assert len(table) == 99 and table.online_count == 98
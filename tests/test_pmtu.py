@@ -0,0 +1,63 @@
+"""
+경로 MTU 탐색 및 MTU 정합성 점검 테스트
+"""
+
+import json
+
+from k8s_vpn_agent import icmp, netif, pmtu
+from k8s_vpn_agent.netif import InterfaceInfo
+
+
+def test_discover_pmtu_binary_search(monkeypatch):
+    """상한이 실패하면 이진 탐색으로 통과하는 최대 크기를 찾음"""
+    monkeypatch.setattr(icmp, "probe_packet_size", lambda address, size, timeout: size <= 1372)
+    result = pmtu.discover_pmtu("127.0.0.1", max_mtu=1500)
+    assert result.mtu == 1372
+    assert result.probes <= 12
+
+    # 실제 루프백: 상한 한 번으로 끝남
+    monkeypatch.undo()
+    result = pmtu.discover_pmtu("127.0.0.1", max_mtu=1500)
+    assert result.mtu == 1500 and result.probes == 1
+
+
+def test_alignment_and_fix(monkeypatch, tmp_path):
+    """CNI MTU + VXLAN 헤더가 VPN 경로를 넘으면 위험으로 판정하고 수정"""
+    conflist = tmp_path / "10-flannel.conflist"
+    conflist.write_text(json.dumps({
+        "name": "cbr0",
+        "plugins": [{"type": "flannel", "delegate": {"mtu": 1450}}, {"type": "portmap"}],
+    }))
+
+    def info(name, mtu):
+        return InterfaceInfo(name, mtu=mtu, flags=netif.IFF_UP)
+
+    interfaces = {"tailscale0": info("tailscale0", 1280), "flannel.1": info("flannel.1", 1450),
+                  "eth0": info("eth0", 1500)}
+    monkeypatch.setattr(icmp, "probe_packet_size", lambda address, size, timeout: size <= 1280)
+    monkeypatch.setattr(pmtu, "kernel_path_mtu", lambda address: 1280)
+
+    report = pmtu.check_alignment(["127.0.0.1"], "tailscale0", conf_dir=str(tmp_path),
+                                  interfaces=interfaces)
+    assert report.path_mtu == 1280
+    assert report.overlay == ("flannel.1", "vxlan", 50)
+    assert report.recommended_vpn_mtu is None
+    assert report.recommended_cni_mtu == 1230
+    assert len(report.issues) == 2  # 설정 파일 + flannel.1 인터페이스
+
+    changed = []
+    monkeypatch.setattr(netif, "set_mtu", lambda name, mtu: changed.append((name, mtu)) or True)
+    changes = pmtu.apply_fix(report, conf_dir=str(tmp_path))
+    assert changed == [("flannel.1", 1230)]
+    assert json.loads(conflist.read_text())["plugins"][0]["delegate"]["mtu"] == 1230
+    assert len(changes) == 2
+
+
+def test_vpn_mtu_blackhole(monkeypatch, tmp_path):
+    """언더레이가 tailscale0 MTU 를 전달하지 못하면 VPN MTU 인하 권장"""
+    interfaces = {"tailscale0": InterfaceInfo("tailscale0", mtu=1280, flags=netif.IFF_UP)}
+    monkeypatch.setattr(icmp, "probe_packet_size", lambda address, size, timeout: size <= 1200)
+    monkeypatch.setattr(pmtu, "kernel_path_mtu", lambda address: 1280)
+    report = pmtu.check_alignment(["127.0.0.1"], conf_dir=str(tmp_path), interfaces=interfaces)
+    assert report.recommended_vpn_mtu == 1200
+    assert not report.ok
@@ -0,0 +1,58 @@
+"""
+포트 도달성 매트릭스 테스트
+"""
+
+import socket
+
+from k8s_vpn_agent.portmatrix import (
+    CLOSED, OPEN, build_matrix, default_ports, nodeport_samples, parse_nodes, parse_port_specs,
+)
+
+
+def test_parse_port_specs():
+    """단일/범위/프로토콜 지정 파싱, UDP 제외, 중복 제거"""
+    assert parse_port_specs(["10250", 179, "30000-30002", "8472/udp", "5473/tcp", "10250"]) == [
+        10250, 179, 30000, 30001, 30002, 5473]
+    assert nodeport_samples("30000-32767") == [30000, 31384, 32767]
+    ports = default_ports({"kubelet_port": 10250, "additional_ports": ["9100/tcp", "4789/udp"]})
+    assert ports[0] == 10250 and 9100 in ports and 4789 not in ports
+
+
+def test_parse_nodes():
+    """kubectl 출력에서 InternalIP 추출"""
+    data = {"items": [
+        {"metadata": {"name": "master"},
+         "status": {"addresses": [{"type": "Hostname", "address": "master"},
+                                  {"type": "InternalIP", "address": "10.0.0.1"}]}},
+        {"metadata": {"name": "worker"}, "status": {"addresses": []}},
+    ]}
+    assert parse_nodes(data) == {"master": "10.0.0.1"}
+
+
+def test_matrix_open_and_closed():
+    """열린 포트와 닫힌 포트 구분, 동시 연결 수 제한에서도 전체 검사"""
+    listeners = []
+    for _ in range(3):
+        server = socket.socket()
+        server.bind(("127.0.0.1", 0))
+        server.listen(64)
+        listeners.append(server)
+    open_ports = [s.getsockname()[1] for s in listeners]
+
+    probe = socket.socket()
+    probe.bind(("127.0.0.1", 0))
+    closed_port = probe.getsockname()[1]
+    probe.close()
+
+    try:
+        matrix = build_matrix({"a": "127.0.0.1", "b": "localhost"}, open_ports + [closed_port],
+                              timeout=1.0, concurrency=2)
+    finally:
+        for server in listeners:
+            server.close()
+
+    for node in ("a", "b"):
+        assert all(matrix.state(node, port) == OPEN for port in open_ports)
+        assert matrix.state(node, closed_port) == CLOSED
+    assert len(matrix.unreachable()) == 2
+    assert matrix.to_dict()["nodes"]["a"]["ports"][str(closed_port)]["state"] == CLOSED
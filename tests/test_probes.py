@@ -0,0 +1,103 @@
+"""
+asyncio 프로브 엔진 테스트
+"""
+
+import asyncio
+import socket
+import time
+
+from k8s_vpn_agent.probes import ProbeEngine
+from k8s_vpn_agent.results import ProbeResult
+
+
+def test_tcp_connect_loopback():
+    """열린/닫힌 포트 연결 프로브"""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    port = server.getsockname()[1]
+    try:
+        engine = ProbeEngine(probe_timeout=2)
+        results = engine.run({
+            "open": lambda: engine.tcp_connect("127.0.0.1", port),
+            "closed": lambda: engine.tcp_connect("127.0.0.1", 1),
+        })
+    finally:
+        server.close()
+
+    assert results["open"].success
+    assert not results["closed"].success
+
+
+def test_probes_run_concurrently():
+    """느린 프로브는 타임아웃되고 전체 시간은 누적되지 않음"""
+    async def slow():
+        await asyncio.sleep(5)
+        return ProbeResult(True, "slow")
+
+    engine = ProbeEngine(probe_timeout=0.3, overall_timeout=2)
+    start = time.perf_counter()
+    results = engine.run({f"slow{i}": slow for i in range(5)})
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.5
+    assert all(not r.success and "타임아웃" in r.message for r in results.values())
+
+
+def test_overall_timeout_cancels_pending():
+    """전체 타임아웃 초과 프로브는 취소"""
+    async def slow():
+        await asyncio.sleep(5)
+        return ProbeResult(True, "slow")
+
+    engine = ProbeEngine(probe_timeout=10, overall_timeout=0.2)
+    results = engine.run({"slow": slow})
+    assert not results["slow"].success
+
+
+def test_blocking_probes_do_not_extend_overall_timeout(monkeypatch):
+    """스레드에서 막힌 프로브(getaddrinfo 포함)가 run() 반환을 지연시키지 않음"""
+    def slow_getaddrinfo(*args, **kwargs):
+        time.sleep(3)
+        raise socket.gaierror("slow")
+
+    def slow_check():
+        time.sleep(3)
+        return True, "slow"
+
+    monkeypatch.setattr(socket, "getaddrinfo", slow_getaddrinfo)
+    engine = ProbeEngine(probe_timeout=0.3, overall_timeout=0.6)
+    start = time.perf_counter()
+    results = engine.run({
+        "dns": lambda: engine.resolve("example.invalid"),
+        "thread": lambda: engine.call(slow_check),
+    })
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.5
+    assert not results["dns"].success
+    assert not results["thread"].success
+
+
+def test_ping_group_shares_one_batch(monkeypatch):
+    """ping_group 은 여러 호스트를 한 번의 ping_hosts 호출로 처리"""
+    from k8s_vpn_agent import icmp
+
+    calls = []
+
+    def fake_ping_hosts(hosts, count, interval, timeout):
+        calls.append(list(hosts))
+        results = {}
+        for host in hosts:
+            result = icmp.PingResult(host, host, count)
+            result.rtts = [1.0] * count if host == "10.0.0.1" else [None] * count
+            results[host] = result
+        return results
+
+    monkeypatch.setattr(icmp, "ping_hosts", fake_ping_hosts)
+    engine = ProbeEngine(probe_timeout=1)
+    results = engine.run(engine.ping_group({"master": "10.0.0.1", "internet": "8.8.8.8"}))
+
+    assert calls == [["10.0.0.1", "8.8.8.8"]]
+    assert results["master"].success
+    assert not results["internet"].success
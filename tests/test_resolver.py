@@ -0,0 +1,146 @@
+"""
+캐싱 DNS 리졸버 테스트
+"""
+
+import asyncio
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+from k8s_vpn_agent import resolver as resolver_module
+from k8s_vpn_agent.resolver import Resolver
+
+
+class FakeDNSServer:
+    """루프백 UDP DNS 서버 (A 질의에 고정 주소, 'missing' 이름은 NXDOMAIN)"""
+
+    def __init__(self, ttl: int = 60, delay: float = 0.0):
+        self.ttl = ttl
+        self.delay = delay
+        self.queries = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.1)
+        self.address = self.sock.getsockname()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        while not self._stop.is_set():
+            try:
+                data, addr = self.sock.recvfrom(512)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            qid = struct.unpack("!H", data[:2])[0]
+            question = data[12:]
+            name_end = question.index(b"\x00") + 1
+            qtype = struct.unpack("!H", question[name_end:name_end + 2])[0]
+            name = ".".join(
+                label.decode() for label in _labels(question[:name_end])
+            )
+            self.queries.append((name, qtype))
+            if self.delay:
+                time.sleep(self.delay)
+
+            rcode = 3 if name.startswith("missing") else 0
+            answers = b""
+            if rcode == 0 and qtype == 1:
+                answers = (b"\xc0\x0c" + struct.pack("!HHIH", 1, 1, self.ttl, 4)
+                           + socket.inet_aton("10.1.2.3"))
+            header = struct.pack("!HHHHHH", qid, 0x8180 | rcode, 1, 1 if answers else 0, 0, 0)
+            self.sock.sendto(header + question[:name_end + 4] + answers, addr)
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+        self.sock.close()
+
+
+def _labels(encoded: bytes):
+    offset = 0
+    while encoded[offset]:
+        length = encoded[offset]
+        yield encoded[offset + 1:offset + 1 + length]
+        offset += 1 + length
+
+
+@pytest.fixture
+def dns_server():
+    server = FakeDNSServer()
+    yield server
+    server.close()
+
+
+def _resolver(server, tmp_path, **kwargs):
+    hosts = tmp_path / "hosts"
+    hosts.write_text("127.0.0.1 localhost\n10.9.9.9 master.local master\n")
+    return Resolver(nameservers=[server.address], timeout=1.0,
+                    resolv_conf=str(tmp_path / "resolv.conf"), hosts_file=str(hosts), **kwargs)
+
+
+def test_resolve_caches_by_ttl(dns_server, tmp_path):
+    """응답 TTL 동안은 다시 질의하지 않음"""
+    dns_server.ttl = 1
+    res = _resolver(dns_server, tmp_path, min_ttl=0.5)
+
+    assert res.resolve("api.example.com") == ["10.1.2.3"]
+    assert res.resolve("api.example.com") == ["10.1.2.3"]
+    assert len(dns_server.queries) == 2  # A + AAAA 한 번
+
+    time.sleep(1.1)
+    res.resolve("api.example.com")
+    assert len(dns_server.queries) == 4
+
+
+def test_negative_answers_cached(dns_server, tmp_path, monkeypatch):
+    """NXDOMAIN 은 negative_ttl 동안 캐시"""
+    monkeypatch.setattr(resolver_module.socket, "getaddrinfo",
+                        lambda *a, **k: (_ for _ in ()).throw(socket.gaierror("no")))
+    res = _resolver(dns_server, tmp_path, negative_ttl=30)
+
+    for _ in range(3):
+        with pytest.raises(socket.gaierror):
+            res.resolve("missing.example.com")
+    assert len(dns_server.queries) == 2
+
+
+def test_concurrent_lookups_deduplicated(tmp_path):
+    """같은 이름의 동시 조회는 한 번만 질의"""
+    server = FakeDNSServer(delay=0.2)
+    try:
+        res = _resolver(server, tmp_path)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(res.resolve("db.example.com")))
+                   for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [["10.1.2.3"]] * 5
+        assert len(server.queries) == 2
+    finally:
+        server.close()
+
+
+def test_aresolve_and_hosts_file(dns_server, tmp_path):
+    """asyncio 조회, hosts 파일 및 IP 리터럴은 네임서버에 질의하지 않음"""
+    res = _resolver(dns_server, tmp_path)
+
+    async def run():
+        return await asyncio.gather(
+            res.aresolve("api.example.com"),
+            res.aresolve("master"),
+            res.aresolve("192.168.0.1"),
+        )
+
+    assert asyncio.run(run()) == [["10.1.2.3"], ["10.9.9.9"], ["192.168.0.1"]]
+    assert [name for name, _ in dns_server.queries] == ["api.example.com"] * 2
+    with pytest.raises(socket.gaierror):
+        res.resolve("api.example.com", family=socket.AF_INET6)
@@ -0,0 +1,78 @@
+"""
+결과 레코드 모듈 테스트
+"""
+
+import json
+from k8s_vpn_agent.results import (
+    CheckStatus,
+    CheckResult,
+    VPNCheckResult,
+    NetworkCheckResult,
+    HealthReport,
+    intern_status,
+    to_jsonable,
+)
+
+
+def test_record_has_no_instance_dict():
+    """슬롯 레코드는 인스턴스 __dict__ 를 갖지 않음"""
+    result = VPNCheckResult(True, "Running", "VPN 연결 정상", peers=3)
+    assert not hasattr(result, "__dict__")
+
+
+def test_status_interning():
+    """알려진 상태는 enum, 그 외는 인터닝된 문자열"""
+    assert intern_status("error") is CheckStatus.ERROR
+    a = intern_status("".join(["Needs", "Login"]))
+    b = intern_status("".join(["Needs", "Login"]))
+    assert a is b
+    assert CheckStatus.RUNNING == "Running"
+
+
+def test_lazy_message_formatting():
+    """메시지는 조회 시점에 포맷팅"""
+    result = CheckResult(False, CheckStatus.ERROR, "VPN 상태: {}", "Stopped")
+    assert result.message == "VPN 상태: Stopped"
+    assert result["message"] == "VPN 상태: Stopped"
+
+
+def test_serialization_matches_legacy_shape():
+    """기존 JSON 형식과 동일한 직렬화"""
+    vpn = VPNCheckResult(True, CheckStatus.NOT_CONFIGURED, "VPN이 설정되지 않음")
+    assert vpn.to_dict() == {
+        "healthy": True,
+        "status": "not_configured",
+        "message": "VPN이 설정되지 않음",
+    }
+    assert "peers" not in vpn
+    assert vpn.get("peers", 0) == 0
+
+    network = NetworkCheckResult(
+        False, None, "마스터 노드와 통신 불가",
+        master_ip="10.0.0.1", ping=CheckStatus.FAILED, api_server=CheckStatus.NOT_ACCESSIBLE,
+    )
+    assert network.to_dict() == {
+        "healthy": False,
+        "master_ip": "10.0.0.1",
+        "ping": "failed",
+        "api_server": "not_accessible",
+        "message": "마스터 노드와 통신 불가",
+    }
+
+
+def test_health_report_json():
+    """리포트 json 직렬화"""
+    report = HealthReport(
+        timestamp="2024-01-01T00:00:00",
+        checks={"vpn": VPNCheckResult(False, "Stopped", "VPN 상태: {}", "Stopped", peers=0)},
+        overall_status=CheckStatus.UNHEALTHY,
+        failed_checks=["vpn"],
+    )
+    data = json.loads(json.dumps(report, default=to_jsonable))
+    assert data["overall_status"] == "unhealthy"
+    assert data["failed_checks"] == ["vpn"]
+    assert data["checks"]["vpn"]["message"] == "VPN 상태: Stopped"
+    assert report["overall_status"] == "unhealthy"
+
+    healthy = HealthReport(timestamp="t", checks={})
+    assert "failed_checks" not in healthy.to_dict()
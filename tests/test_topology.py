@@ -0,0 +1,56 @@
+"""
+피어 지연시간 토폴로지 게시 테스트
+"""
+
+import json
+import subprocess
+
+from k8s_vpn_agent import topology
+from k8s_vpn_agent.topology import (
+    LATENCY_ANNOTATION, MASTER_TIER_LABEL, PEER_TIER_LABEL, TopologyReporter, latency_tier,
+)
+
+
+def test_latency_tier():
+    """RTT 등급 경계"""
+    assert latency_tier(1.2) == "local"
+    assert latency_tier(12) == "near"
+    assert latency_tier(45) == "regional"
+    assert latency_tier(250) == "far"
+    assert latency_tier(None) == "unreachable"
+
+
+def test_measure_and_publish(monkeypatch):
+    """온라인 피어만 측정하고, 값이 바뀔 때만 kubectl 로 게시"""
+    peers = [
+        {"hostname": "worker-b", "ips": ["fd7a::2", "127.0.0.1"], "online": True},
+        {"hostname": "worker-c", "ips": ["100.64.0.3"], "online": False},
+        {"hostname": "me", "ips": ["100.64.0.9"], "online": True},
+    ]
+    reporter = TopologyReporter("127.0.0.1", node_name="me", count=2, ping_interval=0.05,
+                                peers_source=lambda: peers)
+    assert reporter.targets() == {"master": "127.0.0.1", "worker-b": "127.0.0.1"}
+
+    calls = []
+
+    def fake_run(cmd, **kwargs):
+        calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, 0, "", "")
+
+    monkeypatch.setattr(topology.subprocess, "run", fake_run)
+    latencies = reporter.run()
+    assert set(latencies) == {"master", "worker-b"}
+    assert all(rtt is not None and rtt < 5 for rtt in latencies.values())
+
+    label_cmd, annotate_cmd = calls
+    assert label_cmd[:5] == ["kubectl", "label", "node", "me", "--overwrite"]
+    assert f"{MASTER_TIER_LABEL}=local" in label_cmd
+    assert f"{PEER_TIER_LABEL}=local" in label_cmd
+    key, _, value = annotate_cmd[-1].partition("=")
+    assert key == LATENCY_ANNOTATION and set(json.loads(value)) == {"master", "worker-b"}
+
+    # 같은 값이면 다시 게시하지 않음
+    assert reporter.publish(latencies) is False
+    assert len(calls) == 2
+    assert reporter.publish({"master": 150.0, "worker-b": None}) is True
+    assert f"{MASTER_TIER_LABEL}=far" in calls[2] and f"{PEER_TIER_LABEL}=unreachable" in calls[2]
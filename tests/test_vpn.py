@@ -0,0 +1,54 @@
+"""
+VPN 피어 데이터 처리 테스트
+"""
+
+from k8s_vpn_agent.peers import PeerTable
+from k8s_vpn_agent.vpn import MasterPeerResolver
+
+
+def _peers():
+    return {
+        "nodekey:a": {"HostName": "worker-1", "DNSName": "worker-1.tail1234.ts.net.",
+                      "TailscaleIPs": ["100.101.7.3", "fd7a:115c:a1e0::3"], "Online": True},
+        "nodekey:b": {"HostName": "k8s-master", "DNSName": "k8s-master.tail1234.ts.net.",
+                      "TailscaleIPs": ["fd7a:115c:a1e0::9", "100.88.12.40"], "Online": True,
+                      "Tags": ["tag:k8s-master"]},
+    }
+
+
+def _table(peers=None):
+    table = PeerTable()
+    table.apply_snapshot(peers or _peers())
+    return table
+
+
+def test_resolve_master_by_name_tag_and_ip():
+    """호스트 이름 / MagicDNS 이름 / 태그 / 알려진 IP 로 마스터 조회 (IPv4 우선)"""
+    table = _table()
+    assert MasterPeerResolver(hostname="k8s-master").resolve(table) == "100.88.12.40"
+    assert MasterPeerResolver(hostname="k8s-master.tail1234.ts.net").resolve(table) == "100.88.12.40"
+    assert MasterPeerResolver(tag="tag:k8s-master").resolve(table) == "100.88.12.40"
+    # 알려진 IP 가 가장 우선
+    resolver = MasterPeerResolver(tag="tag:k8s-master")
+    assert resolver.resolve(table, known_ips=["100.101.7.3"]) == "100.101.7.3"
+    assert MasterPeerResolver(hostname="nope").resolve(table) is None
+
+
+def test_cache_invalidated_on_peer_change():
+    """피어 테이블 버전이 같으면 캐시, 바뀌면 다시 계산"""
+    resolver = MasterPeerResolver(hostname="k8s-master")
+    peers = _peers()
+    table = _table(peers)
+    assert resolver.resolve(table) == "100.88.12.40"
+
+    calls = []
+    original = resolver._candidates
+    resolver._candidates = lambda t, known: calls.append(1) or original(t, known)
+    table.apply_snapshot(_peers())  # 변경 없음 → 버전 유지
+    assert resolver.resolve(table) == "100.88.12.40"
+    assert calls == []
+
+    peers["nodekey:b"] = dict(peers["nodekey:b"], TailscaleIPs=["100.88.12.41"])
+    table.apply_snapshot(peers)
+    assert resolver.resolve(table) == "100.88.12.41"
+    assert calls
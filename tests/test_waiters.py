@@ -0,0 +1,63 @@
+"""
+준비 상태 대기 테스트
+"""
+
+import socket
+
+from k8s_vpn_agent.waiters import describe, socket_exists, wait_for
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_wait_for_backoff_until_ready():
+    """조건 충족까지 지수 백오프, 대기 시간/확인 횟수 보고"""
+    clock = _Clock()
+    values = iter([None, False, RuntimeError("not yet"), "100.64.0.1"])
+
+    def condition():
+        value = next(values)
+        if isinstance(value, Exception):
+            raise value
+        return value
+
+    result = wait_for(condition, 10, initial_interval=0.1, max_interval=0.3,
+                      clock=clock, sleep=clock.sleep)
+    assert result and result.value == "100.64.0.1" and result.attempts == 4
+    assert clock.sleeps == [0.1, 0.2, 0.3]
+    assert round(result.elapsed, 3) == 0.6
+    assert describe(result) == "0.6초, 확인 4회"
+
+
+def test_wait_for_deadline():
+    """마감 시각을 넘기지 않고 실패 보고"""
+    clock = _Clock()
+    result = wait_for(lambda: False, 1.0, initial_interval=0.4, clock=clock, sleep=clock.sleep)
+    assert not result and result.elapsed == 1.0
+    assert clock.sleeps == [0.4, 0.6]
+    assert describe(result).startswith("시간 초과")
+
+
+def test_socket_exists(tmp_path):
+    """유닉스 소켓 생성 확인"""
+    path = str(tmp_path / "tailscaled.sock")
+    check = socket_exists(path)
+    assert not check()
+    (tmp_path / "file").write_text("x")
+    assert not socket_exists(str(tmp_path / "file"))()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(path)
+        assert check()
+    finally:
+        sock.close()